@@ -1,5 +1,10 @@
-def main():
-    print("Hello from monopoly-bench!")
+import sys
+from pathlib import Path
+
+# The game modules live in src/ and import each other by bare name
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from cli import main
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""Early adjudication of games whose outcome is already settled.
+
+After every full round ``play_game`` asks the adjudicator whether one player has
+effectively won. If so, the game ends there with the result stored in
+``game_state.adjudication`` and that player recorded as the winner, saving the
+API calls the remaining turns would cost. Two tests are available:
+
+- "equity": rollout win probabilities from ``equity.estimate_equity``; a player
+  wins once the lower end of their 95% interval reaches ``threshold``.
+- "net_worth": a player wins once their net worth is at least ``dominance`` times
+  every opponent's (a cheap check with no rollouts).
+
+Configured with ``adjudication = {...}`` in config.py or an ``[adjudication]``
+table in an experiment spec, e.g.:
+
+    [adjudication]
+    method = "equity"
+    threshold = 0.95
+    min_turns = 5
+    n_rollouts = 200
+    budget_ms = 50
+    table_size = 10000   # optional transposition table of equity estimates
+"""
+
+from engine import calculate_net_worth
+from equity import DEFAULT_POLICY, estimate_equity
+from transposition import TranspositionTable
+
+METHODS = ("equity", "net_worth")
+
+class Adjudicator:
+    """Decides whether a game can be ended early, and for whom."""
+
+    def __init__(self, method="equity", threshold=0.95, dominance=3.0, min_turns=5, every=1,
+                 n_rollouts=200, budget_ms=None, policy=DEFAULT_POLICY, horizon=None, seed=0, table_size=None, table=None):
+        """Initializes the adjudicator.
+
+        Args:
+            method: "equity" or "net_worth".
+            threshold: Win probability the leader's lower confidence bound must reach ("equity").
+            dominance: Ratio of the leader's net worth to every opponent's ("net_worth").
+            min_turns: Rounds to play before the first check.
+            every: Check after every this many rounds.
+            n_rollouts: Rollouts per check ("equity").
+            budget_ms: Optional time budget per check ("equity").
+            policy: Rollout policy, an agent spec ("equity").
+            horizon: Optional rollout horizon in turns ("equity").
+            seed: Seed for the rollouts.
+            table_size: If set, cache equity estimates in a TranspositionTable of this size ("equity").
+            table: A TranspositionTable to share with other evaluators (overrides table_size).
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown adjudication method: {method!r} (expected one of {METHODS})")
+        self.method = method
+        self.threshold = threshold
+        self.dominance = dominance
+        self.min_turns = min_turns
+        self.every = every
+        self.n_rollouts = n_rollouts
+        self.budget_ms = budget_ms
+        self.policy = policy
+        self.horizon = horizon
+        self.seed = seed
+        self.table = table if table is not None or not table_size else TranspositionTable(table_size)
+
+    def describe(self) -> dict:
+        if self.method == "equity":
+            return {"method": "equity", "threshold": self.threshold, "min_turns": self.min_turns, "every": self.every,
+                    "n_rollouts": self.n_rollouts, "budget_ms": self.budget_ms, "policy": self.policy, "horizon": self.horizon,
+                    "table_size": self.table.max_entries if self.table is not None else None}
+        return {"method": "net_worth", "dominance": self.dominance, "min_turns": self.min_turns, "every": self.every}
+
+    def check(self, game_state):
+        """Evaluate the position at the end of a round.
+
+        Returns:
+            dict: The adjudicated result ("winner", "method", "turn" and the evidence),
+                or None if the game should go on.
+        """
+        if game_state.game_over or len(game_state.players) < 2:
+            return None
+        if game_state.turn_number < self.min_turns or (game_state.turn_number - self.min_turns) % self.every:
+            return None
+        if self.method == "equity":
+            return self._check_equity(game_state)
+        return self._check_net_worth(game_state)
+
+    def _check_equity(self, game_state):
+        equity = estimate_equity(game_state, self.n_rollouts, self.budget_ms, self.policy,
+                                 horizon=self.horizon, seed=self.seed + game_state.turn_number, table=self.table)
+        leader, stats = max(equity["players"].items(), key=lambda item: item[1]["win_prob"])
+        if stats["win_ci"][0] < self.threshold:
+            return None
+        return {
+            "winner": leader,
+            "method": "equity",
+            "turn": game_state.turn_number,
+            "win_prob": {player_id: s["win_prob"] for player_id, s in equity["players"].items()},
+            "win_ci": list(stats["win_ci"]),
+            "rollouts": equity["rollouts"],
+        }
+
+    def _check_net_worth(self, game_state):
+        worths = {player_id: calculate_net_worth(game_state, player_id) for player_id in game_state.players}
+        leader = max(worths, key=worths.get)
+        runner_up = max(worth for player_id, worth in worths.items() if player_id != leader)
+        if worths[leader] <= 0 or worths[leader] < self.dominance * max(runner_up, 0):
+            return None
+        return {"winner": leader, "method": "net_worth", "turn": game_state.turn_number, "net_worth": worths}
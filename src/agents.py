@@ -1,9 +1,15 @@
 
 
+import importlib
 import random
-from apis import get_llm_response
+from apis import get_llm_response, model as llm_model
 from tools import get_management_tools
-from engine import PropertyTile, StreetTile, TaxTile, RailroadTile, has_monopoly_for_color_set
+from derived_state import derive
+from engine import PropertyTile, StreetTile, TaxTile, RailroadTile, railroad_rent
+from legal_moves import FORCED_MOVE_PHASES, forced_action, legal_actions
+from features import extract_features
+from trade_search import find_trades, describe_trade
+from routing import resolve_route, route_models, validate_routes
 
 class BaseAgent:
     """A base class for all agents."""
@@ -37,6 +43,10 @@ class BaseAgent:
             return {"type": "roll"}
         elif phase == "decide_on_trade":
             return self.decide_on_trade(observation)
+        elif phase in ["auction_phase", "sealed_auction_phase"]:
+            return self.decide_auction(observation)
+        elif phase == "handle_mortgaged_trade":
+            return self.handle_mortgaged_trade(observation)
         else:
             return {"type": "end_turn"}
 
@@ -48,6 +58,22 @@ class BaseAgent:
         """Decides whether to accept or reject a trade offer."""
         return {"type": "reject_trade"}
 
+    def decide_auction(self, observation: dict) -> dict:
+        """Decides whether to bid in an auction (ascending or sealed-bid)."""
+        return {"type": "pass_auction"}
+
+    def decide_to_sell(self, observation: dict) -> dict:
+        """Decides how to raise cash when in debt. Defaults to the first legal option."""
+        actions = legal_actions(observation["game_state"], self.player_id, observation["phase"])
+        return actions[0] if actions else {"type": "end_turn"}
+
+    def handle_mortgaged_trade(self, observation: dict) -> dict:
+        """Decides how to handle a mortgaged property received in a trade.
+
+        Defaults to unmortgaging when affordable, otherwise paying the interest.
+        """
+        return legal_actions(observation["game_state"], self.player_id, observation["phase"])[0]
+
     def decide_to_buy(self, observation: dict) -> dict:
         """Decides whether to buy a property.
 
@@ -59,7 +85,10 @@ class BaseAgent:
         """
         raise NotImplementedError
 
-    
+    def describe(self) -> dict:
+        """Returns a JSON-serializable description of the agent for logs and analytics."""
+        return {"player_id": self.player_id, "type": type(self).__name__}
+
 
 
 class RandomAgent(BaseAgent):
@@ -74,6 +103,16 @@ class RandomAgent(BaseAgent):
         # This will override BaseAgent's decide_on_trade
         return {"type": "accept_trade" if self.random.choice([True, False]) else "reject_trade"}
 
+    def decide_auction(self, observation: dict) -> dict:
+        game_state = observation["game_state"]
+        auction_state = game_state.auction_state
+        cash = game_state.players[self.player_id].cash
+        tile = game_state.board[auction_state["tile_id"]]
+        min_bid = auction_state.get("current_bid", 0) + 1
+        if min_bid > cash or self.random.choice([True, False]):
+            return {"type": "pass_auction"}
+        return {"type": "place_bid", "bid_amount": self.random.randint(min_bid, max(min_bid, min(cash, tile.cost)))}
+
 
 class GreedyBuyer(BaseAgent):
     """An agent that buys any unowned property it lands on."""
@@ -90,25 +129,46 @@ class DummyAgent(BaseAgent):
 class LLMAgent(BaseAgent):
     """An agent that uses a large language model to make decisions."""
 
+    def __init__(self, player_id, seed=0, forced_move_phases=FORCED_MOVE_PHASES, trade_suggestions=0, model=None, routes=None, stream=False):
+        """Initializes the agent.
+
+        Args:
+            player_id: The ID of the player.
+            seed: The seed for the random number generator.
+            forced_move_phases: Phases in which a decision with only one legal
+                action is resolved locally instead of calling the API. Pass an
+                empty tuple to always ask the model.
+            trade_suggestions: Number of ranked trade candidates (from trade_search)
+                to list in the management prompt. Off (0) by default, which keeps
+                prompts comparable with earlier runs.
+            model: The model to call (defaults to apis.model).
+            routes: Optional per-phase routes (see routing.py): phase name or "default" ->
+                {"model", "reasoning_effort", "max_output_tokens"}, e.g. a fast model for
+                buying and auctions and a stronger one for trades.
+            stream: Stream responses and act as soon as the tool call is complete, leaving
+                the rest of the response to be logged in the background.
+        """
+        super().__init__(player_id, seed)
+        self.forced_move_phases = tuple(forced_move_phases)
+        self.trade_suggestions = trade_suggestions
+        self.model = model or llm_model
+        self.routes = validate_routes(routes)
+        self.stream = stream
+
+    def describe(self) -> dict:
+        description = {**super().describe(), "model": self.model, "trade_suggestions": self.trade_suggestions}
+        if self.routes:
+            # Label the agent by the models that play for it, not the default its routes may override
+            models = route_models(self.routes, self.model)
+            description.update(model="+".join(models), models=models, routes=self.routes)
+        return description
+
     def _get_buildable_properties(self, game_state, player_id):
         """Get list of properties that can be built on."""
-        player_state = game_state.players[player_id]
-        board_state = game_state.board
         buildable_properties = []
-        
-        for p_id in player_state.owned_properties:
-            tile = board_state[p_id]
-            if isinstance(tile, StreetTile) and tile.owner == player_id:
-                # Check for monopoly
-                color_set_tiles = [t for t in game_state.board if isinstance(t, StreetTile) and t.color_set == tile.color_set]
-                monopoly_owned = all(t.owner == player_id for t in color_set_tiles)
-                
-                if monopoly_owned and tile.num_houses < 5:
-                    # Check even building rule: can only build if this tile has the minimum houses in the set
-                    min_houses_in_set = min(t.num_houses for t in color_set_tiles)
-                    if tile.num_houses == min_houses_in_set:
-                        buildable_properties.append(f"{tile.name} (Houses: {tile.num_houses}, Cost: ${tile.house_cost})")
-        
+        for tile_id in derive(game_state).buildable(player_id):
+            tile = game_state.board[tile_id]
+            buildable_properties.append(f"{tile.name} (Houses: {tile.num_houses}, Cost: ${tile.house_cost})")
         return buildable_properties
 
     def _get_allowed_tools(self, phase: str, buildable_properties: list) -> list:
@@ -123,7 +183,7 @@ class LLMAgent(BaseAgent):
             return ["accept_trade", "reject_trade"]
         elif phase == "handle_mortgaged_trade":
             return ["resolve_mortgaged_trade"]
-        elif phase == "auction_phase":
+        elif phase in ["auction_phase", "sealed_auction_phase"]:
             return ["place_bid", "pass_auction"]
         elif phase == "end_turn":
             return ["end_turn"]
@@ -143,39 +203,37 @@ class LLMAgent(BaseAgent):
             return {"type": "roll"}
         elif phase == "end_turn":
             return {"type": "end_turn"}
+
+        if phase in self.forced_move_phases:
+            action = forced_action(observation["game_state"], self.player_id, phase)
+            if action is not None:
+                logger = observation.get("logger")
+                if logger:
+                    logger.log_forced_move(self.player_id, phase, action)
+                self._update_history(action, observation)
+                return action
         
         prompt = self._create_prompt(observation)
         if observation.get("logger"):
-            observation.get("logger").log_custom(f"PROMPT: {prompt}")
+            observation.get("logger").log_prompt(self.player_id, prompt)
 
         buildable_properties = self._get_buildable_properties(observation["game_state"], self.player_id)
         allowed_tools = self._get_allowed_tools(phase, buildable_properties)
-        response = get_llm_response(prompt, observation["game_state"], allowed_tools, observation.get("logger"))
+        route = resolve_route(self.routes, phase, self.model)
+        response = get_llm_response(prompt, observation["game_state"], allowed_tools, observation.get("logger"), route=route,
+                                    stream=self.stream, player_id=self.player_id)
+        if observation.get("logger"):
+            features = extract_features(observation["game_state"], self.player_id, phase)
+            observation.get("logger").log_decision(self.player_id, phase, allowed_tools, response, features)
         self._update_history(response, observation)
         return response
 
     def _get_sellable_houses(self, game_state, player_id):
         """Get list of properties from which houses can be sold."""
-        player_state = game_state.players[player_id]
-        board_state = game_state.board
         sellable_houses = []
-
-        # Group properties by color set
-        color_sets = {}
-        for p_id in player_state.owned_properties:
-            tile = board_state[p_id]
-            if isinstance(tile, StreetTile) and tile.num_houses > 0:
-                if tile.color_set not in color_sets:
-                    color_sets[tile.color_set] = []
-                color_sets[tile.color_set].append(tile)
-
-        # Check for even selling rule
-        for color_set, properties in color_sets.items():
-            max_houses_in_set = max(p.num_houses for p in properties)
-            for prop in properties:
-                if prop.num_houses == max_houses_in_set:
-                    sellable_houses.append((prop.name, f"${prop.house_cost // 2}"))
-        
+        for tile_id in derive(game_state).sellable_houses(player_id):
+            tile = game_state.board[tile_id]
+            sellable_houses.append((tile.name, f"${tile.house_cost // 2}"))
         return sellable_houses
 
     def _create_prompt(self, observation: dict) -> str:
@@ -183,6 +241,7 @@ class LLMAgent(BaseAgent):
         game_state = observation["game_state"]
         board_state = game_state.board
         phase = observation["phase"]
+        derived = derive(game_state)
 
         if phase == "decide_on_trade":
             player_id = game_state.decision_player_id
@@ -208,7 +267,7 @@ class LLMAgent(BaseAgent):
                 owned_properties = []
                 for prop_id in p_state.owned_properties:
                     tile = board_state[prop_id]
-                    detailed_info = format_detailed_property_info(tile, game_state)
+                    detailed_info = format_detailed_property_info(tile, game_state, derived)
                     owned_properties.append(f"{tile.name} {detailed_info}")
             else:
                 owned_properties = 'None'
@@ -216,96 +275,8 @@ class LLMAgent(BaseAgent):
             prompt += f"- Player {p_id}: Cash: ${p_state.cash}, Position: {p_state.position}, Properties: {owned_properties}\n"
         prompt += "\n"
 
-        # Organize properties by color set
-        prompt += "Board by Color Set:\n"
-        color_sets = {
-            "brown": "Brown",
-            "light_blue": "Light Blue",
-            "pink": "Pink",
-            "orange": "Orange",
-            "red": "Red",
-            "yellow": "Yellow",
-            "green": "Green",
-            "dark_blue": "Dark Blue"
-        }
-        
-        # Group properties by color
-        properties_by_color = {}
-        for tile in board_state:
-            if hasattr(tile, 'color_set'):
-                if tile.color_set not in properties_by_color:
-                    properties_by_color[tile.color_set] = []
-                properties_by_color[tile.color_set].append(tile)
-        
-        # Display properties by color set
-        for color_set, display_name in color_sets.items():
-            if color_set in properties_by_color:
-                prompt += f"\n{display_name}:\n"
-                for tile in properties_by_color[color_set]:
-                    owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
-                    
-                    # Add detailed status information
-                    status_parts = []
-                    if tile.mortgaged:
-                        status_parts.append("MORTGAGED")
-                    elif tile.owner is not None:
-                        current_rent = calculate_current_rent(tile, game_state)
-                        status_parts.append(f"Rent: ${current_rent}")
-                    
-                    if isinstance(tile, StreetTile):
-                        if tile.num_houses > 0:
-                            if tile.num_houses == 5:
-                                status_parts.append("Hotel")
-                            else:
-                                status_parts.append(f"{tile.num_houses} Houses")
-                        
-                        # Check if it's part of a monopoly
-                        if tile.owner is not None and has_monopoly_for_color_set(game_state, tile.owner, tile.color_set):
-                            status_parts.append("MONOPOLY")
-                    
-                    status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
-                    prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
-        
-        prompt += "\nRailroads:\n"
-        for tile in board_state:
-            if isinstance(tile, RailroadTile):
-                owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
-                
-                # Add detailed status information for railroads
-                status_parts = []
-                if tile.mortgaged:
-                    status_parts.append("MORTGAGED")
-                elif tile.owner is not None:
-                    current_rent = calculate_railroad_rent(tile, game_state)
-                    status_parts.append(f"Rent: ${current_rent}")
-                
-                status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
-                prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
-
-        # Display non-property tiles separately
-        prompt += "\nOther Tiles:\n"
-        for tile in board_state:
-            if not hasattr(tile, 'color_set') and not isinstance(tile, RailroadTile):
-                if isinstance(tile, PropertyTile):  # For utilities
-                    owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
-                    
-                    # Add detailed status information for railroads/utilities
-                    status_parts = []
-                    if tile.mortgaged:
-                        status_parts.append("MORTGAGED")
-                    elif tile.owner is not None:
-                        current_rent = calculate_current_rent(tile, game_state)
-                        status_parts.append(f"Rent: ${current_rent}")
-                    
-                    status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
-                    prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
-                elif isinstance(tile, TaxTile):  # For tax tiles
-                    prompt += f"- {tile.name}: Tax ${tile.rent}\n"
-                else:  # For non-property tiles like GO, Chance, etc.
-                    prompt += f"- {tile.name}\n"
-        prompt += "\n"
-
-        prompt += "Railroad rent is based on the number of railroads owned by the owner: 1 Railroad: $25, 2 Railroads: $50, 3 Railroads: $100, 4 Railroads: $200.\n"
+        # The board description only changes with ownership, houses and mortgages
+        prompt += derived.board_fact("prompt_board", lambda _: describe_board(game_state, derived))
 
         if phase == "decide_to_buy":
             tile = board_state[player_state.position]
@@ -331,20 +302,9 @@ class LLMAgent(BaseAgent):
                 prompt += "You have no houses to sell.\n"
 
             mortgageable_properties = []
-            for p_id in player_state.owned_properties:
-                tile = board_state[p_id]
-                if not tile.mortgaged:
-                    # Check if the property is a street and has houses
-                    if isinstance(tile, StreetTile) and tile.num_houses > 0:
-                        continue
-                    
-                    # Check if any other property in the same color group has houses
-                    if isinstance(tile, StreetTile):
-                        color_set_tiles = [t for t in board_state if isinstance(t, StreetTile) and t.color_set == tile.color_set]
-                        if any(t.owner == player_id and t.num_houses > 0 for t in color_set_tiles):
-                            continue
-
-                    mortgageable_properties.append((tile.name, f"${tile.cost}", f"${tile.cost // 2}"))
+            for tile_id in derived.mortgage_candidates(player_id):
+                tile = board_state[tile_id]
+                mortgageable_properties.append((tile.name, f"${tile.cost}", f"${tile.cost // 2}"))
 
             if mortgageable_properties:
                 prompt += "You can mortgage the following properties (Property, Cost, Mortgage Value):\n"
@@ -379,6 +339,13 @@ Choose ONE action that best fits your current strategy and game position. Think
             
             prompt += f" You have {1 - game_state.trades_proposed_this_turn} trades left in this turn.\n" # TODO: change this to 3
 
+            if self.trade_suggestions and game_state.trades_proposed_this_turn < 1:
+                trades = find_trades(game_state, player_id, k=self.trade_suggestions)
+                if trades:
+                    prompt += "\nTrades worth considering (ranked by estimated monopoly and rent value; each leaves the other player better off, so they are likely to accept):\n"
+                    for trade in trades:
+                        prompt += f"- {describe_trade(game_state, trade)}\n"
+
             # Add building information using the helper method
             buildable_properties = self._get_buildable_properties(game_state, player_id)
             
@@ -422,6 +389,7 @@ The system will reject any invalid building attempts. Look at the "Properties yo
                 "- Early properties (cheaper color sets) can be more valuable than expensive individual properties\n\n"
                 "Do you accept or reject this trade?"
             )
+        elif phase == "handle_mortgaged_trade":
             tile_id = game_state.mortgaged_properties_to_handle[0]            
             tile = game_state.board[tile_id]            
             prompt += f"You have received the mortgaged property '{tile.name}' in a trade. You must choose how to handle the mortgage.\n"            
@@ -432,8 +400,18 @@ The system will reject any invalid building attempts. Look at the "Properties yo
             tile = game_state.board[auction_state["tile_id"]]            
             prompt += f"An auction is being held for the property '{tile.name}'.\n"            
             prompt += f"The current bid is ${auction_state['current_bid']}.\n"            
-            prompt += f"The active bidders are: {auction_state['active_bidders']}.\n"            
+            prompt += f"The active bidders are: {list(auction_state['active_bidders'])}.\n"            
             prompt += "You can either place a higher bid or pass. You should consider bidding if the property helps you complete a color set or if winning it would block another player from completing theirs. However, be cautious not to overbid—spending too much can leave you cash-poor and vulnerable, especially early in the game. If the property is not critical to your strategy or if the cost would leave you with little flexibility, it's often better to pass. Also consider whether passing would allow another player to cheaply complete a dangerous monopoly."        
+        elif phase == "sealed_auction_phase":
+            auction_state = game_state.auction_state
+            tile = game_state.board[auction_state["tile_id"]]
+            if auction_state["mode"] == "sealed_second_price":
+                pricing = "The highest bidder wins and pays the second-highest bid, so your best strategy is to bid exactly what the property is worth to you."
+            else:
+                pricing = "The highest bidder wins and pays their own bid, so bid below what the property is worth to you."
+            prompt += f"A sealed-bid auction is being held for the property '{tile.name}' (list price ${tile.cost}).\n"
+            prompt += f"All players ({auction_state['bidders']}) submit one bid at the same time without seeing the others. {pricing} Ties go to the player seated earliest after the current player.\n"
+            prompt += f"You can bid at most ${player_state.cash}. Place a bid if the property helps you complete a color set or blocks another player from completing theirs, but avoid leaving yourself cash-poor. Otherwise pass."
         return prompt
 
     def _update_history(self, action: dict, observation: dict):
@@ -534,48 +512,26 @@ def calculate_current_rent(tile, game_state):
     Returns:
         int: Current rent amount
     """
-    if tile.mortgaged or tile.owner is None:
-        return 0
-    
-    rent = tile.rent
-    if isinstance(tile, StreetTile):
-        monopoly = has_monopoly_for_color_set(game_state, tile.owner, tile.color_set)
-        if monopoly:
-            if tile.num_houses == 0:
-                rent = tile.rent_monopoly
-            elif tile.num_houses == 1:
-                rent = tile.rent_one_house
-            elif tile.num_houses == 2:
-                rent = tile.rent_two_houses
-            elif tile.num_houses == 3:
-                rent = tile.rent_three_houses
-            elif tile.num_houses == 4:
-                rent = tile.rent_four_houses
-            elif tile.num_houses == 5:  # Hotel
-                rent = tile.rent_hotel
-    
-    return rent
+    return derive(game_state).rent(tile.tile_id)
 
-def format_detailed_property_info(tile, game_state):
+def format_detailed_property_info(tile, game_state, derived=None):
     """Format detailed information about a property for display.
     
     Args:
         tile: Property tile to format
         game_state: Current game state
+        derived: The state's DerivedState, if the caller already has it
         
     Returns:
         str: Formatted property information
     """
+    derived = derived or derive(game_state)
     info_parts = [f"${tile.cost}"]
     
     if tile.mortgaged:
         info_parts.append("MORTGAGED")
     else:
-        if isinstance(tile, RailroadTile):
-            current_rent = calculate_railroad_rent(tile, game_state)
-        else:
-            current_rent = calculate_current_rent(tile, game_state)
-        info_parts.append(f"Rent: ${current_rent}")
+        info_parts.append(f"Rent: ${derived.rent(tile.tile_id)}")
     
     if isinstance(tile, StreetTile):
         if tile.num_houses > 0:
@@ -585,18 +541,121 @@ def format_detailed_property_info(tile, game_state):
                 info_parts.append(f"{tile.num_houses} Houses")
         
         # Check if it's part of a monopoly
-        if has_monopoly_for_color_set(game_state, tile.owner, tile.color_set):
+        if derived.has_monopoly(tile.owner, tile.color_set):
             info_parts.append("MONOPOLY")
     
     elif isinstance(tile, RailroadTile):
-        # Check if player owns all 4 railroads
-        owned_railroads = sum(1 for t in game_state.board 
-                             if isinstance(t, RailroadTile) and t.owner == tile.owner)
-        if owned_railroads == 4:
+        # Check if player owns every railroad on the board
+        if game_state.players[tile.owner].owned_mask & game_state.railroad_mask == game_state.railroad_mask:
             info_parts.append("ALL RAILROADS")
     
     return f"({', '.join(info_parts)})"
 
+def describe_board(game_state, derived):
+    """Describe every tile grouped by color set, with owners, rents, buildings and monopolies, for the prompt.
+
+    Args:
+        game_state: Current game state
+        derived: The state's DerivedState
+
+    Returns:
+        str: The board section of the prompt
+    """
+    # Organize properties by color set
+    prompt = "Board by Color Set:\n"
+    color_sets = {
+        "brown": "Brown",
+        "light_blue": "Light Blue",
+        "pink": "Pink",
+        "orange": "Orange",
+        "red": "Red",
+        "yellow": "Yellow",
+        "green": "Green",
+        "dark_blue": "Dark Blue"
+    }
+    
+    # Group properties by color
+    properties_by_color = {}
+    for tile in game_state.board:
+        if hasattr(tile, 'color_set'):
+            if tile.color_set not in properties_by_color:
+                properties_by_color[tile.color_set] = []
+            properties_by_color[tile.color_set].append(tile)
+    
+    # Display properties by color set, in board order
+    for color_set in properties_by_color:
+        display_name = color_sets.get(color_set, color_set.replace("_", " ").title())
+        prompt += f"\n{display_name}:\n"
+        for tile in properties_by_color[color_set]:
+            owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
+            
+            # Add detailed status information
+            status_parts = []
+            if tile.mortgaged:
+                status_parts.append("MORTGAGED")
+            elif tile.owner is not None:
+                status_parts.append(f"Rent: ${derived.rent(tile.tile_id)}")
+            
+            if isinstance(tile, StreetTile):
+                if tile.num_houses > 0:
+                    if tile.num_houses == 5:
+                        status_parts.append("Hotel")
+                    else:
+                        status_parts.append(f"{tile.num_houses} Houses")
+                
+                # Check if it's part of a monopoly
+                if tile.owner is not None and derived.has_monopoly(tile.owner, tile.color_set):
+                    status_parts.append("MONOPOLY")
+            
+            status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
+            prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
+    
+    prompt += "\nRailroads:\n"
+    for tile in game_state.board:
+        if isinstance(tile, RailroadTile):
+            owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
+            
+            # Add detailed status information for railroads
+            status_parts = []
+            if tile.mortgaged:
+                status_parts.append("MORTGAGED")
+            elif tile.owner is not None:
+                status_parts.append(f"Rent: ${derived.rent(tile.tile_id)}")
+            
+            status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
+            prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
+
+    # Display non-property tiles separately
+    prompt += "\nOther Tiles:\n"
+    for tile in game_state.board:
+        if not hasattr(tile, 'color_set') and not isinstance(tile, RailroadTile):
+            if isinstance(tile, PropertyTile):  # For utilities
+                owner_info = f" (Owned by Player {tile.owner})" if tile.owner is not None else " (Unowned)"
+                
+                # Add detailed status information for railroads/utilities
+                status_parts = []
+                if tile.mortgaged:
+                    status_parts.append("MORTGAGED")
+                elif tile.owner is not None:
+                    status_parts.append(f"Rent: ${derived.rent(tile.tile_id)}")
+                
+                status_info = f" [{', '.join(status_parts)}]" if status_parts else ""
+                prompt += f"- {tile.name}: ${tile.cost}{owner_info}{status_info}\n"
+            elif isinstance(tile, TaxTile):  # For tax tiles
+                prompt += f"- {tile.name}: Tax ${tile.rent}\n"
+            else:  # For non-property tiles like GO, Chance, etc.
+                prompt += f"- {tile.name}\n"
+    prompt += "\n"
+
+    railroad_tiles = [t for t in game_state.board if isinstance(t, RailroadTile)]
+    if railroad_tiles:
+        schedule = ", ".join(
+            f"{n} Railroad{'s' if n > 1 else ''}: ${railroad_rent(n, railroad_tiles[0].rent)}"
+            for n in range(1, len(railroad_tiles) + 1)
+        )
+        prompt += f"Railroad rent is based on the number of railroads owned by the owner: {schedule}.\n"
+    return prompt
+
 def calculate_railroad_rent(tile, game_state):
     """Calculate the current rent for a railroad based on how many railroads the owner has.
     
@@ -607,13 +666,45 @@ def calculate_railroad_rent(tile, game_state):
     Returns:
         int: Current rent amount
     """
-    if tile.mortgaged or tile.owner is None:
-        return 0
-    
-    # Count how many railroads this player owns
-    owned_railroads = sum(1 for t in game_state.board 
-                         if isinstance(t, RailroadTile) and t.owner == tile.owner)
-    
-    # Railroad rent based on number owned: 1=$25, 2=$50, 3=$100, 4=$200
-    rent_schedule = {1: 25, 2: 50, 3: 100, 4: 200}
-    return rent_schedule.get(owned_railroads, 0)
+    return derive(game_state).rent(tile.tile_id)
+
+# Agent types usable in config specs. Classes defined in other modules are given
+# as "module:Class" and imported only when a spec asks for them.
+AGENT_TYPES = {
+    "random": RandomAgent,
+    "greedy": GreedyBuyer,
+    "dummy": DummyAgent,
+    "llm": LLMAgent,
+    "surrogate": "surrogate:SurrogateAgent",
+}
+
+def resolve_agent_type(agent_type):
+    """Look up an agent class by registered name or "module:Class" path."""
+    agent_class = AGENT_TYPES.get(agent_type, agent_type)
+    if isinstance(agent_class, str):
+        if ":" not in agent_class:
+            raise ValueError(f"Unknown agent type: {agent_type!r} (expected one of {sorted(AGENT_TYPES)} or 'module:Class')")
+        module_name, class_name = agent_class.split(":", 1)
+        agent_class = getattr(importlib.import_module(module_name), class_name)
+    return agent_class
+
+def build_agent(spec, player_id):
+    """Construct an agent from a spec such as {"type": "llm", "trade_suggestions": 3}.
+
+    Args:
+        spec: Dict with a "type" and any constructor arguments, or just the type name.
+        player_id: The ID of the player, unless the spec sets "player_id".
+
+    Returns:
+        BaseAgent: The constructed agent.
+    """
+    if isinstance(spec, str):
+        spec = {"type": spec}
+    kwargs = dict(spec)
+    agent_class = resolve_agent_type(kwargs.pop("type"))
+    kwargs.setdefault("player_id", player_id)
+    return agent_class(**kwargs)
+
+def build_agents(specs):
+    """Construct one agent per spec, seated in order."""
+    return [build_agent(spec, player_id) for player_id, spec in enumerate(specs)]
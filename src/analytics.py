@@ -0,0 +1,413 @@
+"""Streaming analytics over the game logs in results/.
+
+Each game leaves a human-readable ``<game_id>.log`` written by ``GameLogger`` and,
+for newer games, a structured ``<game_id>.jsonl`` event file. Both are parsed line
+by line into a small per-game summary, and the summaries are cached in an index
+file inside the results directory so re-runs only parse new or changed files.
+
+Usage:
+    python analytics.py [results_dir] [--by agent|model|type|seat] [--where starting_cash=750]
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+INDEX_FILE = ".analytics_index.json"
+INDEX_VERSION = 2
+
+TURN_RE = re.compile(r"^--- TURN (\d+): PLAYER (\d+)'S TURN ---$")
+CONFIG_RE = re.compile(r"^CONFIG: (.*)$")
+PHASE_BEFORE_RE = re.compile(r"^Phase before action: (\S+)$")
+ACTION_RE = re.compile(r"^Action: (\S+)$")
+RENT_RE = re.compile(r"^  Paid \$(\d+) in rent to Player (\d+)\.")
+TAX_RE = re.compile(r"^  Paid \$(\d+) in tax to the bank\.")
+BANKRUPT_RE = re.compile(r"^  Player (\d+) went bankrupt!$")
+FORCED_RE = re.compile(r"^FORCED MOVE: Player (\d+) ")
+FINAL_RE = re.compile(r"^Player (\d+) \| Final Cash: \$(-?\d+)")
+ADJUDICATED_RE = re.compile(r"^ADJUDICATED: Player (\d+) wins by (\w+)")
+BUILD_FAILED_RE = re.compile(r"^Player (\d+) failed to ")
+NOT_BOUGHT_RE = re.compile(r"^  Did not buy '")
+TRADE_FAILED = "Trade failed due to insufficient assets."
+GAME_OVER = "Game Over!"
+
+
+class _GameSummary:
+    """Accumulates the facts analytics cares about while a log is streamed."""
+
+    def __init__(self, game_id, source):
+        self.game_id = game_id
+        self.source = source
+        self.config = {}
+        self.turns = 0
+        self.complete = False
+        self.adjudicated = None
+        self.standings = []
+        self.bankruptcies = []
+        self.rent = {}
+        self.tax = {}
+        self.trades = {}
+        self.invalid_actions = {}
+        self.forced_moves = {}
+        self.pending_proposer = None
+
+    def _trade_counts(self, player_id):
+        return self.trades.setdefault(str(player_id), {"proposed": 0, "accepted": 0, "rejected": 0, "failed": 0})
+
+    def record_action(self, player_id, phase, action_type):
+        if action_type == "propose_trade":
+            self._trade_counts(player_id)["proposed"] += 1
+            self.pending_proposer = player_id
+        elif phase == "decide_on_trade" and action_type in ("accept_trade", "reject_trade"):
+            if self.pending_proposer is not None:
+                key = "accepted" if action_type == "accept_trade" else "rejected"
+                self._trade_counts(self.pending_proposer)[key] += 1
+                self.pending_proposer = None
+
+    def record_trade_failed(self, from_player):
+        if from_player is not None:
+            self._trade_counts(from_player)["failed"] += 1
+
+    def record_rent(self, payer, owner, amount):
+        key = f"{payer}->{owner}"
+        self.rent[key] = self.rent.get(key, 0) + amount
+
+    def record_tax(self, player_id, amount):
+        key = str(player_id)
+        self.tax[key] = self.tax.get(key, 0) + amount
+
+    def record_invalid(self, player_id):
+        key = str(player_id)
+        self.invalid_actions[key] = self.invalid_actions.get(key, 0) + 1
+
+    def record_forced(self, player_id):
+        key = str(player_id)
+        self.forced_moves[key] = self.forced_moves.get(key, 0) + 1
+
+    def to_dict(self):
+        return {
+            "game_id": self.game_id,
+            "source": self.source,
+            "config": self.config,
+            "turns": self.turns,
+            "complete": self.complete,
+            "winner": self.standings[0] if self.standings else None,
+            "adjudicated": self.adjudicated,
+            "standings": self.standings,
+            "bankruptcies": self.bankruptcies,
+            "rent": self.rent,
+            "tax": self.tax,
+            "trades": self.trades,
+            "invalid_actions": self.invalid_actions,
+            "forced_moves": self.forced_moves,
+        }
+
+
+def parse_event_log(path):
+    """Parse a structured ``.jsonl`` event file into a game summary.
+
+    Args:
+        path: Path to the event file.
+
+    Returns:
+        dict: The game summary.
+    """
+    path = Path(path)
+    summary = _GameSummary(path.stem, "events")
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Truncated final line of a game that is still running
+            kind = event.get("event")
+            if kind == "match_config":
+                summary.config = {k: v for k, v in event.items() if k != "event"}
+            elif kind == "action":
+                summary.turns = max(summary.turns, event.get("turn", 0))
+                summary.record_action(event["player_id"], event.get("phase"), event["action"])
+            elif kind == "rent":
+                summary.record_rent(event["payer"], event["owner"], event["amount"])
+            elif kind == "tax":
+                summary.record_tax(event["player_id"], event["amount"])
+            elif kind == "bankruptcy":
+                summary.bankruptcies.append(event["player_id"])
+            elif kind == "invalid_action":
+                summary.record_invalid(event["player_id"])
+            elif kind == "forced_move":
+                summary.record_forced(event["player_id"])
+            elif kind == "trade_failed":
+                summary.record_trade_failed(event.get("from_player"))
+            elif kind == "adjudicated":
+                summary.adjudicated = event["method"]
+            elif kind == "final_standing":
+                summary.standings.append(event["player_id"])
+            elif kind == "game_over":
+                summary.turns = max(summary.turns, event.get("turns", 0))
+                summary.complete = True
+    return summary.to_dict()
+
+
+def parse_text_log(path):
+    """Parse a ``GameLogger`` text log into a game summary.
+
+    Only anchored patterns are matched, so the multi-line prompt bodies embedded in
+    the log are skipped without having to track where they start and end. Text logs
+    do not record who answered a trade, so trade outcomes are attributed to the
+    proposer (the player whose turn it was).
+
+    Args:
+        path: Path to the ``.log`` file.
+
+    Returns:
+        dict: The game summary.
+    """
+    path = Path(path)
+    summary = _GameSummary(path.stem, "text")
+    turn_player = None
+    phase = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if match := TURN_RE.match(line):
+                summary.turns = max(summary.turns, int(match.group(1)))
+                turn_player = int(match.group(2))
+            elif match := PHASE_BEFORE_RE.match(line):
+                phase = match.group(1)
+            elif match := ACTION_RE.match(line):
+                summary.record_action(turn_player, phase, match.group(1))
+            elif match := RENT_RE.match(line):
+                summary.record_rent(turn_player, int(match.group(2)), int(match.group(1)))
+            elif match := TAX_RE.match(line):
+                summary.record_tax(turn_player, int(match.group(1)))
+            elif match := BANKRUPT_RE.match(line):
+                summary.bankruptcies.append(int(match.group(1)))
+            elif match := FINAL_RE.match(line):
+                summary.standings.append(int(match.group(1)))
+            elif match := ADJUDICATED_RE.match(line):
+                summary.adjudicated = match.group(2)
+            elif match := BUILD_FAILED_RE.match(line):
+                summary.record_invalid(int(match.group(1)))
+            elif match := FORCED_RE.match(line):
+                summary.record_forced(int(match.group(1)))
+            elif NOT_BOUGHT_RE.match(line):
+                summary.record_invalid(turn_player)
+            elif line == TRADE_FAILED:
+                summary.record_trade_failed(summary.pending_proposer)
+            elif line == GAME_OVER:
+                summary.complete = True
+            elif match := CONFIG_RE.match(line):
+                try:
+                    summary.config = json.loads(match.group(1))
+                except json.JSONDecodeError:
+                    pass
+    return summary.to_dict()
+
+
+def load_index(results_dir):
+    """Load the analytics index for a results directory (empty if missing or stale)."""
+    index_path = Path(results_dir) / INDEX_FILE
+    if index_path.exists():
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    return {"version": INDEX_VERSION, "files": {}}
+
+
+def update_index(results_dir, rebuild=False):
+    """Parse new or modified logs and persist the updated index.
+
+    A file is re-parsed only if its size or modification time changed since the
+    last run; entries for deleted files are dropped. A text log is skipped when the
+    game's event file sits beside it.
+
+    Args:
+        results_dir: Directory containing ``.log`` and ``.jsonl`` game files.
+        rebuild: If True, ignore the existing index and parse everything.
+
+    Returns:
+        tuple: (index dict, number of files parsed on this run)
+    """
+    results_dir = Path(results_dir)
+    index = {"version": INDEX_VERSION, "files": {}} if rebuild else load_index(results_dir)
+    files = index["files"]
+    seen = set()
+    parsed = 0
+
+    for path in sorted(results_dir.glob("*.log")) + sorted(results_dir.glob("*.jsonl")):
+        if path.suffix == ".log" and path.with_suffix(".jsonl").exists():
+            continue # The game's events are parsed instead (see game_summaries)
+        stat = path.stat()
+        seen.add(path.name)
+        entry = files.get(path.name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            continue
+        parser = parse_event_log if path.suffix == ".jsonl" else parse_text_log
+        files[path.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "summary": parser(path)}
+        parsed += 1
+
+    for name in set(files) - seen:
+        del files[name]
+
+    index_path = results_dir / INDEX_FILE
+    tmp_path = index_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    tmp_path.replace(index_path)
+    return index, parsed
+
+
+def game_summaries(index):
+    """Return one summary per game, preferring structured events over text logs."""
+    by_game = {}
+    for entry in index["files"].values():
+        summary = entry["summary"]
+        existing = by_game.get(summary["game_id"])
+        if existing is None or (existing["source"] == "text" and summary["source"] == "events"):
+            by_game[summary["game_id"]] = summary
+    return [by_game[game_id] for game_id in sorted(by_game)]
+
+
+def player_label(summary, player_id, by="agent"):
+    """Return the grouping label for a player in a game.
+
+    Args:
+        summary: Game summary.
+        player_id: Player ID (int or str).
+        by: One of "agent" (type and model), "model", "type" or "seat".
+    """
+    if by == "seat":
+        return f"seat {player_id}"
+    agents = {str(a.get("player_id")): a for a in summary["config"].get("agents", [])}
+    agent = agents.get(str(player_id))
+    if agent is None:
+        return "unknown"
+    if by == "type":
+        return agent["type"]
+    if by == "model":
+        return agent.get("model") or agent["type"]
+    if agent.get("model"):
+        return f"{agent['type']}({agent['model']})"
+    return agent["type"]
+
+
+def _matches(summary, where):
+    config = summary["config"]
+    return all(str(config.get(key)) == value for key, value in where.items())
+
+
+def build_tables(summaries, by="agent", where=None, include_incomplete=False):
+    """Aggregate game summaries into per-group statistics.
+
+    Args:
+        summaries: Game summaries as returned by ``game_summaries``.
+        by: Grouping passed to ``player_label``.
+        where: Optional dict of config filters (values compared as strings).
+        include_incomplete: Include games that never reached "Game Over".
+
+    Returns:
+        dict: Group label -> statistics dict.
+    """
+    where = where or {}
+    groups = {}
+
+    def group(label):
+        return groups.setdefault(label, {
+            "games": 0, "wins": 0, "adjudicated_wins": 0, "bankruptcies": 0,
+            "rent_paid": 0, "rent_received": 0, "tax_paid": 0,
+            "trades_proposed": 0, "trades_accepted": 0, "trades_rejected": 0, "trades_failed": 0,
+            "invalid_actions": 0, "forced_moves": 0,
+        })
+
+    for summary in summaries:
+        if not include_incomplete and not summary["complete"]:
+            continue
+        if not _matches(summary, where):
+            continue
+
+        num_players = summary["config"].get("num_players")
+        if num_players is None:
+            seats = set(summary["standings"]) | set(summary["bankruptcies"])
+            num_players = max(seats) + 1 if seats else 0
+        for player_id in range(num_players):
+            group(player_label(summary, player_id, by))["games"] += 1
+
+        if summary["winner"] is not None:
+            group(player_label(summary, summary["winner"], by))["wins"] += 1
+            if summary.get("adjudicated"):
+                group(player_label(summary, summary["winner"], by))["adjudicated_wins"] += 1
+        for player_id in summary["bankruptcies"]:
+            group(player_label(summary, player_id, by))["bankruptcies"] += 1
+        for flow, amount in summary["rent"].items():
+            payer, owner = flow.split("->")
+            group(player_label(summary, payer, by))["rent_paid"] += amount
+            group(player_label(summary, owner, by))["rent_received"] += amount
+        for player_id, amount in summary["tax"].items():
+            group(player_label(summary, player_id, by))["tax_paid"] += amount
+        for player_id, counts in summary["trades"].items():
+            stats = group(player_label(summary, player_id, by))
+            for key in ("proposed", "accepted", "rejected", "failed"):
+                stats[f"trades_{key}"] += counts[key]
+        for player_id, count in summary["invalid_actions"].items():
+            group(player_label(summary, player_id, by))["invalid_actions"] += count
+        for player_id, count in summary.get("forced_moves", {}).items():
+            group(player_label(summary, player_id, by))["forced_moves"] += count
+
+    for stats in groups.values():
+        games = stats["games"]
+        answered = stats["trades_accepted"] + stats["trades_rejected"]
+        stats["win_rate"] = stats["wins"] / games if games else 0.0
+        stats["rent_net"] = stats["rent_received"] - stats["rent_paid"]
+        stats["trade_acceptance"] = stats["trades_accepted"] / answered if answered else 0.0
+        stats["invalid_per_game"] = stats["invalid_actions"] / games if games else 0.0
+    return groups
+
+
+TABLES = {
+    "Wins": ["games", "wins", "win_rate", "adjudicated_wins", "bankruptcies"],
+    "Rent flows": ["rent_paid", "rent_received", "rent_net", "tax_paid"],
+    "Trades": ["trades_proposed", "trades_accepted", "trades_rejected", "trades_failed", "trade_acceptance"],
+    "Invalid and forced actions": ["invalid_actions", "invalid_per_game", "forced_moves"],
+}
+
+
+def format_table(title, groups, columns):
+    """Format one aggregate table as fixed-width text."""
+    rows = [["group"] + columns]
+    for label in sorted(groups):
+        stats = groups[label]
+        rows.append([label] + [f"{stats[c]:.3f}" if isinstance(stats[c], float) else str(stats[c]) for c in columns])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = [f"== {title} =="]
+    for row in rows:
+        lines.append("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate statistics over Monopoly game logs.")
+    parser.add_argument("results_dir", nargs="?", default="../results")
+    parser.add_argument("--by", default="agent", choices=["agent", "model", "type", "seat"])
+    parser.add_argument("--where", action="append", default=[], metavar="KEY=VALUE",
+                        help="Only include games whose match config has KEY equal to VALUE.")
+    parser.add_argument("--include-incomplete", action="store_true")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the index and re-parse every file.")
+    parser.add_argument("--json", action="store_true", help="Print the aggregate tables as JSON.")
+    args = parser.parse_args()
+
+    where = dict(item.split("=", 1) for item in args.where)
+    index, parsed = update_index(args.results_dir, rebuild=args.rebuild)
+    summaries = game_summaries(index)
+    groups = build_tables(summaries, by=args.by, where=where, include_incomplete=args.include_incomplete)
+
+    if args.json:
+        print(json.dumps(groups, indent=2))
+        return
+    print(f"Parsed {parsed} new or changed file(s); {len(summaries)} game(s) indexed.\n")
+    print("\n\n".join(format_table(title, groups, columns) for title, columns in TABLES.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,83 @@
-from openai import OpenAI
+import functools
 import json
-from dotenv import load_dotenv
 import os
+import threading
+import time
+from engine import get_deciding_player
+from rate_limit import DEFAULT_STATE_FILE, RateLimiter, estimate_tokens
+from routing import call_cost
 from tools import MASTER_TOOLS, get_management_tools
 
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# openai and dotenv are imported on first use, so scripted-agent runs never load them or need an API key
 model = "gpt-4o-mini-2024-07-18"
 # model = "o3-2025-04-16"
 # model = "o3-mini-2025-01-31"
 
-def get_llm_response(prompt: str, game_state, tool_names, logger=None) -> dict:
+_call_gate = None # scheduler.PriorityGate bounding this process's concurrent calls, if any
+RATE_LIMIT_RETRIES = 5 # calls rejected with a 429 are retried this many times before the error is raised
+
+def set_call_gate(gate):
+    """Route this process's model calls through a scheduler.PriorityGate (None removes it)."""
+    global _call_gate
+    _call_gate = gate
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """Create the OpenAI client on first use and reuse it afterwards."""
+    from dotenv import load_dotenv
+    from openai import OpenAI
+
+    load_dotenv()
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+@functools.lru_cache(maxsize=1)
+def get_rate_limiter():
+    """The RateLimiter for config.rate_limits, shared with every process using the same state file (None without limits)."""
+    import config
+    limits = getattr(config, "rate_limits", None)
+    if not limits:
+        return None
+    return RateLimiter(limits, getattr(config, "rate_limit_file", None) or DEFAULT_STATE_FILE)
+
+def _retry_after(error):
+    """Seconds the provider asked to wait before retrying, if it said."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def _read_tool_call(events):
+    """Read a response stream up to its first complete function call.
+
+    Args:
+        events: Iterator of the stream's server events; the rest is left unread.
+
+    Returns:
+        tuple: (tool_call, output) - the call (None if the stream ended without one) and
+        the output items completed up to and including it.
+    """
+    output = []
+    for event in events:
+        if event.type == "response.output_item.done":
+            output.append(event.item)
+            if event.item.type == "function_call":
+                return event.item, output
+    return None, output
+
+def _drain(events):
+    """Read the rest of a response stream to its end; returns the completed response (None if the stream broke off)."""
+    completed = None
+    try:
+        for event in events:
+            if event.type == "response.completed":
+                completed = event.response
+    except Exception as e:
+        print(f"ERROR: Response stream broke off after the tool call: {e}")
+    return completed
+
+def get_llm_response(prompt: str, game_state, tool_names, logger=None, model_name=None, route=None, stream=False,
+                     player_id=None) -> dict:
     """Gets a response from the language model.
 
     Args:
@@ -19,30 +85,116 @@ def get_llm_response(prompt: str, game_state, tool_names, logger=None) -> dict:
         game_state: The current state of the game.
         tool_names: The names of the tools to use for the given prompt
         logger: Optional logger instance for logging API responses
+        model_name: Model to call (defaults to ``model``)
+        route: Optional route from routing.resolve_route; its model, reasoning effort and
+            output token cap override ``model_name`` and the provider defaults.
+        stream: Stream the response and return the action as soon as its tool call is
+            complete. The output up to the call is logged then; the rest of the stream (the
+            token usage and any output after the call) is read and logged in the background,
+            and the call keeps its scheduler API slot until then.
+        player_id: The player the call decides for, which its logs are credited to. Defaults to
+            the deciding player of the state, which is wrong for sealed bids (every bidder decides).
 
     Returns:
         The response from the language model.
     """
     tools = [MASTER_TOOLS[tool_name] for tool_name in tool_names]
-    response = client.responses.create(
-        model=model,
-        instructions="You are a Monopoly player. Your goal is to win the game by making smart decisions. Before taking any action, briefly explain your reasoning/strategy for the action you are taking.",
-        input=prompt,
-        tools=tools,
-        tool_choice="required", 
-    )
-
-    # Log API response if logger is provided
-    if logger:
-        logger.log_api_response(str(response.output))
-    else:
-        print("RESPONSE", response.output)
-
-    tool_call = None
-    for item in response.output:
-        if hasattr(item, "name"):
-            tool_call = item
+    route = route or {}
+    model_name = route.get("model") or model_name or model
+    options = {}
+    if route.get("reasoning_effort"):
+        options["reasoning"] = {"effort": route["reasoning_effort"]}
+    if route.get("max_output_tokens"):
+        options["max_output_tokens"] = route["max_output_tokens"]
+    if stream:
+        options["stream"] = True
+    limiter = get_rate_limiter()
+    gate = _call_gate
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        # Wait for the model's shared quota, so concurrent games queue instead of failing with 429s
+        reserved = limiter.acquire(model_name, estimate_tokens(prompt + json.dumps(tools))) if limiter else 0
+        # Under a scheduler budget, calls from the games closest to their turn limit go first. A streamed call
+        # holds its slot until the stream is drained, so api_slots bounds the open provider connections
+        if gate:
+            gate.acquire(game_state.turn_number / max(game_state.max_turns, 1))
+        start = time.perf_counter()
+        try:
+            response = get_client().responses.create(
+                model=model_name,
+                instructions="You are a Monopoly player. Your goal is to win the game by making smart decisions. Before taking any action, briefly explain your reasoning/strategy for the action you are taking.",
+                input=prompt,
+                tools=tools,
+                tool_choice="required", 
+                **options,
+            )
+            if stream:
+                events = iter(response)
+                tool_call, output = _read_tool_call(events)
+        except Exception as e:
+            if gate:
+                gate.release()
+            if limiter:
+                limiter.cancel(model_name, reserved) # the retry reserves again
+            if getattr(e, "status_code", None) != 429 or attempt == RATE_LIMIT_RETRIES:
+                raise
+            delay = _retry_after(e) or 2 ** attempt
+        else:
+            if gate and not stream:
+                gate.release()
             break
+        if limiter and model_name in limiter.limits:
+            limiter.backoff(model_name, delay)
+        else:
+            time.sleep(delay)
+    seconds = time.perf_counter() - start # time to the decision
+    # The game moves on once the action is returned, so take what the log needs from the state now
+    if player_id is None and logger:
+        player_id = get_deciding_player(game_state).player_id
+    turn, phase = game_state.turn_number, game_state.phase
+
+    def log_usage(usage):
+        if limiter:
+            limiter.settle(model_name, reserved, getattr(usage, "total_tokens", None))
+        if logger:
+            input_tokens, output_tokens = getattr(usage, "input_tokens", None), getattr(usage, "output_tokens", None)
+            logger.log_api_call(player_id, turn, phase, model_name, seconds, input_tokens, output_tokens,
+                                route=route.get("name"), cost=call_cost(model_name, input_tokens, output_tokens))
+
+    def log_output(output):
+        # Log API response if logger is provided
+        if logger:
+            logger.log_api_response(str(output), player_id)
+        else:
+            print("RESPONSE", output)
+
+    if stream:
+        # Hand the action back now; the rest of the stream is only needed for the usage and the log
+        log_output(output)
+        def rest():
+            try:
+                response = _drain(events)
+            finally:
+                if gate:
+                    gate.release()
+            log_usage(getattr(response, "usage", None))
+            if response is not None and len(response.output) > len(output):
+                later = response.output[len(output):]
+                if logger:
+                    logger.log_api_response_continued(str(later), player_id, turn)
+                else:
+                    print("RESPONSE (continued)", later)
+        if logger:
+            logger.defer(rest)
+        else:
+            threading.Thread(target=rest, daemon=True).start()
+    else:
+        log_usage(getattr(response, "usage", None))
+        log_output(response.output)
+        tool_call = None
+        for item in response.output:
+            if hasattr(item, "name"):
+                tool_call = item
+                break
     
     if tool_call is None:
         raise ValueError("No tool call found in response")
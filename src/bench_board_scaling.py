@@ -0,0 +1,101 @@
+"""Measure how simulation speed, game length and prompt size scale with board size.
+
+Plays games between scripted agents on the bundled boards and on synthetic
+boards of increasing size, and reports engine steps per second, game length
+and the size of the prompt an LLMAgent would receive at the end of the game.
+
+Usage:
+    python bench_board_scaling.py --sizes 40 80 160 320 --games 20
+"""
+
+import argparse
+import random
+import time
+
+from agents import GreedyBuyer, RandomAgent, LLMAgent
+from boards import generate_board, load_board
+from engine import GameState, GamePhase
+from run_match import play_game
+
+
+class CountingAgent:
+    """Forwards to a wrapped agent and counts its decisions."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.player_id = agent.player_id
+        self.steps = 0
+
+    def act(self, observation):
+        self.steps += 1
+        return self.agent.act(observation)
+
+
+def prompt_size(game_state):
+    """Length in characters of the start-of-turn prompt for the first surviving player."""
+    if not game_state.players:
+        return 0
+    player_id = min(game_state.players)
+    observation = {"game_state": game_state, "phase": GamePhase.START_MANAGEMENT, "logger": None}
+    return len(LLMAgent(player_id)._create_prompt(observation))
+
+
+def bench_board(board, num_games, num_players, max_turns, starting_cash, seed=0):
+    """Play games on one board and aggregate timings.
+
+    Returns:
+        dict: Steps per second, mean steps and turns per game, and mean/max prompt size.
+    """
+    total_steps = 0
+    total_turns = 0
+    elapsed = 0.0
+    prompts = []
+    for game in range(num_games):
+        random.seed(seed + game)
+        agents = [
+            CountingAgent(GreedyBuyer(i, seed=seed + game) if i % 2 == 0 else RandomAgent(i, seed=seed + game))
+            for i in range(num_players)
+        ]
+        game_state = GameState(num_players, board.tile_data, max_turns, starting_cash)
+        start = time.perf_counter()
+        play_game(game_state, agents)
+        elapsed += time.perf_counter() - start
+        total_steps += sum(a.steps for a in agents)
+        total_turns += game_state.turn_number
+        prompts.append(prompt_size(game_state))
+
+    return {
+        "board": board.name,
+        "tiles": len(board),
+        "steps_per_sec": total_steps / elapsed if elapsed else 0.0,
+        "steps_per_game": total_steps / num_games,
+        "turns_per_game": total_turns / num_games,
+        "prompt_chars": sum(prompts) / num_games,
+        "max_prompt_chars": max(prompts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark engine and prompt scaling with board size")
+    parser.add_argument("--boards", nargs="*", default=["condensed", "classic_us"], help="Bundled boards to include")
+    parser.add_argument("--sizes", nargs="*", type=int, default=[40, 80, 160, 320], help="Synthetic board sizes (tiles)")
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--starting-cash", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Synthetic boards keep the classic board's density: ~55% streets in sets of 2-3, one railroad per 10 tiles
+    boards = [load_board(name) for name in args.boards]
+    boards += [generate_board(n, max(1, n * 22 // 100), max(1, n // 10), seed=args.seed) for n in args.sizes]
+
+    print(f"{'board':<28} {'tiles':>6} {'steps/s':>10} {'steps/game':>11} {'turns/game':>11} {'prompt chars':>13} {'max prompt':>11}")
+    for board in boards:
+        row = bench_board(board, args.games, args.players, args.max_turns, args.starting_cash, args.seed)
+        print(f"{row['board']:<28} {row['tiles']:>6} {row['steps_per_sec']:>10.0f} {row['steps_per_game']:>11.1f} "
+              f"{row['turns_per_game']:>11.1f} {row['prompt_chars']:>13.0f} {row['max_prompt_chars']:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure how per-step cost scales with the number of players.
+
+Plays free-for-all games between scripted agents at increasing table sizes and
+reports the engine's time per decision. Turn rotation, agent lookup and auction
+bidding are O(1) per step, so time per step should stay flat as players are added.
+
+Usage:
+    python bench_players.py --players 2 4 8 16 32 --games 10 --board classic_us
+"""
+
+import argparse
+import random
+import time
+
+from agents import GreedyBuyer, RandomAgent
+from bench_board_scaling import CountingAgent
+from boards import load_board
+from engine import GameState
+from run_match import play_game
+
+
+def bench_players(board, num_players, num_games, max_turns, starting_cash, seed=0):
+    """Play games at one table size and aggregate timings.
+
+    Returns:
+        dict: Time per step, steps per game, turns per game and bankruptcies per game.
+    """
+    total_steps = 0
+    total_turns = 0
+    bankruptcies = 0
+    elapsed = 0.0
+    for game in range(num_games):
+        random.seed(seed + game)
+        agents = [
+            CountingAgent(GreedyBuyer(i, seed=seed + game) if i % 2 == 0 else RandomAgent(i, seed=seed + game))
+            for i in range(num_players)
+        ]
+        game_state = GameState(num_players, board.tile_data, max_turns, starting_cash)
+        start = time.perf_counter()
+        play_game(game_state, agents)
+        elapsed += time.perf_counter() - start
+        total_steps += sum(a.steps for a in agents)
+        total_turns += game_state.turn_number
+        bankruptcies += num_players - len(game_state.players)
+
+    return {
+        "players": num_players,
+        "us_per_step": 1e6 * elapsed / total_steps if total_steps else 0.0,
+        "steps_per_game": total_steps / num_games,
+        "turns_per_game": total_turns / num_games,
+        "bankruptcies_per_game": bankruptcies / num_games,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark engine step cost against player count")
+    parser.add_argument("--players", nargs="*", type=int, default=[2, 4, 8, 16, 32])
+    parser.add_argument("--board", default="classic_us")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--max-turns", type=int, default=50)
+    parser.add_argument("--starting-cash", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    board = load_board(args.board)
+    print(f"Board: {board.name} ({len(board)} tiles)")
+    print(f"{'players':>8} {'us/step':>9} {'steps/game':>11} {'turns/game':>11} {'bankrupt/game':>14}")
+    for num_players in args.players:
+        row = bench_players(board, num_players, args.games, args.max_turns, args.starting_cash, args.seed)
+        print(f"{row['players']:>8} {row['us_per_step']:>9.2f} {row['steps_per_game']:>11.1f} "
+              f"{row['turns_per_game']:>11.1f} {row['bankruptcies_per_game']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Content-addressed, compressed store for the prompts and responses in game logs.
+
+LLM prompts are mostly the same board description from one decision to the next,
+so writing each one into the text log makes logs huge and slow to write. Instead
+``GameLogger`` puts prompt and response bodies in a ``BlobStore`` next to the log
+(``<game_id>.blobs``) and writes a reference in their place:
+
+    PROMPT (Player 0): <blob 3f9c0a51d2e47b86>
+
+Blobs are keyed by a hash of their text, so a repeated body is stored once. Each
+body is zlib-compressed with the previous body of the same kind for the same
+player as a preset dictionary, which makes it in effect a delta against that
+body. Delta chains are cut every ``max_chain`` blobs, so reading any one blob
+decompresses at most that many.
+
+    store = BlobStore("results/game_x.blobs")
+    key = store.put(prompt, base=previous_key)
+    store.get(key) == prompt
+    expand_line("PROMPT (Player 0): <blob 3f9c0a51d2e47b86>", store)  # the original log line
+
+The file is a sequence of records: an 8-byte key, the 8-byte key of the base blob
+(zeros for none), a 4-byte big-endian length and the compressed body.
+"""
+
+import hashlib
+import re
+import struct
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+HEADER = struct.Struct(">8s8sI")
+NO_BASE = bytes(8)
+BLOB_REF_RE = re.compile(r"<blob ([0-9a-f]{16})>")
+
+def blob_key(text):
+    """Hex key of a text body."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+def blob_ref(key):
+    """How a blob is referenced in a log line."""
+    return f"<blob {key}>"
+
+class BlobStore:
+    """Append-only pack file of compressed text bodies, keyed by content hash."""
+
+    def __init__(self, path, level=1, max_chain=32):
+        """Opens the store, reading the index of an existing pack file.
+
+        Args:
+            path: Pack file; created on the first put.
+            level: zlib compression level (1 is faster than the default 6 and, with a base to
+                delta against, nearly as small).
+            max_chain: Longest chain of deltas; a body whose base is at this depth is stored whole.
+        """
+        self.path = Path(path)
+        self.level = level
+        self.max_chain = max_chain
+        self.index = {} # key -> (offset of the body, length, base key or None)
+        self.depth = {} # key -> number of bases below it
+        self._file = None
+        self._cache = OrderedDict() # key -> text, for the bodies most recently written or read (the likely bases)
+        if self.path.exists():
+            self._read_index()
+
+    def _read_index(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            key, base, length = HEADER.unpack_from(data, offset)
+            start = offset + HEADER.size
+            if start + length > len(data):
+                break # Truncated final record of an interrupted game
+            key, base = key.hex(), None if base == NO_BASE else base.hex()
+            self.index[key] = (start, length, base)
+            self.depth[key] = self.depth.get(base, -1) + 1 if base else 0
+            offset = start + length
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def put(self, text, base=None):
+        """Store a body (once) and return its key.
+
+        Args:
+            text: The body.
+            base: Key of a similar body already in the store to compress against.
+        """
+        key = blob_key(text)
+        if key in self.index:
+            return key
+        if base is not None and (base not in self.index or self.depth[base] >= self.max_chain):
+            base = None
+        if base is None:
+            compressor = zlib.compressobj(self.level)
+        else:
+            compressor = zlib.compressobj(self.level, zdict=self.get(base).encode("utf-8"))
+        body = compressor.compress(text.encode("utf-8")) + compressor.flush()
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(HEADER.pack(bytes.fromhex(key), bytes.fromhex(base) if base else NO_BASE, len(body)))
+        self.index[key] = (self._file.tell(), len(body), base)
+        self._file.write(body)
+        self.depth[key] = self.depth[base] + 1 if base else 0
+        self._remember(key, text)
+        return key
+
+    def get(self, key):
+        """The body stored under a key.
+
+        Raises:
+            KeyError: If the key is not in the store.
+        """
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            return text
+        offset, length, base = self.index[key]
+        if self._file is not None:
+            self._file.flush()
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            body = f.read(length)
+        if base is None:
+            text = zlib.decompress(body).decode("utf-8")
+        else:
+            text = zlib.decompressobj(zdict=self.get(base).encode("utf-8")).decompress(body).decode("utf-8")
+        self._remember(key, text)
+        return text
+
+    def _remember(self, key, text):
+        self._cache[key] = text
+        if len(self._cache) > 2 * self.max_chain:
+            self._cache.popitem(last=False)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def expand_line(line, store):
+    """Replace the blob references in a log line with the bodies they stand for."""
+    if "<blob " not in line:
+        return line
+    return BLOB_REF_RE.sub(lambda match: store.get(match.group(1)), line)
+
+def read_log_lines(log_file):
+    """Lines of a text log as they would read without blob references (bodies are split into their lines).
+
+    Args:
+        log_file: A ``<game_id>.log`` file; its blobs are read from ``<game_id>.blobs`` beside it.
+    """
+    log_file = Path(log_file)
+    blobs = log_file.with_suffix(".blobs")
+    store = BlobStore(blobs) if blobs.exists() else None
+    with open(log_file, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if store is not None and "<blob " in line:
+                yield from expand_line(line, store).split("\n")
+            else:
+                yield line
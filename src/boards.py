@@ -0,0 +1,199 @@
+"""Board definitions: loading, validation and synthetic generation.
+
+Boards live in the top-level ``boards/`` directory as JSON or TOML files with a
+``name`` and a list of ``tiles`` (the same dicts ``GameState`` takes as
+``tile_data``). A board is validated and compiled once into a ``Board`` and
+cached, so repeated games on the same file pay the cost a single time.
+"""
+
+import functools
+import json
+import random
+from pathlib import Path
+
+BOARDS_DIR = Path(__file__).resolve().parent.parent / "boards"
+
+# Fields each tile type must define (besides "name" and "type"), matching the tile constructors in engine.py
+TILE_FIELDS = {
+    "street": ("cost", "rent", "color_set", "rent_one_house", "rent_two_houses", "rent_three_houses",
+               "rent_four_houses", "rent_hotel", "house_cost", "mortgage"),
+    "railroad": ("cost", "rent"),
+    "utility": ("cost", "rent"),
+    "tax": ("rent",),
+    "other": (),
+    "action": (),
+}
+PROPERTY_TYPES = ("street", "railroad", "utility")
+
+
+class Board:
+    """A validated board definition with precomputed lookups."""
+
+    def __init__(self, name, tile_data, notes=""):
+        """Initializes the board.
+
+        Args:
+            name: Board name.
+            tile_data: List of tile dicts, already validated.
+            notes: Free-text description of the board.
+        """
+        self.name = name
+        self.notes = notes
+        self.tile_data = tile_data
+        self.color_sets = {}
+        self.railroads = []
+        self.property_ids = []
+        for tile_id, tile in enumerate(tile_data):
+            if tile["type"] in PROPERTY_TYPES:
+                self.property_ids.append(tile_id)
+            if tile["type"] == "street":
+                self.color_sets.setdefault(tile["color_set"], []).append(tile_id)
+            elif tile["type"] == "railroad":
+                self.railroads.append(tile_id)
+
+    def __len__(self):
+        return len(self.tile_data)
+
+    def __repr__(self):
+        return f"Board({self.name!r}, {len(self)} tiles, {len(self.color_sets)} color sets, {len(self.railroads)} railroads)"
+
+
+def validate_tiles(tile_data):
+    """Check that a tile list can be turned into an engine board.
+
+    Args:
+        tile_data: List of tile dicts.
+
+    Raises:
+        ValueError: Describing every problem found.
+    """
+    errors = []
+    if not tile_data:
+        errors.append("board has no tiles")
+    property_names = set()
+    for i, tile in enumerate(tile_data):
+        name = tile.get("name")
+        tile_type = tile.get("type")
+        if not isinstance(name, str) or not name:
+            errors.append(f"tile {i}: missing name")
+        if tile_type not in TILE_FIELDS:
+            errors.append(f"tile {i} ({name}): unknown type {tile_type!r}")
+            continue
+        required = set(TILE_FIELDS[tile_type])
+        present = set(tile) - {"name", "type"}
+        if missing := required - present:
+            errors.append(f"tile {i} ({name}): missing {sorted(missing)}")
+        if extra := present - required:
+            errors.append(f"tile {i} ({name}): unexpected {sorted(extra)}")
+        for field in required & present:
+            if field != "color_set" and (not isinstance(tile[field], int) or tile[field] < 0):
+                errors.append(f"tile {i} ({name}): {field} must be a non-negative integer")
+        if tile_type in PROPERTY_TYPES:
+            # Properties are referred to by name in LLM tool calls, so names must be unique
+            if name in property_names:
+                errors.append(f"tile {i}: duplicate property name {name!r}")
+            property_names.add(name)
+    if errors:
+        raise ValueError("Invalid board:\n  " + "\n  ".join(errors))
+
+
+def compile_board(tile_data, name="custom", notes=""):
+    """Validate a tile list and wrap it in a Board."""
+    validate_tiles(tile_data)
+    return Board(name, list(tile_data), notes)
+
+
+def resolve_board_path(board):
+    """Resolve a board name (e.g. "classic_us") or file path to a path on disk."""
+    path = Path(board)
+    if path.suffix in (".json", ".toml") and path.exists():
+        return path.resolve()
+    for suffix in (".json", ".toml"):
+        candidate = BOARDS_DIR / f"{board}{suffix}"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"No board file found for {board!r} (looked in {BOARDS_DIR})")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_board_file(path, mtime_ns):
+    with open(path, "rb") as f:
+        if path.suffix == ".toml":
+            import tomllib
+            data = tomllib.load(f)
+        else:
+            data = json.load(f)
+    return compile_board(data.get("tiles", []), data.get("name", path.stem), data.get("notes", ""))
+
+
+def load_board(board):
+    """Load a board by name or path, compiling it once per file version.
+
+    Args:
+        board: A board name from ``boards/`` or a path to a JSON/TOML board file.
+
+    Returns:
+        Board: The compiled board (shared between callers; do not mutate).
+    """
+    path = resolve_board_path(board)
+    return _load_board_file(path, path.stat().st_mtime_ns)
+
+
+def generate_board(num_tiles, num_color_sets, num_railroads, num_taxes=None, seed=0):
+    """Generate a synthetic board for scaling experiments.
+
+    Streets are dealt into color sets of two or three properties, railroads are
+    spread evenly around the board, and prices and rents rise with position the
+    way they do on the classic board. GO is always tile 0 and any tiles left over
+    are taxes or free-parking-style spaces.
+
+    Args:
+        num_tiles: Total number of tiles.
+        num_color_sets: Number of street color sets.
+        num_railroads: Number of railroads.
+        num_taxes: Number of tax tiles (defaults to roughly one per 20 tiles).
+        seed: Seed for the set sizes and layout.
+
+    Returns:
+        Board: The compiled synthetic board.
+    """
+    rng = random.Random(seed)
+    if num_taxes is None:
+        num_taxes = max(1, num_tiles // 20)
+    set_sizes = [rng.choice((2, 3)) for _ in range(num_color_sets)]
+    num_streets = sum(set_sizes)
+    if 1 + num_streets + num_railroads + num_taxes > num_tiles:
+        raise ValueError(f"{num_tiles} tiles can't hold GO, {num_streets} streets, {num_railroads} railroads and {num_taxes} taxes")
+
+    slots = list(range(1, num_tiles))
+    railroad_slots = {slots[(i * len(slots)) // max(num_railroads, 1) + len(slots) // (2 * max(num_railroads, 1))] for i in range(num_railroads)}
+    remaining = [s for s in slots if s not in railroad_slots]
+    street_slots = sorted(rng.sample(remaining, num_streets))
+    remaining = [s for s in remaining if s not in set(street_slots)]
+    tax_slots = set(rng.sample(remaining, num_taxes))
+
+    tiles = [None] * num_tiles
+    tiles[0] = {"name": "GO", "type": "other"}
+    street_iter = iter(street_slots)
+    for set_index, size in enumerate(set_sizes):
+        for k in range(size):
+            slot = next(street_iter)
+            cost = 60 + int(340 * slot / num_tiles) // 20 * 20
+            rent = max(2, cost // 10 - 4)
+            house_cost = 50 * (1 + (4 * slot) // num_tiles)
+            tiles[slot] = {
+                "name": f"Street {set_index}-{k}", "type": "street", "cost": cost, "rent": rent,
+                "rent_one_house": rent * 5, "rent_two_houses": rent * 15, "rent_three_houses": rent * 40,
+                "rent_four_houses": rent * 50, "rent_hotel": rent * 60, "house_cost": house_cost,
+                "mortgage": cost // 2, "color_set": f"set_{set_index}",
+            }
+    for i, slot in enumerate(sorted(railroad_slots)):
+        tiles[slot] = {"name": f"Railroad {i}", "type": "railroad", "cost": 200, "rent": 25}
+    for i, slot in enumerate(sorted(tax_slots)):
+        tiles[slot] = {"name": f"Tax {i}", "type": "tax", "rent": 100 if i % 2 else 200}
+    for slot in range(num_tiles):
+        if tiles[slot] is None:
+            tiles[slot] = {"name": f"Free Space {slot}", "type": "other"}
+
+    name = f"synthetic_{num_tiles}t_{num_color_sets}c_{num_railroads}r"
+    return compile_board(tiles, name, notes=f"Generated with seed {seed}")
@@ -0,0 +1,492 @@
+"""Command-line entry point for running experiments from a spec file.
+
+An experiment spec (TOML or JSON) describes the matches to play; every list-valued
+setting is an axis of the job matrix and each cell is played once per seed:
+
+    name = "llm_vs_baselines"
+    board = "condensed"                 # or ["condensed", "classic_us"]
+    starting_cash = [750, 1500]
+    max_turns = 30
+    auction_mode = "ascending"
+    seeds = 100                         # seeds 0..99, or an explicit list; "seed" sets the first
+    runner = "process"                  # "serial" or "process"
+    workers = 8
+    slots = 4                           # games each worker plays at once (LLM games mostly wait on the API)
+    api_slots = 8                       # concurrent LLM calls per worker (default: unbounded)
+    budget = 7200                       # seconds; no game starts after this
+    output = "../results/llm_vs_baselines"
+    logs = true                         # full per-game logs for analytics.py
+
+    [[lineups]]
+    name = "llm_vs_random"
+    agents = [{type = "llm", model = "gpt-4o-mini-2024-07-18"}, {type = "random"}]
+
+Settings left out fall back to config.py. A top-level ``agents`` list can stand in
+for a single lineup. Relative board and output paths are resolved against the spec
+file. Each game's dice are seeded with its seed and each agent with seed + seat
+(unless its spec sets one), so a sweep can be re-run exactly. Finished games are
+appended to ``games.jsonl`` in the output directory, and a re-run skips them;
+per-game logs go to ``logs/`` for ``analytics.py``. A game that raises is recorded
+in ``errors.jsonl`` instead, the others play on, and a re-run plays it again.
+
+With ``paired = true`` each seed is played once per rotation of the lineup (twice,
+seats swapped, for two agents). Dice are rolled from per-seat streams and agents
+are seeded by lineup position, so the rotations share their luck and the summary
+reports paired win-rate and cash-margin differences for lineup position 0 (or the
+stopping seat).
+
+The process runner hands each free game slot the next game (see scheduler.py),
+longest games first (by each cell's mean game time so far) unless ``[stopping]`` is
+set. With a ``budget``, games not started in time are left for a re-run, and in
+its last 10% the LLM calls of the games closest to completion go first.
+
+An ``[adjudication]`` table ends games early once the winner is settled (see
+adjudication.py); adjudicated games record the result under "adjudicated".
+
+A ``[stopping]`` table ends each cell early once a sequential test on one seat's
+win rate decides (see stopping.py); the decisions are written to ``stopping.json``.
+
+``db = "../results/results.db"`` (or ``--db``) also records every finished game,
+with its decisions and API calls when logs are on, in an SQLite results database
+(see results_db.py).
+
+Usage:
+    monopoly-bench run experiments/llm_vs_baselines.toml [--workers 8] [--slots 4] [--budget 3600] [--dry-run]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+import traceback
+from pathlib import Path
+
+import config
+from agents import build_agents
+from boards import load_board
+from engine import GameState
+from logger import GameLogger
+from run_match import final_standings, play_game
+from adjudication import Adjudicator
+from stopping import EarlyStopping
+from results_db import DB_EVENTS, ResultsDB
+from scheduler import order_jobs, run_scheduled
+
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "results"
+SUMMARY_FILE = "games.jsonl"
+ERRORS_FILE = "errors.jsonl" # games that raised; they are not in games.jsonl, so a re-run plays them again
+STOPPING_FILE = "stopping.json"
+LOGS_DIR = "logs" # per-game logs, kept apart from games.jsonl so analytics.py can read them directly
+RUNNERS = ("serial", "process")
+MATRIX_AXES = ("board", "lineup", "starting_cash", "max_turns", "auction_mode")
+
+def load_spec(path):
+    """Read an experiment spec from a TOML or JSON file."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        if path.suffix == ".toml":
+            import tomllib
+            spec = tomllib.load(f)
+        else:
+            spec = json.load(f)
+    spec.setdefault("name", path.stem)
+    spec["_base_dir"] = str(path.resolve().parent)
+    return spec
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def _resolve_path(value, base_dir):
+    """Resolve a relative file path against the spec's directory; names are left alone."""
+    path = Path(value)
+    if path.suffix and not path.is_absolute():
+        return str(Path(base_dir) / path)
+    return value
+
+def _lineups(spec):
+    """The spec's lineups as (name, agent specs) pairs."""
+    if "lineups" in spec:
+        lineups = spec["lineups"]
+    else:
+        lineups = [{"agents": spec.get("agents", config.agents)}]
+    result = []
+    for lineup in lineups:
+        if isinstance(lineup, list):
+            lineup = {"agents": lineup}
+        agents = [{"type": a} if isinstance(a, str) else dict(a) for a in lineup["agents"]]
+        name = lineup.get("name") or "_vs_".join(a["type"].split(":")[-1] for a in agents)
+        result.append((name, agents))
+    return result
+
+def _seeds(spec):
+    seeds = spec.get("seeds", 1)
+    if isinstance(seeds, int):
+        first = spec.get("seed", 0)
+        return list(range(first, first + seeds))
+    return list(seeds)
+
+def expand_jobs(spec):
+    """Expand a spec into its job matrix.
+
+    Returns:
+        list: One dict per game with "job_id", "cell", "seed", "rotation", "seats"
+            (the lineup position playing each seat), "board", "lineup", "agents" (in
+            seat order), "starting_cash", "max_turns", "auction_mode" and "adjudication".
+    """
+    base_dir = spec.get("_base_dir", ".")
+    axes = {
+        "board": [_resolve_path(b, base_dir) for b in _as_list(spec.get("board", config.board))],
+        "lineup": _lineups(spec),
+        "starting_cash": _as_list(spec.get("starting_cash", config.starting_cash)),
+        "max_turns": _as_list(spec.get("max_turns", config.max_turns)),
+        "auction_mode": _as_list(spec.get("auction_mode", config.auction_mode)),
+    }
+    seeds = _seeds(spec)
+    paired = spec.get("paired", False)
+    jobs = []
+    for cell, values in enumerate(itertools.product(*(axes[axis] for axis in MATRIX_AXES))):
+        settings = dict(zip(MATRIX_AXES, values))
+        lineup_name, agents = settings.pop("lineup")
+        for seed in seeds:
+            for rotation in range(len(agents) if paired else 1):
+                seats = [(seat + rotation) % len(agents) for seat in range(len(agents))]
+                jobs.append({
+                    "job_id": f"c{cell:03d}_s{seed}" + (f"_r{rotation}" if paired else ""),
+                    "cell": cell,
+                    "seed": seed,
+                    "rotation": rotation,
+                    "seats": seats,
+                    "lineup": lineup_name,
+                    "agents": [agents[i] for i in seats],
+                    **settings,
+                    "adjudication": spec.get("adjudication"),
+                })
+    return jobs
+
+def run_job(job, output_dir=None, write_logs=False, collect_events=False):
+    """Play one game of the matrix.
+
+    Args:
+        job: A job dict from expand_jobs.
+        output_dir: Experiment output directory (logs go in its logs/ subdirectory).
+        write_logs: Whether to write the text log and event file.
+        collect_events: Whether to return the logged decision and API-call events under "events".
+
+    Returns:
+        dict: The job's settings plus "agents" (as described by the agents), "turns",
+            "standings" (surviving players by cash, the adjudicated winner first),
+            "winner" (a seat), "winner_agent" (its lineup position), "agent_cash" (final
+            cash by lineup position, 0 if bankrupt), "bankrupt", "adjudicated" (the
+            adjudication result, if the game was ended early) and "seconds".
+    """
+    random.seed(job["seed"])
+    board = load_board(job["board"])
+    # Agents are seeded by lineup position, so an agent makes the same random choices from whichever seat it plays
+    seats = job["seats"]
+    agents = build_agents([{"seed": job["seed"] + seats[seat], **spec} for seat, spec in enumerate(job["agents"])])
+    game_state = GameState(len(agents), board.tile_data, job["max_turns"], job["starting_cash"], job["auction_mode"], seed=job["seed"])
+    adjudicator = Adjudicator(**{"seed": job["seed"], **job["adjudication"]}) if job.get("adjudication") else None
+
+    logger = None
+    if write_logs:
+        logger = GameLogger(f"{Path(output_dir).name}_{job['job_id']}", Path(output_dir) / LOGS_DIR, console=False,
+                            collect=DB_EVENTS if collect_events else ())
+        logger.log_match_config({
+            "agents": [agent.describe() for agent in agents],
+            "num_players": len(agents),
+            "starting_cash": job["starting_cash"],
+            "max_turns": job["max_turns"],
+            "auction_mode": job["auction_mode"],
+            "board": board.name,
+            "num_tiles": len(board),
+            "job_id": job["job_id"],
+            "lineup": job["lineup"],
+            "seed": job["seed"],
+            "adjudication": adjudicator.describe() if adjudicator else None,
+        })
+
+    start = time.perf_counter()
+    try:
+        play_game(game_state, agents, logger, adjudicator=adjudicator)
+    finally:
+        if logger:
+            logger.close()
+    standings = final_standings(game_state)
+    winner = standings[0].player_id if standings else None
+    agent_cash = [0] * len(agents)
+    for player in game_state.players.values():
+        agent_cash[seats[player.player_id]] = player.cash
+    result = {
+        **job,
+        "board": board.name,
+        "agents": [agent.describe() for agent in agents],
+        "turns": game_state.turn_number,
+        "standings": [{"player_id": p.player_id, "cash": p.cash} for p in standings],
+        "winner": winner,
+        "winner_agent": None if winner is None else seats[winner],
+        "agent_cash": agent_cash,
+        "bankrupt": sorted(set(range(len(agents))) - set(game_state.players)),
+        "adjudicated": game_state.adjudication,
+        "seconds": time.perf_counter() - start,
+    }
+    if collect_events:
+        result["events"] = logger.collected if logger else []
+    return result
+
+def _completed_results(summary_path):
+    """Records already in games.jsonl, in the order they finished."""
+    if not summary_path.exists():
+        return []
+    with open(summary_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def run_jobs(jobs, output_dir, runner="serial", workers=None, write_logs=False, progress=True, stopping=None, db=None,
+             slots=1, api_slots=None, budget=None):
+    """Run jobs, appending each result to games.jsonl as it finishes.
+
+    Jobs already recorded in games.jsonl are skipped. With an early-stopping
+    controller, cells are played seed by seed side by side, every finished game is
+    fed to the controller, and a cell's remaining jobs are dropped once it stops.
+    With a results database, this process is its only writer: workers hand their
+    results (and logged events) back, and games are written in batches. Without a
+    controller, the process runner starts the longest games first.
+
+    Args:
+        jobs: Job dicts from expand_jobs.
+        output_dir: Experiment output directory.
+        runner: "serial" or "process".
+        workers: Worker processes.
+        write_logs: Whether to write per-game logs.
+        progress: Whether to print a line per finished game.
+        stopping: Optional stopping.EarlyStopping controller.
+        db: Optional results_db.ResultsDB to record games in (flushed before returning).
+        slots: Games each worker process plays at once.
+        api_slots: Concurrent LLM calls per worker process (None: unbounded).
+        budget: Seconds after which no game is started; the rest are left for a re-run.
+
+    Returns:
+        list: Results of the jobs run by this call.
+    """
+    if runner not in RUNNERS:
+        raise ValueError(f"Unknown runner: {runner!r} (expected one of {RUNNERS})")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / SUMMARY_FILE
+    job_ids = {job["job_id"] for job in jobs}
+    completed = [r for r in _completed_results(summary_path) if r["job_id"] in job_ids]
+    done = {r["job_id"] for r in completed}
+    pending = [job for job in jobs if job["job_id"] not in done]
+    if progress and done:
+        print(f"Skipping {len(done)} games already in {summary_path}")
+    if stopping:
+        for result in completed:
+            stopping.record(result)
+        pending.sort(key=lambda job: (job["seed"], job["cell"], job["rotation"]))
+    elif runner == "process":
+        pending = order_jobs(pending, completed)
+
+    results = []
+    unstarted = []
+    with open(summary_path, "a", encoding="utf-8") as summary:
+        def record(result):
+            events = result.pop("events", [])
+            if db:
+                db.add_result(result, events, output_dir.name)
+            summary.write(json.dumps(result) + "\n")
+            summary.flush()
+            results.append(result)
+            if progress:
+                adjudicated = " (adjudicated)" if result.get("adjudicated") else ""
+                print(f"[{len(results)}/{len(pending)}] {result['job_id']} {result['lineup']}: "
+                      f"winner {result['winner']}{adjudicated} after {result['turns']} turns ({result['seconds']:.2f}s)")
+            if stopping and stopping.record(result) and progress:
+                decision = stopping.decisions[result["cell"]]
+                print(f"Stopping cell {result['cell']} ({result['lineup']}) after {decision['games']} games: "
+                      f"seat {decision['seat']} {decision['decision']} ({decision['wins']} wins)")
+
+        def record_error(job_id, error):
+            failed.append(job_id)
+            with open(output_dir / ERRORS_FILE, "a", encoding="utf-8") as errors:
+                errors.write(json.dumps({"job_id": job_id, "time": time.time(), "error": error}) + "\n")
+            if progress:
+                print(f"{job_id} failed: {error.strip().splitlines()[-1]}")
+
+        def runnable(job):
+            return not (stopping and stopping.stopped(job["cell"]))
+
+        failed = []
+        if runner == "serial" or (workers == 1 and slots == 1):
+            deadline = time.time() + budget if budget else None
+            for i, job in enumerate(pending):
+                if deadline and time.time() >= deadline:
+                    unstarted = [j for j in pending[i:] if runnable(j)]
+                    break
+                if runnable(job):
+                    try:
+                        result = run_job(job, output_dir, write_logs, db is not None)
+                    except Exception:
+                        record_error(job["job_id"], traceback.format_exc())
+                        continue
+                    record(result)
+        else:
+            unstarted = run_scheduled(pending, run_job, (output_dir, write_logs, db is not None), workers, slots, api_slots,
+                                      budget, runnable=runnable, on_result=record, on_error=record_error)
+    if progress and unstarted:
+        print(f"Budget spent: {len(unstarted)} games not started (re-run to play them)")
+    if progress and failed:
+        print(f"{len(failed)} games failed (see {output_dir / ERRORS_FILE}; re-run to retry them)")
+
+    if db:
+        db.flush()
+    if stopping:
+        with open(output_dir / STOPPING_FILE, "w", encoding="utf-8") as f:
+            json.dump({str(cell): decision for cell, decision in sorted(stopping.decisions.items())}, f, indent=2)
+    return results
+
+def summarize(results):
+    """Wins per seat for each cell of the matrix, from games.jsonl records."""
+    cells = {}
+    for result in results:
+        cell = cells.setdefault(result["cell"], {"lineup": result["lineup"], "games": 0, "wins": {}})
+        cell["games"] += 1
+        if result["winner"] is not None:
+            cell["wins"][result["winner"]] = cell["wins"].get(result["winner"], 0) + 1
+    return cells
+
+def paired_summary(results, agent=0):
+    """Paired outcome differences for one lineup position, per matrix cell.
+
+    Games of the same cell and seed differ only in seat rotation and share their
+    dice, so each complete seed is one paired observation: the agent's win rate
+    over the rotations and its mean cash margin over the other agents.
+
+    Args:
+        results: games.jsonl records from a paired experiment.
+        agent: Lineup position to report on.
+
+    Returns:
+        dict: Cell -> {"lineup", "pairs", "win_rate", "win_rate_se", "cash_margin",
+            "cash_margin_se", "efficiency"}, where the standard errors come from the
+            spread between pairs and efficiency is how many times more unpaired games
+            the same win-rate standard error would take.
+    """
+    by_seed = {}
+    for result in results:
+        by_seed.setdefault((result["cell"], result["seed"]), []).append(result)
+
+    cells = {}
+    for (cell, _), games in sorted(by_seed.items()):
+        num_agents = len(games[0]["seats"])
+        if len({g["rotation"] for g in games}) < num_agents:
+            continue # Incomplete pair (interrupted or stopped early)
+        wins = [g["winner_agent"] == agent for g in games]
+        margins = [g["agent_cash"][agent] - (sum(g["agent_cash"]) - g["agent_cash"][agent]) / (num_agents - 1) for g in games]
+        entry = cells.setdefault(cell, {"lineup": games[0]["lineup"], "scores": [], "margins": [], "wins": []})
+        entry["scores"].append(sum(wins) / len(wins))
+        entry["margins"].append(sum(margins) / len(margins))
+        entry["wins"].extend(wins)
+
+    summary = {}
+    for cell, entry in cells.items():
+        pairs = len(entry["scores"])
+        win_rate, win_var = _mean_var(entry["scores"])
+        margin, margin_var = _mean_var(entry["margins"])
+        _, game_var = _mean_var(entry["wins"])
+        unpaired_var = game_var * pairs / len(entry["wins"]) # variance of one pair's mean had its games been independent
+        summary[cell] = {
+            "lineup": entry["lineup"],
+            "pairs": pairs,
+            "win_rate": win_rate,
+            "win_rate_se": math.sqrt(win_var / pairs),
+            "cash_margin": margin,
+            "cash_margin_se": math.sqrt(margin_var / pairs),
+            "efficiency": unpaired_var / win_var if win_var else float("inf"),
+        }
+    return summary
+
+def _mean_var(values):
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, 0.0
+    return mean, sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+
+def _output_dir(spec, override=None):
+    if override:
+        return Path(override)
+    if "output" in spec:
+        return Path(spec["_base_dir"]) / spec["output"]
+    return RESULTS_DIR / spec["name"]
+
+def cmd_run(args):
+    spec = load_spec(args.spec)
+    jobs = expand_jobs(spec)
+    if args.limit is not None:
+        jobs = jobs[:args.limit]
+    runner = args.runner or spec.get("runner", "serial")
+    workers = args.workers or spec.get("workers") or os.cpu_count()
+    slots = args.slots or spec.get("slots", 1)
+    budget = args.budget or spec.get("budget")
+    output_dir = _output_dir(spec, args.output)
+    cells = len({job["cell"] for job in jobs})
+    print(f"{spec['name']}: {len(jobs)} games in {cells} cells, {runner} runner"
+          f"{f' with {workers} workers x {slots} slots' if runner == 'process' else ''}, writing to {output_dir}")
+    if args.dry_run:
+        for job in jobs[:args.show]:
+            print(json.dumps(job))
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "spec.json", "w", encoding="utf-8") as f:
+        json.dump({k: v for k, v in spec.items() if not k.startswith("_")}, f, indent=2)
+    stopping = None if args.no_stopping else EarlyStopping.from_spec(spec)
+    db_path = args.db or (spec.get("db") and Path(spec["_base_dir"]) / spec["db"])
+    db = ResultsDB(db_path) if db_path else None
+    try:
+        run_jobs(jobs, output_dir, runner, workers, spec.get("logs", True), stopping=stopping, db=db,
+                 slots=slots, api_slots=spec.get("api_slots"), budget=budget)
+    finally:
+        if db:
+            db.close()
+
+    job_ids = {job["job_id"] for job in jobs}
+    with open(output_dir / SUMMARY_FILE, encoding="utf-8") as f:
+        results = [r for r in map(json.loads, f) if r["job_id"] in job_ids]
+    for cell_id, cell in sorted(summarize(results).items()):
+        wins = ", ".join(f"seat {seat}: {count / cell['games']:.0%}" for seat, count in sorted(cell["wins"].items()))
+        stopped = f", stopped: {stopping.decisions[cell_id]['decision']}" if stopping and stopping.stopped(cell_id) else ""
+        print(f"cell {cell_id} ({cell['lineup']}): {cell['games']} games, wins {wins or 'none'}{stopped}")
+    if spec.get("paired"):
+        agent = spec.get("stopping", {}).get("seat", 0)
+        for cell_id, row in sorted(paired_summary(results, agent).items()):
+            print(f"cell {cell_id} ({row['lineup']}) paired, agent {agent}: {row['pairs']} seeds, "
+                  f"win rate {row['win_rate']:.3f} ± {1.96 * row['win_rate_se']:.3f}, "
+                  f"cash margin {row['cash_margin']:+.0f} ± {1.96 * row['cash_margin_se']:.0f}, "
+                  f"{row['efficiency']:.1f}x fewer games than unpaired")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="monopoly-bench", description="Run Monopoly Bench experiments")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Play every game of an experiment spec")
+    run.add_argument("spec", help="Experiment spec (.toml or .json)")
+    run.add_argument("--runner", choices=RUNNERS, help="Override the spec's runner")
+    run.add_argument("--workers", type=int, help="Override the spec's worker count")
+    run.add_argument("--slots", type=int, help="Override the spec's games per worker")
+    run.add_argument("--budget", type=float, help="Seconds after which no game is started (overrides the spec's budget)")
+    run.add_argument("--output", help="Override the spec's output directory")
+    run.add_argument("--limit", type=int, help="Only run the first N games of the matrix")
+    run.add_argument("--dry-run", action="store_true", help="Print the job matrix without playing")
+    run.add_argument("--show", type=int, default=5, help="Jobs to print with --dry-run")
+    run.add_argument("--no-stopping", action="store_true", help="Play every game even if the spec sets [stopping]")
+    run.add_argument("--db", help="Also record games in this SQLite results database (overrides the spec's db)")
+    run.set_defaults(func=cmd_run)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Facts derived from a game state, computed once per engine step and shared.
+
+Deciding anything (the LLM prompt, legal moves, decision features, RL masks)
+needs the same handful of facts: who holds which color sets, where a player
+can build or sell houses, what they may mortgage, what every property charges
+and what each player is worth. ``derive(game_state)`` returns a
+``DerivedState`` with those facts, computed on first use and cached on the game
+state, so every consumer of a decision point shares a single board scan. Facts
+that only depend on the board carry over to later steps (and to copies of the
+state) until ownership, houses or mortgages change:
+
+    derived = derive(game_state)
+    derived.monopolies(player_id)      # completed color sets
+    derived.buildable(player_id)       # tile IDs, even building rule applied
+    derived.rent(tile_id)              # rent an opponent would pay now
+"""
+
+from engine import StreetTile, RailroadTile, railroad_rent, tiles_in_mask
+
+class DerivedState:
+    """Facts about one game state, memoized.
+
+    Most facts depend only on the board (ownership, houses, mortgages), not on cash,
+    so they live in ``board``, a cache shared with the next states' DerivedState for
+    as long as the board is unchanged. Facts that depend on cash or debt are cached
+    per state.
+    """
+
+    def __init__(self, game_state, key=None, board=None):
+        self.game_state = game_state
+        self.key = key or state_key(game_state)
+        self.board = {} if board is None else board
+        self._cache = {}
+
+    def board_fact(self, name, compute, arg=None):
+        """Memoize a fact that depends only on the board, e.g. a rendered board description.
+
+        Args:
+            name: Name of the fact.
+            compute: Called as compute(arg) on a cache miss.
+            arg: Optional argument (such as a player ID) the fact is computed for.
+        """
+        key = (name, arg)
+        value = self.board.get(key)
+        if value is None:
+            value = self.board[key] = compute(arg)
+        return value
+
+    def _memo(self, name, arg, compute):
+        key = (name, arg)
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = compute(arg)
+        return value
+
+    @property
+    def monopoly_owners(self):
+        """Color set -> ID of the player who owns all of it, for the completed sets."""
+        return self.board_fact("monopoly_owners", self._monopoly_owners)
+
+    def _monopoly_owners(self, _):
+        owners = {}
+        for player in self.game_state.players.values():
+            owned = player.owned_mask
+            for color_set, set_mask in self.game_state.color_set_masks.items():
+                if owned & set_mask == set_mask:
+                    owners[color_set] = player.player_id
+        return owners
+
+    @property
+    def rents(self):
+        """Rent an opponent landing on each tile would pay now, by tile ID (0 if unowned, mortgaged or not a property)."""
+        return self.board_fact("rents", self._rents)
+
+    def _rents(self, _):
+        game_state = self.game_state
+        owners = self.monopoly_owners
+        rents = [0] * len(game_state.board)
+        for player in game_state.players.values():
+            railroads = (player.owned_mask & game_state.railroad_mask).bit_count()
+            for tile_id in tiles_in_mask(player.owned_mask & ~game_state.mortgaged_mask):
+                tile = game_state.board[tile_id]
+                if isinstance(tile, RailroadTile):
+                    rents[tile_id] = railroad_rent(railroads, tile.rent)
+                elif isinstance(tile, StreetTile) and owners.get(tile.color_set) == player.player_id:
+                    rents[tile_id] = (tile.rent_monopoly, tile.rent_one_house, tile.rent_two_houses, tile.rent_three_houses,
+                                      tile.rent_four_houses, tile.rent_hotel)[tile.num_houses]
+                else:
+                    rents[tile_id] = tile.rent
+        return rents
+
+    def rent(self, tile_id):
+        return self.rents[tile_id]
+
+    def monopolies(self, player_id):
+        """Color sets the player owns outright, in board order."""
+        return self.board_fact("monopolies", self._monopolies, player_id)
+
+    def _monopolies(self, player_id):
+        return tuple(color_set for color_set, owner in self.monopoly_owners.items() if owner == player_id)
+
+    def has_monopoly(self, player_id, color_set):
+        return self.monopoly_owners.get(color_set) == player_id
+
+    def buildable(self, player_id):
+        """Tile IDs the player can build on under the monopoly and even building rules (cash is not checked)."""
+        return self.board_fact("buildable", self._buildable, player_id)
+
+    def _buildable(self, player_id):
+        game_state = self.game_state
+        board = game_state.board
+        buildable = []
+        for color_set in self.monopolies(player_id):
+            tile_ids = game_state.color_sets[color_set]
+            min_houses = min(board[tile_id].num_houses for tile_id in tile_ids)
+            if min_houses < 5:
+                buildable.extend(tile_id for tile_id in tile_ids if board[tile_id].num_houses == min_houses)
+        buildable.sort()
+        return tuple(buildable)
+
+    def sellable_houses(self, player_id):
+        """Tile IDs the player can sell a house from: the most built-up streets of each color set."""
+        return self.board_fact("sellable_houses", self._sellable_houses, player_id)
+
+    def _sellable_houses(self, player_id):
+        game_state = self.game_state
+        color_sets = {}
+        for tile_id in tiles_in_mask(game_state.players[player_id].owned_mask & game_state.developed_mask):
+            tile = game_state.board[tile_id]
+            color_sets.setdefault(tile.color_set, []).append(tile)
+        sellable = []
+        for tiles in color_sets.values():
+            max_houses = max(t.num_houses for t in tiles)
+            sellable.extend(t.tile_id for t in tiles if t.num_houses == max_houses)
+        return tuple(sellable)
+
+    def mortgage_candidates(self, player_id):
+        """Tile IDs the player may mortgage: unmortgaged, with no buildings in the color set."""
+        return self.board_fact("mortgage_candidates", self._mortgage_candidates, player_id)
+
+    def _mortgage_candidates(self, player_id):
+        game_state = self.game_state
+        player = game_state.players[player_id]
+        blocked = game_state.mortgaged_mask
+        for tile_id in tiles_in_mask(player.owned_mask & game_state.developed_mask):
+            blocked |= game_state.color_set_masks[game_state.board[tile_id].color_set]
+        return tuple(tiles_in_mask(player.owned_mask & ~blocked))
+
+    def net_worth(self, player_id):
+        """Cash plus properties at cost (half if mortgaged) and buildings at build cost, minus debt."""
+        return self._memo("net_worth", player_id, self._net_worth)
+
+    def _net_worth(self, player_id):
+        game_state = self.game_state
+        player = game_state.players[player_id]
+        worth = player.cash - player.debt
+        for tile_id in tiles_in_mask(player.owned_mask):
+            tile = game_state.board[tile_id]
+            worth += tile.cost // 2 if tile.mortgaged else tile.cost
+            if isinstance(tile, StreetTile):
+                worth += tile.num_houses * tile.house_cost
+        return worth
+
+def state_key(game_state):
+    """What derived facts depend on: (the board, i.e. ownership, houses, mortgages and the
+    players still in the game; each player's cash and debt)."""
+    players = game_state.players.values()
+    return ((game_state.board_hash, tuple(game_state.players)), tuple((player.cash, player.debt) for player in players))
+
+def derive(game_state):
+    """The DerivedState of a game state, reusing the cached one while the state is unchanged
+    and its board facts while only cash or debt changed."""
+    derived = game_state._derived
+    key = state_key(game_state)
+    if derived is not None and derived.game_state is game_state and derived.key == key:
+        return derived
+    board = derived.board if derived is not None and derived.key[0] == key[0] else None
+    derived = game_state._derived = DerivedState(game_state, key, board)
+    return derived
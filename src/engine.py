@@ -1,4 +1,6 @@
 
+import copy
+import functools
 import random
 
 # Game phase constants
@@ -11,9 +13,19 @@ class GamePhase:
     DECIDE_ON_TRADE = "decide_on_trade"
     HANDLE_MORTGAGED_TRADE = "handle_mortgaged_trade"
     AUCTION_PHASE = "auction_phase"
+    SEALED_AUCTION = "sealed_auction_phase"
     END_TURN = "end_turn"
     GAME_OVER = "game_over"
 
+# Auction modes
+class AuctionMode:
+    ASCENDING = "ascending"
+    SEALED_FIRST_PRICE = "sealed_first_price"
+    SEALED_SECOND_PRICE = "sealed_second_price"
+
+SEALED_AUCTION_MODES = (AuctionMode.SEALED_FIRST_PRICE, AuctionMode.SEALED_SECOND_PRICE)
+MIN_SEALED_BID = 1
+
 class BaseTile:
     """Base class for all tiles on the board."""
     def __init__(self, tile_id, name, type):
@@ -67,27 +79,152 @@ class ActionTile(BaseTile):
     """Represents a Chance or Community Chest space."""
     pass
 
+# Zobrist hashing: cash is hashed in buckets, so positions differing by small change share a key
+CASH_BUCKET = 50
+CASH_BUCKETS = 64
+
+class ZobristKeys:
+    """Random 64-bit keys for every hashed feature of a game with a given table and board size.
+
+    Keys come from a fixed seed, so hashes are stable across runs and processes.
+    """
+
+    def __init__(self, num_seats, num_tiles):
+        rng = random.Random(f"zobrist:{num_seats}:{num_tiles}")
+        key = lambda: rng.getrandbits(64)
+        self.owner = [[key() for _ in range(num_seats)] for _ in range(num_tiles)]
+        self.houses = [[0] + [key() for _ in range(5)] for _ in range(num_tiles)]
+        self.mortgaged = [key() for _ in range(num_tiles)]
+        self.cash = [[key() for _ in range(CASH_BUCKETS)] for _ in range(num_seats)]
+        self.position = [[key() for _ in range(num_tiles)] for _ in range(num_seats)]
+        self.current_player = [key() for _ in range(num_seats)]
+        self.decision_player = [key() for _ in range(num_seats)]
+        self.phase = {phase: key() for phase in vars(GamePhase).values() if isinstance(phase, str) and not phase.startswith("_")}
+
+@functools.lru_cache(maxsize=16)
+def zobrist_keys(num_seats, num_tiles):
+    """Shared ZobristKeys for a table and board size."""
+    return ZobristKeys(num_seats, num_tiles)
+
+def cash_bucket(cash):
+    return min(max(cash, 0) // CASH_BUCKET, CASH_BUCKETS - 1)
+
 class Player:
-    def __init__(self, player_id, cash):
+    def __init__(self, player_id, cash, keys=None):
         self.player_id = player_id
+        self.keys = keys # ZobristKeys, or None for a player outside a GameState
+        # Hash of this player's cash bucket and position, updated by the setters below
+        self.zobrist = keys.cash[player_id][0] ^ keys.position[player_id][0] if keys else 0
+        self._cash = 0
+        self._position = 0
         self.cash = cash
-        self.position = 0
-        self.owned_properties = []
+        self.owned_mask = 0 # bit i set = owns tile i
         self.debt = 0
         self.creditor_id = None
 
+    @property
+    def cash(self):
+        return self._cash
+
+    @cash.setter
+    def cash(self, value):
+        if self.keys is not None and self._cash // CASH_BUCKET != value // CASH_BUCKET:
+            table = self.keys.cash[self.player_id]
+            self.zobrist ^= table[cash_bucket(self._cash)] ^ table[cash_bucket(value)]
+        self._cash = value
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        if self.keys is not None:
+            table = self.keys.position[self.player_id]
+            self.zobrist ^= table[self._position] ^ table[value]
+        self._position = value
+
+    @property
+    def owned_properties(self):
+        """Tile IDs owned by the player, in board order. Change ownership with set_owner()."""
+        return tuple(tiles_in_mask(self.owned_mask))
+
+class SeatRing:
+    """Player IDs in seating order, kept as a circular linked list.
+
+    Finding the next seat and removing a player are O(1), so turn rotation and
+    auction bidding cost the same regardless of how many players are at the table.
+    Iteration starts from ``head``, the lowest remaining seat.
+    """
+    def __init__(self, player_ids=()):
+        player_ids = list(player_ids)
+        self._next = {}
+        self._prev = {}
+        for i, player_id in enumerate(player_ids):
+            self._next[player_id] = player_ids[(i + 1) % len(player_ids)]
+            self._prev[player_id] = player_ids[i - 1]
+        self.head = player_ids[0] if player_ids else None
+
+    def __len__(self):
+        return len(self._next)
+
+    def __contains__(self, player_id):
+        return player_id in self._next
+
+    def __iter__(self):
+        player_id = self.head
+        for _ in range(len(self._next)):
+            yield player_id
+            player_id = self._next[player_id]
+
+    def __repr__(self):
+        return f"SeatRing({list(self)})"
+
+    def next(self, player_id):
+        """Return the player seated after player_id."""
+        return self._next[player_id]
+
+    def remove(self, player_id):
+        """Remove a player, closing the gap in the ring."""
+        next_id = self._next.pop(player_id)
+        prev_id = self._prev.pop(player_id)
+        if next_id == player_id:
+            self.head = None
+            return
+        self._next[prev_id] = next_id
+        self._prev[next_id] = prev_id
+        if self.head == player_id:
+            self.head = next_id
+
+    def copy(self):
+        ring = SeatRing()
+        ring._next = dict(self._next)
+        ring._prev = dict(self._prev)
+        ring.head = self.head
+        return ring
+
 class GameState:
     """Represents the state of the Monopoly game."""
-    def __init__(self, num_players, tile_data, max_turns=1000, starting_cash=1500):
-        """Initializes the game state."""
+    def __init__(self, num_players, tile_data, max_turns=1000, starting_cash=1500, auction_mode=AuctionMode.ASCENDING, seed=None):
+        """Initializes the game state.
+
+        Each seat rolls from its own dice stream derived from ``seed``, so a seat sees
+        the same rolls whichever agent sits in it and however the game unfolds. If no
+        seed is given, one is drawn from the global ``random`` module.
+        """
+        if auction_mode not in (AuctionMode.ASCENDING, *SEALED_AUCTION_MODES):
+            raise ValueError(f"Unknown auction mode: {auction_mode}")
         self.turn_number = 0
-        self.players = {i: Player(i, starting_cash) for i in range(num_players)}
+        self.zobrist_keys = zobrist_keys(num_players, len(tile_data))
+        self.board_hash = 0 # Zobrist hash of ownership, houses and mortgages, kept by set_owner/set_houses/set_mortgaged
+        self.players = {i: Player(i, starting_cash, self.zobrist_keys) for i in range(num_players)}
         self.board = self._create_board(tile_data)
+        self._create_masks()
         self.current_player_id = 0
         self.game_over = False
         self.max_turns = max_turns
-        self.player_order = list(range(num_players))
-        self.current_player_index = 0
+        self.num_seats = num_players
+        self.seats = SeatRing(range(num_players))
         self.phase = GamePhase.START_MANAGEMENT
         self.pending_trade = None
         self.decision_player_id = None
@@ -98,6 +235,11 @@ class GameState:
         self.history = []
         self.MAX_HISTORY = 10
         self.trades_proposed_this_turn = 0
+        self.auction_mode = auction_mode
+        self.adjudication = None # set when a game is ended early by an adjudicator
+        self._derived = None # cached derived_state.DerivedState, see derived_state.derive
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.dice = [random.Random(f"{self.seed}:dice:{seat}") for seat in range(num_players)]
 
     def _create_board(self, tile_data):
         """Creates the game board from tile data."""
@@ -118,6 +260,102 @@ class GameState:
                 board.append(ActionTile(i, **data))
         return board
 
+    def _create_masks(self):
+        """Precomputes tile bitmasks for color sets and railroads, and the board-wide
+        mortgaged and developed (has houses) masks kept up to date by set_mortgaged/set_houses."""
+        self.color_sets = {}
+        self.color_set_masks = {}
+        self.railroad_mask = 0
+        for tile in self.board:
+            if isinstance(tile, StreetTile):
+                self.color_sets.setdefault(tile.color_set, []).append(tile.tile_id)
+                self.color_set_masks[tile.color_set] = self.color_set_masks.get(tile.color_set, 0) | (1 << tile.tile_id)
+            elif isinstance(tile, RailroadTile):
+                self.railroad_mask |= 1 << tile.tile_id
+        self.mortgaged_mask = 0
+        self.developed_mask = 0
+
+    @property
+    def zobrist(self):
+        """64-bit hash of the position: ownership, houses, mortgages, each player's cash
+        bucket, position and debt, whose turn and decision it is, the phase, and any
+        auction or trade in progress. Turn number and history are not included."""
+        keys = self.zobrist_keys
+        h = self.board_hash ^ keys.phase[self.phase] ^ keys.current_player[self.current_player_id]
+        if self.decision_player_id is not None:
+            h ^= keys.decision_player[self.decision_player_id]
+        for player in self.players.values():
+            h ^= player.zobrist
+            if player.debt:
+                h ^= hash((player.player_id, player.debt, -1 if player.creditor_id is None else player.creditor_id))
+        if self.auction_state is not None:
+            auction = self.auction_state
+            high_bidder = auction.get("high_bidder")
+            bidders = auction["active_bidders"] if "active_bidders" in auction else auction["bidders"]
+            h ^= hash((auction["tile_id"], auction.get("current_bid", 0), -1 if high_bidder is None else high_bidder, tuple(bidders)))
+        if self.pending_trade is not None:
+            trade = self.pending_trade
+            h ^= hash((trade["from_player"], trade["to_player"], trade["offer"]["cash"], tuple(trade["offer"]["properties"]),
+                       trade["request"]["cash"], tuple(trade["request"]["properties"])))
+        return h & 0xFFFFFFFFFFFFFFFF
+
+    def copy(self, dice=None):
+        """Returns a copy that can be played on independently of this state.
+
+        Players, tiles, seats and pending auction/trade state are copied; the board's
+        color set lookups are shared, as they never change during a game.
+
+        Args:
+            dice: Dice streams for the copy (one random.Random per seat). Defaults
+                to copies of this state's streams, so the copy rolls the same dice.
+        """
+        clone = _shallow_copy(self)
+        clone.players = {player_id: _shallow_copy(player) for player_id, player in self.players.items()}
+        clone.board = [_shallow_copy(tile) for tile in self.board]
+        clone.seats = self.seats.copy()
+        clone.pending_trade = copy.deepcopy(self.pending_trade)
+        if self.auction_state is not None:
+            clone.auction_state = dict(self.auction_state)
+            if "active_bidders" in clone.auction_state:
+                clone.auction_state["active_bidders"] = clone.auction_state["active_bidders"].copy()
+            if "bidders" in clone.auction_state:
+                clone.auction_state["bidders"] = list(clone.auction_state["bidders"])
+        clone.mortgaged_properties_to_handle = list(self.mortgaged_properties_to_handle)
+        clone.history = list(self.history)
+        if dice is None:
+            dice = []
+            for stream in self.dice:
+                dice.append(random.Random())
+                dice[-1].setstate(stream.getstate())
+        clone.dice = dice
+        return clone
+
+def _shallow_copy(obj):
+    """copy.copy for the engine's plain attribute classes, without its dispatch overhead."""
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    return clone
+
+def compute_zobrist(game_state):
+    """Recompute GameState.zobrist from scratch (for checking the incremental hash)."""
+    keys = game_state.zobrist_keys
+    board_hash = 0
+    for tile in game_state.board:
+        if getattr(tile, "owner", None) is not None:
+            board_hash ^= keys.owner[tile.tile_id][tile.owner]
+        if getattr(tile, "mortgaged", False):
+            board_hash ^= keys.mortgaged[tile.tile_id]
+        board_hash ^= keys.houses[tile.tile_id][getattr(tile, "num_houses", 0)]
+    players = {}
+    for player_id, player in game_state.players.items():
+        players[player_id] = keys.cash[player_id][cash_bucket(player.cash)] ^ keys.position[player_id][player.position]
+    clone = _shallow_copy(game_state)
+    clone.board_hash = board_hash
+    clone.players = {player_id: _shallow_copy(player) for player_id, player in game_state.players.items()}
+    for player_id, player in clone.players.items():
+        player.zobrist = players[player_id]
+    return clone.zobrist
+
 def step(game_state, action, logger=None):
     """Processes a single action and updates the game state."""
     current_player_id = game_state.current_player_id
@@ -149,12 +387,84 @@ def step(game_state, action, logger=None):
     elif action_type == "build_house":
         return handle_build_house_action(game_state, action, logger)
     elif action_type == "place_bid":
-        return handle_auction_action(game_state, action, player)
+        return handle_auction_action(game_state, action, get_deciding_player(game_state))
     elif action_type == "pass_auction":
-        return handle_auction_action(game_state, action, player)
+        return handle_auction_action(game_state, action, get_deciding_player(game_state))
+    elif action_type == "submit_sealed_bids":
+        return handle_sealed_auction_action(game_state, action, logger)
     elif action_type == "end_turn":
         return handle_end_turn_action(game_state, player)
 
+def get_deciding_player(game_state):
+    """Return the player who is currently making a decision (bidder, trade recipient, or current player)."""
+    if game_state.decision_player_id is not None:
+        return game_state.players[game_state.decision_player_id]
+    return game_state.players[game_state.current_player_id]
+
+def tile_mask(tile_ids):
+    """Return the bitmask with a bit set for each tile ID."""
+    mask = 0
+    for tile_id in tile_ids:
+        mask |= 1 << tile_id
+    return mask
+
+def tiles_in_mask(mask):
+    """Yield the tile IDs set in a bitmask, lowest first."""
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+def set_owner(game_state, tile, player_id):
+    """Transfer a property to a player (or to the bank with None), keeping ownership masks in sync."""
+    bit = 1 << tile.tile_id
+    owner_keys = game_state.zobrist_keys.owner[tile.tile_id]
+    if tile.owner is not None:
+        game_state.board_hash ^= owner_keys[tile.owner]
+    if tile.owner in game_state.players:
+        game_state.players[tile.owner].owned_mask &= ~bit
+    if player_id is not None:
+        game_state.players[player_id].owned_mask |= bit
+        game_state.board_hash ^= owner_keys[player_id]
+    tile.owner = player_id
+
+def set_mortgaged(game_state, tile, mortgaged):
+    """Mortgage or unmortgage a property, keeping the mortgaged mask in sync."""
+    if tile.mortgaged != mortgaged:
+        game_state.board_hash ^= game_state.zobrist_keys.mortgaged[tile.tile_id]
+    tile.mortgaged = mortgaged
+    if mortgaged:
+        game_state.mortgaged_mask |= 1 << tile.tile_id
+    else:
+        game_state.mortgaged_mask &= ~(1 << tile.tile_id)
+
+def set_houses(game_state, tile, num_houses):
+    """Set the number of houses on a street (5 = hotel), keeping the developed mask in sync."""
+    house_keys = game_state.zobrist_keys.houses[tile.tile_id]
+    game_state.board_hash ^= house_keys[tile.num_houses] ^ house_keys[num_houses]
+    tile.num_houses = num_houses
+    if num_houses > 0:
+        game_state.developed_mask |= 1 << tile.tile_id
+    else:
+        game_state.developed_mask &= ~(1 << tile.tile_id)
+
+def color_set_tiles(game_state, color_set):
+    """Return the street tiles in a color set."""
+    return [game_state.board[tile_id] for tile_id in game_state.color_sets[color_set]]
+
+def completed_color_sets(game_state, owned_mask):
+    """Return the color sets fully covered by a tile bitmask."""
+    return [color_set for color_set, set_mask in game_state.color_set_masks.items() if owned_mask & set_mask == set_mask]
+
+def tiles_completing_set(game_state, owned_mask):
+    """Return a bitmask of the tiles that would each complete a color set for the holder of owned_mask."""
+    completing = 0
+    for set_mask in game_state.color_set_masks.values():
+        missing = set_mask & ~owned_mask
+        if missing and not missing & (missing - 1): # exactly one tile missing
+            completing |= missing
+    return completing
+
 def handle_landing_on_property(player, tile, game_state):
     """Handle when a player lands on a property tile."""
     if tile.owner is None and tile.cost > 0:
@@ -178,11 +488,8 @@ def handle_landing_on_property(player, tile, game_state):
                 elif tile.num_houses == 5: # 5 houses means a hotel
                     rent = tile.rent_hotel
         elif isinstance(tile, RailroadTile):
-            # Calculate railroad rent based on number owned: 1=$25, 2=$50, 3=$100, 4=$200
-            owned_railroads = sum(1 for t in game_state.board 
-                                 if isinstance(t, RailroadTile) and t.owner == tile.owner)
-            rent_schedule = {1: 25, 2: 50, 3: 100, 4: 200}
-            rent = rent_schedule.get(owned_railroads, 0)
+            owned_railroads = (game_state.players[tile.owner].owned_mask & game_state.railroad_mask).bit_count()
+            rent = railroad_rent(owned_railroads, tile.rent)
 
         if player.cash >= rent:
             player.cash -= rent
@@ -203,7 +510,7 @@ def handle_landing_on_property(player, tile, game_state):
 
 def get_mortgageable_properties(player, game_state):
     """Returns a list of mortgageable properties for a player."""
-    return [p for p in player.owned_properties if not game_state.board[p].mortgaged and not (isinstance(game_state.board[p], StreetTile) and game_state.board[p].num_houses > 0)]
+    return list(tiles_in_mask(player.owned_mask & ~(game_state.mortgaged_mask | game_state.developed_mask)))
 
 def is_trade_valid(trade, from_player, to_player):
     """Validate if a trade can be executed between two players.
@@ -221,18 +528,16 @@ def is_trade_valid(trade, from_player, to_player):
         return False
     
     # Check if offering player owns all properties they're offering
-    for tile_id in trade["offer"]["properties"]:
-        if tile_id not in from_player.owned_properties:
-            return False
+    if tile_mask(trade["offer"]["properties"]) & ~from_player.owned_mask:
+        return False
     
     # Check if receiving player has enough cash
     if to_player.cash < trade["request"]["cash"]:
         return False
     
     # Check if receiving player owns all properties they're trading away
-    for tile_id in trade["request"]["properties"]:
-        if tile_id not in to_player.owned_properties:
-            return False
+    if tile_mask(trade["request"]["properties"]) & ~to_player.owned_mask:
+        return False
     
     return True
 
@@ -258,6 +563,16 @@ def handle_debt_payment(game_state, player):
         else:
             return GamePhase.DECIDE_TO_SELL
 
+def railroad_rent(owned_railroads, base_rent=25):
+    """Rent for a railroad whose owner holds a given number of railroads.
+
+    Rent doubles with each railroad owned (1=$25, 2=$50, 3=$100, 4=$200 on the
+    classic board), so boards with more railroads keep the same schedule.
+    """
+    if owned_railroads <= 0:
+        return 0
+    return base_rent * 2 ** (owned_railroads - 1)
+
 def has_monopoly_for_color_set(game_state, player_id, color_set):
     """Check if a player owns all properties in a specific color set.
     
@@ -269,8 +584,31 @@ def has_monopoly_for_color_set(game_state, player_id, color_set):
     Returns:
         bool: True if player owns all properties in the color set, False otherwise
     """
-    color_set_tiles = [t for t in game_state.board if isinstance(t, StreetTile) and t.color_set == color_set]
-    return all(t.owner == player_id for t in color_set_tiles)
+    player = game_state.players.get(player_id)
+    set_mask = game_state.color_set_masks[color_set]
+    return player is not None and player.owned_mask & set_mask == set_mask
+
+def calculate_net_worth(game_state, player_id):
+    """Calculate a player's net worth: cash plus property and building value.
+
+    Properties count at cost (half cost if mortgaged) and buildings at their
+    build cost, minus any outstanding debt.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the player
+
+    Returns:
+        int: The player's net worth
+    """
+    player = game_state.players[player_id]
+    worth = player.cash - player.debt
+    for tile_id in player.owned_properties:
+        tile = game_state.board[tile_id]
+        worth += tile.cost // 2 if tile.mortgaged else tile.cost
+        if isinstance(tile, StreetTile):
+            worth += tile.num_houses * tile.house_cost
+    return worth
 
 def log_failure_and_return_phase(game_state, message, logger=None, phase=GamePhase.END_MANAGEMENT):
     """Log a failure event and return specified phase.
@@ -287,6 +625,7 @@ def log_failure_and_return_phase(game_state, message, logger=None, phase=GamePha
     add_to_history(game_state, message)
     if logger:
         logger.log_custom(message)
+        logger.log_event("invalid_action", player_id=game_state.current_player_id, message=message)
     game_state.phase = phase
     return phase
 
@@ -303,8 +642,7 @@ def handle_buy_action(game_state, player):
     tile = game_state.board[player.position]
     if isinstance(tile, PropertyTile) and tile.owner is None and player.cash >= tile.cost:
         player.cash -= tile.cost
-        tile.owner = player.player_id
-        player.owned_properties.append(tile.tile_id)
+        set_owner(game_state, tile, player.player_id)
     return GamePhase.END_MANAGEMENT
 
 def handle_proceed_action(game_state):
@@ -329,14 +667,21 @@ def handle_skip_buy_action(game_state):
         game_state: GameState object containing the game state
         
     Returns:
-        str: The next game phase ("auction_phase")
+        str: The next game phase ("auction_phase" or "sealed_auction_phase")
     """
     tile_to_auction = game_state.board[game_state.players[game_state.current_player_id].position]
+    if game_state.auction_mode in SEALED_AUCTION_MODES:
+        game_state.auction_state = {
+            "tile_id": tile_to_auction.tile_id,
+            "mode": game_state.auction_mode,
+            "bidders": list(game_state.seats),
+        }
+        return GamePhase.SEALED_AUCTION
     game_state.auction_state = {
         "tile_id": tile_to_auction.tile_id,
         "current_bid": 0,
         "high_bidder": None,
-        "active_bidders": list(game_state.players.keys()),
+        "active_bidders": game_state.seats.copy(),
         "last_bidder": None,
     }
     return GamePhase.AUCTION_PHASE
@@ -361,7 +706,7 @@ def handle_mortgage_property_action(game_state, action, player):
     tile_to_mortgage = game_state.board[action["tile_id"]]
     if tile_to_mortgage.owner == player.player_id and not tile_to_mortgage.mortgaged:
         player.cash += tile_to_mortgage.cost // 2
-        tile_to_mortgage.mortgaged = True
+        set_mortgaged(game_state, tile_to_mortgage, True)
 
     next_phase = handle_debt_payment(game_state, player)
     return next_phase
@@ -381,7 +726,7 @@ def handle_unmortgage_property_action(game_state, action, player):
     unmortgage_cost = int((tile_to_unmortgage.cost // 2) * 1.1)
     if tile_to_unmortgage.owner == player.player_id and tile_to_unmortgage.mortgaged and player.cash >= unmortgage_cost:
         player.cash -= unmortgage_cost
-        tile_to_unmortgage.mortgaged = False
+        set_mortgaged(game_state, tile_to_unmortgage, False)
     return GamePhase.END_MANAGEMENT
 
 def handle_sell_house_action(game_state, action, player):
@@ -404,11 +749,10 @@ def handle_sell_house_action(game_state, action, player):
     tile_to_sell_from = game_state.board[action["tile_id"]]
     if isinstance(tile_to_sell_from, StreetTile) and tile_to_sell_from.owner == player.player_id and tile_to_sell_from.num_houses > 0:
         # Check for even selling
-        color_set_tiles = [t for t in game_state.board if isinstance(t, StreetTile) and t.color_set == tile_to_sell_from.color_set and t.owner == player.player_id]
-        max_houses = max(t.num_houses for t in color_set_tiles)
+        max_houses = max(t.num_houses for t in color_set_tiles(game_state, tile_to_sell_from.color_set) if t.owner == player.player_id)
         if tile_to_sell_from.num_houses == max_houses:
             player.cash += tile_to_sell_from.house_cost // 2
-            tile_to_sell_from.num_houses -= 1
+            set_houses(game_state, tile_to_sell_from, tile_to_sell_from.num_houses - 1)
 
     next_phase = handle_debt_payment(game_state, player)
     return next_phase
@@ -460,6 +804,7 @@ def handle_accept_trade_action(game_state, logger):
         add_to_history(game_state, failure_event)
         if logger:
             logger.log_custom(failure_event)
+            logger.log_event("trade_failed", from_player=trade["from_player"], to_player=trade["to_player"])
         return game_state.phase
 
     from_player.cash -= trade["offer"]["cash"]
@@ -468,16 +813,12 @@ def handle_accept_trade_action(game_state, logger):
     to_player.cash -= trade["request"]["cash"]
 
     for tile_id in trade["offer"]["properties"]:
-        from_player.owned_properties.remove(tile_id)
-        to_player.owned_properties.append(tile_id)
-        game_state.board[tile_id].owner = trade["to_player"]
+        set_owner(game_state, game_state.board[tile_id], trade["to_player"])
         if game_state.board[tile_id].mortgaged:
             game_state.mortgaged_properties_to_handle.append(tile_id)
 
     for tile_id in trade["request"]["properties"]:
-        to_player.owned_properties.remove(tile_id)
-        from_player.owned_properties.append(tile_id)
-        game_state.board[tile_id].owner = trade["from_player"]
+        set_owner(game_state, game_state.board[tile_id], trade["from_player"])
 
     if game_state.mortgaged_properties_to_handle:
         game_state.phase = "handle_mortgaged_trade"
@@ -524,7 +865,7 @@ def handle_resolve_mortgaged_trade_action(game_state, action):
         unmortgage_cost = int((tile.cost // 2) * 1.1)
         if player.cash >= unmortgage_cost:
             player.cash -= unmortgage_cost
-            tile.mortgaged = False
+            set_mortgaged(game_state, tile, False)
     elif decision == "pay_interest_only":
         interest_cost = int((tile.cost // 2) * 0.1)
         if player.cash >= interest_cost:
@@ -568,8 +909,7 @@ def handle_build_house_action(game_state, action, logger):
         return log_failure_and_return_phase(game_state, failure_message, logger)
 
     # Check for even build rule
-    color_set_tiles = [t for t in game_state.board if isinstance(t, StreetTile) and t.color_set == tile.color_set]
-    current_houses_on_set = [t.num_houses for t in color_set_tiles]
+    current_houses_on_set = [t.num_houses for t in color_set_tiles(game_state, tile.color_set)]
     if tile.num_houses > min(current_houses_on_set):
         failure_message = f"Player {current_player_id} failed to build on {tile.name} (violates even building rule)"
         return log_failure_and_return_phase(game_state, failure_message, logger)
@@ -586,7 +926,7 @@ def handle_build_house_action(game_state, action, logger):
 
     # Build the house/hotel successfully
     player.cash -= tile.house_cost
-    tile.num_houses += 1
+    set_houses(game_state, tile, tile.num_houses + 1)
     # Add success to history too
     success_event = f"Player {current_player_id} built house on {tile.name} (now has {tile.num_houses} houses)"
     add_to_history(game_state, success_event)
@@ -604,6 +944,8 @@ def handle_end_turn_action(game_state, player):
         str: The next game phase
     """
     current_player_id = game_state.current_player_id
+    next_player_id = game_state.seats.next(current_player_id)
+    new_round = next_player_id == game_state.seats.head
     
     if player.debt > 0:
         # Player is bankrupt
@@ -611,45 +953,37 @@ def handle_end_turn_action(game_state, player):
             creditor = game_state.players[player.creditor_id]
             creditor.cash += player.cash # Transfer remaining cash
             for prop_id in player.owned_properties:
-                prop = game_state.board[prop_id]
-                prop.owner = creditor.player_id
-                creditor.owned_properties.append(prop_id)
+                set_owner(game_state, game_state.board[prop_id], creditor.player_id)
         else:
             # If no specific creditor, properties go to bank (unowned)
             for prop_id in player.owned_properties:
                 prop = game_state.board[prop_id]
-                prop.owner = None
-                prop.mortgaged = False # Unmortgage properties
-                prop.num_houses = 0 # Remove houses
+                set_owner(game_state, prop, None)
+                set_mortgaged(game_state, prop, False) # Unmortgage properties
+                if isinstance(prop, StreetTile):
+                    set_houses(game_state, prop, 0) # Remove houses
         
         player.cash = 0
-        player.owned_properties = []
         player.debt = 0
         player.creditor_id = None
 
         del game_state.players[current_player_id]
-        game_state.player_order.remove(current_player_id)
+        game_state.seats.remove(current_player_id)
 
         if len(game_state.players) <= 1:
             game_state.game_over = True
             return GamePhase.GAME_OVER
 
-        game_state.phase = GamePhase.START_MANAGEMENT
-    else:
-        # end player's turn, continue to next player
-        game_state.current_player_index += 1   
-        if game_state.current_player_index >= len(game_state.player_order):
-            game_state.current_player_index = 0
-            game_state.turn_number += 1
-
-        game_state.current_player_id = game_state.player_order[game_state.current_player_index]
-        game_state.trades_proposed_this_turn = 0
+    # continue to the next player, starting a new round after the last seat
+    if new_round:
+        game_state.turn_number += 1
+    game_state.current_player_id = next_player_id
+    game_state.trades_proposed_this_turn = 0
 
-        if game_state.turn_number >= game_state.max_turns:
-            game_state.game_over = True
-        
-        game_state.phase = GamePhase.START_MANAGEMENT
+    if game_state.turn_number >= game_state.max_turns:
+        game_state.game_over = True
     
+    game_state.phase = GamePhase.START_MANAGEMENT
     return game_state.phase
 
 def handle_roll_action(game_state, player):
@@ -662,7 +996,8 @@ def handle_roll_action(game_state, player):
     Returns:
         str: The next game phase based on where the player lands
     """
-    roll = random.randint(1, 6) + random.randint(1, 6)
+    dice = game_state.dice[player.player_id]
+    roll = dice.randint(1, 6) + dice.randint(1, 6)
     player.position = (player.position + roll) % len(game_state.board)
     tile = game_state.board[player.position]
 
@@ -691,40 +1026,87 @@ def handle_roll_action(game_state, player):
 def handle_auction_action(game_state, action, player):
     """Handle auction actions (place_bid and pass_auction)."""
     auction_state = game_state.auction_state
-    action_type = action["type"]
+    active_bidders = auction_state["active_bidders"]
+    next_bidder_id = active_bidders.next(player.player_id)
 
-    if action_type == "place_bid":
-        bid_amount = action["bid_amount"]
-        if bid_amount > auction_state["current_bid"] and player.cash >= bid_amount:
-            auction_state["current_bid"] = bid_amount
-            auction_state["high_bidder"] = player.player_id
-            auction_state["last_bidder"] = player.player_id
-        else:
-            # Invalid bid, treat as a pass
-            auction_state["active_bidders"].remove(player.player_id)
-
-    elif action_type == "pass_auction":
-        auction_state["active_bidders"].remove(player.player_id)
+    if action["type"] == "place_bid" and action["bid_amount"] > auction_state["current_bid"] and player.cash >= action["bid_amount"]:
+        auction_state["current_bid"] = action["bid_amount"]
+        auction_state["high_bidder"] = player.player_id
+        auction_state["last_bidder"] = player.player_id
+    else:
+        # A pass, or an invalid bid treated as one
+        active_bidders.remove(player.player_id)
 
-    if len(auction_state["active_bidders"]) == 1:
+    if len(active_bidders) == 1:
         # Auction ends - only one bidder left
         winner_id = auction_state.get("high_bidder")
         if winner_id is not None:
             winner = game_state.players[winner_id]
             tile = game_state.board[auction_state["tile_id"]]
             winner.cash -= auction_state["current_bid"]
-            tile.owner = winner_id
-            winner.owned_properties.append(tile.tile_id)
+            set_owner(game_state, tile, winner_id)
         # If winner_id is None, no one bid and property remains unowned
         game_state.auction_state = None
+        game_state.decision_player_id = None
         return GamePhase.END_MANAGEMENT
-    elif not auction_state["active_bidders"]:
+    elif not active_bidders:
         # All players passed
         game_state.auction_state = None
+        game_state.decision_player_id = None
         return GamePhase.END_MANAGEMENT
     else:
-        # Continue auction
-        current_bidder_index = auction_state["active_bidders"].index(auction_state["last_bidder"])
-        next_bidder_index = (current_bidder_index + 1) % len(auction_state["active_bidders"])
-        game_state.decision_player_id = auction_state["active_bidders"][next_bidder_index]
-        return GamePhase.AUCTION_PHASE
\ No newline at end of file
+        # Continue auction with the next bidder after the one who just acted
+        game_state.decision_player_id = next_bidder_id
+        return GamePhase.AUCTION_PHASE
+
+def handle_sealed_auction_action(game_state, action, logger=None):
+    """Resolve a sealed-bid auction in a single step.
+
+    Every bidder submits one bid at the same time. Bids that are not positive or
+    that exceed the bidder's cash are treated as passes. The highest bid wins; ties
+    go to the bidder seated earliest after the current player. In a first-price
+    auction the winner pays their own bid, in a second-price auction they pay the
+    second-highest valid bid (or MIN_SEALED_BID if nobody else bid).
+
+    Args:
+        game_state: GameState object containing the game state
+        action: Dictionary with "bids", a mapping of player ID to bid amount
+        logger: Optional logger instance
+
+    Returns:
+        str: The next game phase ("end_management_phase")
+    """
+    auction_state = game_state.auction_state
+    tile = game_state.board[auction_state["tile_id"]]
+    bids = {int(player_id): amount for player_id, amount in action["bids"].items()}
+
+    valid_bids = []
+    for player_id in auction_state["bidders"]:
+        amount = bids.get(player_id, 0)
+        if player_id in game_state.players and 0 < amount <= game_state.players[player_id].cash:
+            valid_bids.append((player_id, amount))
+
+    if valid_bids:
+        # Seats are numbered by player ID, so distance around the table is modular; the current player comes last
+        start = game_state.current_player_id
+        valid_bids.sort(key=lambda bid: (-bid[1], (bid[0] - start - 1) % game_state.num_seats))
+        winner_id, winning_bid = valid_bids[0]
+        if auction_state["mode"] == AuctionMode.SEALED_SECOND_PRICE:
+            price = valid_bids[1][1] if len(valid_bids) > 1 else MIN_SEALED_BID
+        else:
+            price = winning_bid
+
+        winner = game_state.players[winner_id]
+        winner.cash -= price
+        set_owner(game_state, tile, winner_id)
+        event = f"Player {winner_id} won the sealed-bid auction for {tile.name} at ${price}"
+    else:
+        winner_id, price = None, 0
+        event = f"Nobody bid in the sealed-bid auction for {tile.name}"
+
+    add_to_history(game_state, event)
+    if logger:
+        logger.log_custom(f"  {event}. Bids: {bids}")
+        logger.log_event("auction", mode=auction_state["mode"], tile_id=tile.tile_id, bids={str(k): v for k, v in bids.items()}, winner=winner_id, price=price)
+    game_state.auction_state = None
+    return GamePhase.END_MANAGEMENT
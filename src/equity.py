@@ -0,0 +1,149 @@
+"""Win-probability and net-worth estimates for arbitrary game states.
+
+``estimate_equity`` plays fast rollouts from a copy of the current state, with
+every player replaced by a scripted default policy and fresh dice, and reports
+each player's win probability and expected final net worth with 95% confidence
+intervals. A rollout ends when the game does (bankruptcy or ``max_turns``) or
+after ``horizon`` more turns, whichever comes first; the player with the highest
+net worth at that point wins (ties are split).
+
+Typical uses are adjudicating games that hit ``max_turns``, grading a decision by
+the equity before and after it, and annotating logs:
+
+    equity = estimate_equity(game_state, n_rollouts=200, budget_ms=50)
+    equity["players"][0]["win_prob"], equity["players"][0]["win_ci"]
+
+Rollouts stop at ``n_rollouts`` or when ``budget_ms`` is spent, whichever comes
+first, so the call can sit on a per-decision latency budget. Passing a
+``transposition.TranspositionTable`` as ``table`` caches estimates by the state's
+Zobrist hash, so re-evaluating a position returns the stored estimate.
+"""
+
+import math
+import random
+import time
+
+from agents import build_agent
+from engine import calculate_net_worth
+from run_match import play_game
+
+DEFAULT_POLICY = "greedy"
+Z = 1.96 # 95% intervals
+
+def policy_agents(game_state, policy=DEFAULT_POLICY, policies=None, seed=0):
+    """Build the scripted agents that play the rollouts, one per remaining player.
+
+    Args:
+        game_state: The state the rollouts start from.
+        policy: Agent spec (e.g. "greedy" or {"type": "random"}) every player follows.
+        policies: Optional per-player overrides, player ID -> agent spec.
+        seed: Base seed for the agents.
+    """
+    policies = policies or {}
+    agents = []
+    for player_id in game_state.players:
+        spec = policies.get(player_id, policy)
+        spec = {"type": spec} if isinstance(spec, str) else dict(spec)
+        agents.append(build_agent({"seed": seed + player_id, **spec}, player_id))
+    return agents
+
+def rollout(game_state, agents, dice, horizon=None):
+    """Play one game out from game_state (which is left untouched).
+
+    Args:
+        game_state: The state to play from.
+        agents: Agents for the remaining players (see policy_agents).
+        dice: random.Random the rollout's dice are drawn from.
+        horizon: Optional number of further turns after which the rollout stops.
+
+    Returns:
+        dict: Player ID -> final net worth (0 for players who went bankrupt).
+    """
+    state = game_state.copy(dice=[dice] * game_state.num_seats)
+    if horizon is not None:
+        state.max_turns = min(state.max_turns, state.turn_number + horizon)
+    play_game(state, agents, parallel_bids=False)
+    return {player_id: calculate_net_worth(state, player_id) if player_id in state.players else 0
+            for player_id in game_state.players}
+
+def wilson_interval(successes, trials, z=Z):
+    """Wilson score interval for a binomial proportion."""
+    if trials == 0:
+        return (0.0, 1.0)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return (max(0.0, center - half_width), min(1.0, center + half_width))
+
+def table_key(game_state, policy=DEFAULT_POLICY, policies=None, horizon=None):
+    """Transposition-table key for an equity estimate: the position's hash, the turns
+    the rollouts can still play and the rollout policies."""
+    turns_left = game_state.max_turns - game_state.turn_number
+    if horizon is not None:
+        turns_left = min(turns_left, horizon)
+    return (game_state.zobrist, turns_left, repr(policy), repr(sorted((policies or {}).items())))
+
+def estimate_equity(game_state, n_rollouts=200, budget_ms=None, policy=DEFAULT_POLICY, policies=None, horizon=None, seed=0, table=None):
+    """Estimate every player's win probability and expected final net worth.
+
+    Args:
+        game_state: The state to evaluate (not modified).
+        n_rollouts: Most rollouts to play.
+        budget_ms: Optional wall-clock budget; rollouts stop once it is spent (at least one is played).
+        policy: Agent spec every player follows in the rollouts.
+        policies: Optional per-player overrides, player ID -> agent spec.
+        horizon: Optional cap on the turns each rollout plays.
+        seed: Seed for the rollouts; the same seed gives the same estimate.
+        table: Optional TranspositionTable. A stored estimate of the same position with
+            at least n_rollouts rollouts (any number when budget_ms is set) is returned
+            instead of playing, whatever its seed; new estimates are stored.
+
+    Returns:
+        dict: "rollouts" (number played), "elapsed_ms", "cached" (whether it came from
+            the table), and "players": player ID -> {"win_prob", "win_ci", "net_worth", "net_worth_ci"}.
+    """
+    start = time.perf_counter()
+    if table is not None:
+        key = table_key(game_state, policy, policies, horizon)
+        cached = table.get(key, min_depth=n_rollouts if budget_ms is None else 1)
+        if cached is not None:
+            return {**cached, "elapsed_ms": (time.perf_counter() - start) * 1000, "cached": True}
+    deadline = None if budget_ms is None else start + budget_ms / 1000
+    player_ids = list(game_state.players)
+    wins = dict.fromkeys(player_ids, 0.0)
+    worth_sum = dict.fromkeys(player_ids, 0.0)
+    worth_sq = dict.fromkeys(player_ids, 0.0)
+
+    # One dice stream and one set of agents serve every rollout, so the estimate depends only on the seed
+    agents = policy_agents(game_state, policy, policies, seed)
+    dice = random.Random(seed)
+    played = 0
+    while played < n_rollouts:
+        worths = rollout(game_state, agents, dice, horizon)
+        played += 1
+        best = max(worths.values())
+        leaders = [player_id for player_id, worth in worths.items() if worth == best]
+        for player_id, worth in worths.items():
+            worth_sum[player_id] += worth
+            worth_sq[player_id] += worth * worth
+            if player_id in leaders:
+                wins[player_id] += 1 / len(leaders)
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    players = {}
+    for player_id in player_ids:
+        mean = worth_sum[player_id] / played
+        variance = max(worth_sq[player_id] / played - mean * mean, 0.0) * played / max(played - 1, 1)
+        half_width = Z * math.sqrt(variance / played)
+        players[player_id] = {
+            "win_prob": wins[player_id] / played,
+            "win_ci": wilson_interval(wins[player_id], played),
+            "net_worth": mean,
+            "net_worth_ci": (mean - half_width, mean + half_width),
+        }
+    result = {"rollouts": played, "elapsed_ms": (time.perf_counter() - start) * 1000, "cached": False, "players": players}
+    if table is not None:
+        table.put(key, result, depth=played)
+    return result
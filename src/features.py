@@ -0,0 +1,148 @@
+"""Fixed-length numeric features describing a decision point.
+
+The same features are logged with every LLM decision and computed live by
+``SurrogateAgent``, so a policy trained on logs sees exactly what it will see
+at play time. All values are plain floats, roughly scaled to [0, 1].
+"""
+
+from derived_state import derive
+from engine import (
+    GamePhase,
+    StreetTile,
+    RailroadTile,
+    color_set_tiles,
+    completed_color_sets,
+    tile_mask,
+)
+from legal_moves import (
+    get_unmortgageable_tiles,
+    unmortgage_cost,
+)
+
+CASH_SCALE = 1000.0
+
+FEATURE_NAMES = [
+    "cash",
+    "net_worth",
+    "position",
+    "turn_fraction",
+    "num_players",
+    "owned_count",
+    "monopolies",
+    "mortgaged_count",
+    "railroads_owned",
+    "opponent_max_net_worth",
+    "opponent_mean_cash",
+    "debt",
+    "tile_cost",
+    "tile_cost_to_cash",
+    "tile_is_railroad",
+    "tile_completes_set",
+    "tile_set_owned_fraction",
+    "tile_opponent_in_set",
+    "tile_blocks_opponent",
+    "auction_bid_to_cost",
+    "auction_is_high_bidder",
+    "trade_receive_value",
+    "trade_give_value",
+    "trade_value_delta",
+    "trade_completes_my_set",
+    "trade_completes_their_set",
+    "buildable_count",
+    "unmortgageable_count",
+    "sellable_house_count",
+    "mortgage_candidate_count",
+]
+
+
+def _decision_tile(game_state, player, phase):
+    """The property a decision is about, if any."""
+    if phase == GamePhase.DECIDE_TO_BUY:
+        return game_state.board[player.position]
+    if phase in (GamePhase.AUCTION_PHASE, GamePhase.SEALED_AUCTION) and game_state.auction_state:
+        return game_state.board[game_state.auction_state["tile_id"]]
+    if phase == GamePhase.HANDLE_MORTGAGED_TRADE and game_state.mortgaged_properties_to_handle:
+        return game_state.board[game_state.mortgaged_properties_to_handle[0]]
+    return None
+
+
+def extract_features(game_state, player_id, phase):
+    """Compute the feature dict for a player facing a decision.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the deciding player
+        phase: The current game phase
+
+    Returns:
+        dict: Feature name -> float, with keys in FEATURE_NAMES order
+    """
+    player = game_state.players[player_id]
+    board = game_state.board
+    derived = derive(game_state)
+    cash = max(player.cash, 0)
+    opponents = [p for p in game_state.players.values() if p.player_id != player_id]
+    opponent_worth = [derived.net_worth(p.player_id) for p in opponents]
+
+    features = dict.fromkeys(FEATURE_NAMES, 0.0)
+    features["cash"] = player.cash / CASH_SCALE
+    features["net_worth"] = derived.net_worth(player_id) / CASH_SCALE
+    features["position"] = player.position / len(board)
+    features["turn_fraction"] = game_state.turn_number / max(game_state.max_turns, 1)
+    features["num_players"] = float(len(game_state.players))
+    features["owned_count"] = float(player.owned_mask.bit_count())
+    features["monopolies"] = float(len(derived.monopolies(player_id)))
+    features["mortgaged_count"] = float((player.owned_mask & game_state.mortgaged_mask).bit_count())
+    features["railroads_owned"] = float((player.owned_mask & game_state.railroad_mask).bit_count())
+    features["opponent_max_net_worth"] = max(opponent_worth, default=0) / CASH_SCALE
+    features["opponent_mean_cash"] = (sum(p.cash for p in opponents) / len(opponents) / CASH_SCALE) if opponents else 0.0
+    features["debt"] = player.debt / CASH_SCALE
+
+    tile = _decision_tile(game_state, player, phase)
+    if tile is not None and hasattr(tile, "cost"):
+        features["tile_cost"] = tile.cost / CASH_SCALE
+        features["tile_cost_to_cash"] = min(tile.cost / max(cash, 1), 10.0)
+        features["tile_is_railroad"] = float(isinstance(tile, RailroadTile))
+        if isinstance(tile, StreetTile):
+            set_tiles = color_set_tiles(game_state, tile.color_set)
+            others = [t for t in set_tiles if t.tile_id != tile.tile_id]
+            features["tile_completes_set"] = float(all(t.owner == player_id for t in others))
+            features["tile_set_owned_fraction"] = sum(1 for t in set_tiles if t.owner == player_id) / len(set_tiles)
+            opponent_owners = {t.owner for t in others if t.owner is not None and t.owner != player_id}
+            features["tile_opponent_in_set"] = float(bool(opponent_owners))
+            features["tile_blocks_opponent"] = float(len(opponent_owners) == 1 and all(t.owner in opponent_owners for t in others))
+
+    if phase == GamePhase.AUCTION_PHASE and game_state.auction_state and tile is not None:
+        features["auction_bid_to_cost"] = game_state.auction_state["current_bid"] / max(tile.cost, 1)
+        features["auction_is_high_bidder"] = float(game_state.auction_state.get("high_bidder") == player_id)
+
+    if phase == GamePhase.DECIDE_ON_TRADE and game_state.pending_trade:
+        trade = game_state.pending_trade
+        receive = trade["offer"]["cash"] + sum(board[t].cost for t in trade["offer"]["properties"])
+        give = trade["request"]["cash"] + sum(board[t].cost for t in trade["request"]["properties"])
+        features["trade_receive_value"] = receive / CASH_SCALE
+        features["trade_give_value"] = give / CASH_SCALE
+        features["trade_value_delta"] = (receive - give) / CASH_SCALE
+
+        offer_mask = tile_mask(trade["offer"]["properties"])
+        request_mask = tile_mask(trade["request"]["properties"])
+        my_after = (player.owned_mask & ~request_mask) | offer_mask
+        from_id = trade["from_player"]
+        if from_id in game_state.players:
+            their_before = game_state.players[from_id].owned_mask
+            their_after = (their_before & ~offer_mask) | request_mask
+            features["trade_completes_their_set"] = float(bool(set(completed_color_sets(game_state, their_after)) - set(completed_color_sets(game_state, their_before))))
+        features["trade_completes_my_set"] = float(bool(set(completed_color_sets(game_state, my_after)) - set(derived.monopolies(player_id))))
+
+    if phase in (GamePhase.START_MANAGEMENT, GamePhase.END_MANAGEMENT):
+        features["buildable_count"] = float(len(derived.buildable(player_id)))
+        features["unmortgageable_count"] = float(len(get_unmortgageable_tiles(game_state, player_id)))
+
+    if phase == GamePhase.DECIDE_TO_SELL:
+        features["sellable_house_count"] = float(len(derived.sellable_houses(player_id)))
+        features["mortgage_candidate_count"] = float(len(derived.mortgage_candidates(player_id)))
+
+    if phase == GamePhase.HANDLE_MORTGAGED_TRADE and tile is not None:
+        features["tile_cost_to_cash"] = min(unmortgage_cost(tile) / max(cash, 1), 10.0)
+
+    return features
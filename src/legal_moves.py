@@ -0,0 +1,147 @@
+"""Legal-move analysis for decision phases.
+
+Used to resolve forced decisions locally (when a phase leaves exactly one legal
+action there is nothing to ask an agent) and by agents that need to know which
+properties they can sell houses from or mortgage. The per-player tile lists come
+from the step's cached ``derived_state.DerivedState``.
+"""
+
+from derived_state import derive
+from engine import GamePhase, MIN_SEALED_BID, is_trade_valid, tiles_in_mask
+
+# Phases in which a decision can be forced. Management phases never are: the
+# player can always proceed or propose a trade.
+FORCED_MOVE_PHASES = (
+    GamePhase.DECIDE_TO_BUY,
+    GamePhase.DECIDE_TO_SELL,
+    GamePhase.DECIDE_ON_TRADE,
+    GamePhase.HANDLE_MORTGAGED_TRADE,
+    GamePhase.AUCTION_PHASE,
+    GamePhase.SEALED_AUCTION,
+)
+
+def unmortgage_cost(tile):
+    """Cost of lifting a mortgage (mortgage value plus 10% interest)."""
+    return int((tile.cost // 2) * 1.1)
+
+def mortgage_interest(tile):
+    """Interest due when keeping a traded property mortgaged."""
+    return int((tile.cost // 2) * 0.1)
+
+def get_sellable_house_tiles(game_state, player_id):
+    """Return tile IDs a player can sell a house from under the even selling rule.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the player selling
+
+    Returns:
+        list: Tile IDs holding the most houses within their color set
+    """
+    return list(derive(game_state).sellable_houses(player_id))
+
+def get_mortgage_candidates(game_state, player_id):
+    """Return tile IDs a player may mortgage.
+
+    A property can be mortgaged if it is not already mortgaged and no street in its
+    color group owned by the player has buildings.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the player mortgaging
+
+    Returns:
+        list: Mortgageable tile IDs
+    """
+    return list(derive(game_state).mortgage_candidates(player_id))
+
+def get_buildable_tiles(game_state, player_id):
+    """Return tile IDs a player can build on under the monopoly and even building rules.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the player building
+
+    Returns:
+        list: Buildable tile IDs (cash is not checked)
+    """
+    return list(derive(game_state).buildable(player_id))
+
+def get_unmortgageable_tiles(game_state, player_id):
+    """Return mortgaged tile IDs the player can currently afford to unmortgage."""
+    player = game_state.players[player_id]
+    return [
+        t for t in tiles_in_mask(player.owned_mask & game_state.mortgaged_mask)
+        if player.cash >= unmortgage_cost(game_state.board[t])
+    ]
+
+def legal_actions(game_state, player_id, phase):
+    """Enumerate the legal actions for a player in a decision phase.
+
+    Bids are returned as a single template action with "min_bid" and "max_bid"
+    instead of one action per amount.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the deciding player
+        phase: The current game phase
+
+    Returns:
+        list | None: Legal actions, or None if the phase is open-ended (management)
+    """
+    player = game_state.players[player_id]
+
+    if phase == GamePhase.DECIDE_TO_BUY:
+        tile = game_state.board[player.position]
+        if player.cash >= tile.cost:
+            return [{"type": "buy"}, {"type": "skip_buy"}]
+        return [{"type": "skip_buy"}]
+
+    elif phase == GamePhase.DECIDE_TO_SELL:
+        actions = [{"type": "sell_house", "tile_id": t} for t in get_sellable_house_tiles(game_state, player_id)]
+        actions += [{"type": "mortgage_property", "tile_id": t} for t in get_mortgage_candidates(game_state, player_id)]
+        return actions
+
+    elif phase == GamePhase.DECIDE_ON_TRADE:
+        trade = game_state.pending_trade
+        if is_trade_valid(trade, game_state.players[trade["from_player"]], game_state.players[trade["to_player"]]):
+            return [{"type": "accept_trade"}, {"type": "reject_trade"}]
+        return [{"type": "reject_trade"}]
+
+    elif phase == GamePhase.HANDLE_MORTGAGED_TRADE:
+        tile = game_state.board[game_state.mortgaged_properties_to_handle[0]]
+        actions = [{"type": "resolve_mortgaged_trade", "tile_id": tile.tile_id, "decision": "pay_interest_only"}]
+        if player.cash >= unmortgage_cost(tile):
+            actions.insert(0, {"type": "resolve_mortgaged_trade", "tile_id": tile.tile_id, "decision": "unmortgage_now"})
+        return actions
+
+    elif phase == GamePhase.AUCTION_PHASE:
+        min_bid = game_state.auction_state["current_bid"] + 1
+        if player.cash >= min_bid:
+            return [{"type": "place_bid", "min_bid": min_bid, "max_bid": player.cash}, {"type": "pass_auction"}]
+        return [{"type": "pass_auction"}]
+
+    elif phase == GamePhase.SEALED_AUCTION:
+        if player.cash >= MIN_SEALED_BID:
+            return [{"type": "place_bid", "min_bid": MIN_SEALED_BID, "max_bid": player.cash}, {"type": "pass_auction"}]
+        return [{"type": "pass_auction"}]
+
+    return None
+
+def forced_action(game_state, player_id, phase):
+    """Return the only legal action for a player, or None if there is a real choice.
+
+    Args:
+        game_state: GameState object containing the game state
+        player_id: ID of the deciding player
+        phase: The current game phase
+
+    Returns:
+        dict | None: The forced action
+    """
+    if phase not in FORCED_MOVE_PHASES:
+        return None
+    actions = legal_actions(game_state, player_id, phase)
+    if actions is not None and len(actions) == 1 and actions[0]["type"] != "place_bid":
+        return actions[0]
+    return None
@@ -1,20 +1,29 @@
+import json
 import logging
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from blob_store import BlobStore, blob_ref
+
 class GameLogger:
     """Handles logging of game trajectories to files."""
     
-    def __init__(self, game_id=None):
+    def __init__(self, game_id=None, results_dir="../results", console=True, collect=(), blobs=True):
         """Initialize the game logger.
         
         Args:
             game_id: Optional custom game ID. If None, generates timestamp-based ID.
+            results_dir: Directory to write the log and event files to.
+            console: Whether to echo the text log to the console.
+            collect: Event types to also keep in memory, in ``collected`` (e.g. for the results database).
+            blobs: Whether to store prompt and response bodies in a compressed ``<game_id>.blobs``
+                store (see blob_store.py) and reference them from the text log instead of writing them inline.
         """
         # Create results directory if it doesn't exist
-        self.results_dir = Path("../results")
-        self.results_dir.mkdir(exist_ok=True)
+        self.results_dir = Path(results_dir)
+        self.results_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate game ID if not provided
         if game_id is None:
@@ -23,6 +32,14 @@ class GameLogger:
         
         self.game_id = game_id
         self.log_file = self.results_dir / f"{game_id}.log"
+        self.event_file = self.results_dir / f"{game_id}.jsonl"
+        self._event_stream = None
+        self.collect = set(collect)
+        self.collected = []
+        self.blobs = BlobStore(self.results_dir / f"{game_id}.blobs") if blobs else None
+        self._last_blob = {} # (kind, player_id) -> key of the last body logged, the base for the next one
+        self._write_lock = threading.Lock() # bodies and events may be logged from several threads (sealed bids, deferred logs)
+        self._deferred = [] # threads still finishing logs (see defer)
         
         # Set up logger
         self.logger = logging.getLogger(f"monopoly_game_{game_id}")
@@ -44,10 +61,11 @@ class GameLogger:
         self.logger.addHandler(file_handler)
         
         # Also log to console for immediate feedback
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            self.logger.addHandler(console_handler)
         
         self.logger.info(f"=== MONOPOLY GAME LOG: {game_id} ===")
         self.logger.info(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -114,19 +132,78 @@ class GameLogger:
         """Log game over."""
         self.logger.info("\nGame Over!")
     
+    def log_adjudication(self, result):
+        """Log a game ended early by adjudication."""
+        self.logger.info(f"ADJUDICATED: Player {result['winner']} wins by {result['method']} at turn {result['turn']}")
+        self.log_event("adjudicated", **result)
+
     def log_final_results(self, player_id, final_cash, owned_properties):
         """Log final player results."""
         properties_str = owned_properties if owned_properties != 'None' else 'None'
         self.logger.info(f"Player {player_id} | Final Cash: ${final_cash} | Properties: {properties_str}")
     
-    def log_api_response(self, response_data):
-        """Log API responses for debugging."""
-        self.logger.info(f"API RESPONSE: {response_data}")
-    
+    def log_prompt(self, player_id, prompt):
+        """Log the prompt sent to the model for a player's decision.
+
+        Tagged with the player, since sealed bidders decide at once and their lines interleave.
+        """
+        self.logger.info(f"PROMPT{self._player_tag(player_id)}: {self._body('prompt', player_id, prompt)}")
+
+    def log_api_response(self, response_data, player_id=None):
+        """Log API responses for debugging, tagged with the player like the prompt."""
+        self.logger.info(f"API RESPONSE{self._player_tag(player_id)}: {self._body('response', player_id, response_data)}")
+
+    def log_api_response_continued(self, response_data, player_id, turn):
+        """Log the output a streamed response sent after its tool call (written later, among other steps)."""
+        self.logger.info(f"API RESPONSE (continued, Player {player_id}, turn {turn}): {self._body('response', player_id, response_data)}")
+
+    @staticmethod
+    def _player_tag(player_id):
+        return "" if player_id is None else f" (Player {player_id})"
+
+    def _body(self, kind, player_id, text):
+        """A body to log: a reference to it in the blob store, stored against the player's previous one of its kind."""
+        if self.blobs is None:
+            return text
+        with self._write_lock:
+            key = self._last_blob[kind, player_id] = self.blobs.put(text, self._last_blob.get((kind, player_id)))
+        return blob_ref(key)
+
+    def defer(self, log):
+        """Run a callable that logs (e.g. the rest of a streamed response) in a background thread.
+
+        It finishes before the logger closes.
+        """
+        thread = threading.Thread(target=log, daemon=True)
+        thread.start()
+        with self._write_lock:
+            self._deferred = [t for t in self._deferred if t.is_alive()] + [thread]
+
+    def wait_deferred(self):
+        """Wait for the deferred logs to finish."""
+        with self._write_lock:
+            threads, self._deferred = self._deferred, []
+        for thread in threads:
+            thread.join()
+    
+    def log_api_call(self, player_id, turn, phase, model, seconds, input_tokens=None, output_tokens=None, route=None, cost=None):
+        """Log the model, route, latency, token usage and cost of an API call made for a player's decision."""
+        self.log_event("api_call", player_id=player_id, turn=turn, phase=phase, model=model, seconds=seconds,
+                       input_tokens=input_tokens, output_tokens=output_tokens, route=route, cost=cost)
+
     def log_model_reasoning(self, reasoning):
         """Log model reasoning."""
         self.logger.info(f"MODEL REASONING: {reasoning}")
     
+    def log_forced_move(self, player_id, phase, action):
+        """Log a decision resolved locally because only one action was legal."""
+        self.logger.info(f"FORCED MOVE: Player {player_id} in {phase} -> {action}")
+        self.log_event("forced_move", player_id=player_id, phase=phase, action=action["type"])
+
+    def log_decision(self, player_id, phase, allowed_tools, action, features):
+        """Log an agent decision with the features of the state it was made in."""
+        self.log_event("decision", player_id=player_id, phase=phase, allowed_tools=allowed_tools, action=action, features=features)
+
     def log_tool_call(self, tool_name):
         """Log tool calls."""
         self.logger.info(f"TOOL CALL: {tool_name}")
@@ -134,9 +211,38 @@ class GameLogger:
     def log_custom(self, message):
         """Log a custom message."""
         self.logger.info(message)
+
+    def log_event(self, event_type, **data):
+        """Log a structured event to the game's JSONL event file.
+
+        Events sit alongside the human-readable log and are what the analytics
+        tooling reads, so they should only contain JSON-serializable values.
+
+        Args:
+            event_type: Short name of the event (e.g. "rent", "bankruptcy").
+            **data: Event payload.
+        """
+        record = {"event": event_type, **data}
+        with self._write_lock:
+            if self._event_stream is None:
+                self._event_stream = open(self.event_file, "w", encoding="utf-8")
+            self._event_stream.write(json.dumps(record) + "\n")
+            if event_type in self.collect:
+                self.collected.append(record)
+
+    def log_match_config(self, config):
+        """Log the match configuration (agents, starting cash, etc.)."""
+        self.logger.info(f"CONFIG: {json.dumps(config)}")
+        self.log_event("match_config", **config)
     
     def close(self):
         """Close the logger and handlers."""
+        self.wait_deferred()
         for handler in self.logger.handlers[:]:
             handler.close()
-            self.logger.removeHandler(handler) 
\ No newline at end of file
+            self.logger.removeHandler(handler)
+        if self._event_stream is not None:
+            self._event_stream.close()
+            self._event_stream = None
+        if self.blobs is not None:
+            self.blobs.close() 
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Token-bucket rate limiter for model calls, shared by every thread and process on the machine.
+
+Games running side by side (scheduler slots, worker processes, several sweeps
+at once) would otherwise hit the provider's requests-per-minute and
+tokens-per-minute limits together and fail in bursts of 429s. Each model gets
+two buckets, for requests and for tokens. They refill continuously at the
+configured per-minute rates and hold at most ``burst_seconds`` worth. A call
+waits until both buckets hold enough, so the calls go out evenly at the quota
+ceiling.
+
+Bucket levels live in a small JSON state file guarded by an exclusive file lock
+(``fcntl.flock``), so every process that uses the same file shares them. Where
+``fcntl`` is unavailable the limiter falls back to a lock shared by the threads of
+one process.
+
+    limiter = RateLimiter({"gpt-4o-mini-2024-07-18": {"rpm": 500, "tpm": 200000}})
+    reserved = limiter.acquire("gpt-4o-mini-2024-07-18", tokens=estimate)
+    response = client.responses.create(...)
+    limiter.settle("gpt-4o-mini-2024-07-18", reserved, response.usage.total_tokens)
+
+Token counts are estimated before a call and corrected with ``settle`` after it;
+a call that fails gives its share back with ``cancel``. If the provider still
+answers 429, ``backoff`` pauses the model for every caller.
+"""
+
+import json
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError: # Windows: limits are shared by the threads of one process only
+    fcntl = None
+
+DEFAULT_STATE_FILE = Path(tempfile.gettempdir()) / "monopoly-bench-rate-limits.json"
+CHARS_PER_TOKEN = 4 # rough prompt-size estimate when usage is not known yet
+
+def estimate_tokens(text, expected_output=300):
+    """Rough token count of a call: its input at CHARS_PER_TOKEN characters a token, plus the expected output."""
+    return len(text) // CHARS_PER_TOKEN + expected_output
+
+class RateLimiter:
+    """Per-model request and token buckets in a lock-guarded state file."""
+
+    def __init__(self, limits, state_file=DEFAULT_STATE_FILE, burst_seconds=10):
+        """Initializes the limiter.
+
+        Args:
+            limits: Model name -> {"rpm": requests per minute, "tpm": tokens per minute};
+                either may be left out, and models not listed are not limited.
+            state_file: Where the bucket levels are kept; processes sharing it share the limits.
+            burst_seconds: Seconds of quota a bucket holds, i.e. the largest burst after a lull.
+        """
+        self.limits = limits
+        self.state_file = Path(state_file)
+        self.burst_seconds = burst_seconds
+        self._thread_lock = threading.Lock()
+        self.waited = 0.0 # seconds this process spent waiting for quota
+
+    @contextmanager
+    def _state(self):
+        """The shared bucket state, locked for the duration of the block and saved after it."""
+        with self._thread_lock:
+            with open(self.state_file, "a+", encoding="utf-8") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    text = f.read()
+                    try:
+                        state = json.loads(text) if text else {}
+                    except json.JSONDecodeError:
+                        state = {} # A writer died mid-write; start the buckets over
+                    yield state
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _buckets(self, state, model, now):
+        """The model's buckets, refilled up to now."""
+        limits = self.limits[model]
+        buckets = state.setdefault(model, {"at": now, "blocked_until": 0.0})
+        elapsed = max(now - buckets["at"], 0.0)
+        for name in ("rpm", "tpm"):
+            if limits.get(name):
+                rate = limits[name] / 60
+                level = buckets.get(name, rate * self.burst_seconds)
+                buckets[name] = min(level + elapsed * rate, rate * self.burst_seconds)
+        buckets["at"] = now
+        return buckets
+
+    def acquire(self, model, tokens=0):
+        """Wait until the model's quota allows a call, and take its share.
+
+        Args:
+            model: Model name.
+            tokens: Estimated tokens of the call (see estimate_tokens).
+
+        Returns:
+            The tokens taken from the bucket, to pass to settle or cancel.
+        """
+        limits = self.limits.get(model)
+        if not limits:
+            return 0
+        # A call bigger than a bucket waits for a full one, and takes only that much
+        need = {name: min(amount, limits[name] / 60 * self.burst_seconds)
+                for name, amount in (("rpm", 1), ("tpm", tokens)) if limits.get(name)}
+        while True:
+            with self._state() as state:
+                now = time.time()
+                buckets = self._buckets(state, model, now)
+                wait = buckets["blocked_until"] - now
+                for name, amount in need.items():
+                    wait = max(wait, (amount - buckets[name]) / (limits[name] / 60))
+                if wait <= 0:
+                    for name, amount in need.items():
+                        buckets[name] -= amount
+                    return need.get("tpm", 0)
+            # Sleep off the shortfall; the jitter keeps waiting callers from waking at the same instant
+            delay = wait + random.uniform(0, 0.01)
+            self.waited += delay
+            time.sleep(delay)
+
+    def settle(self, model, reserved, actual):
+        """Correct a call's token reservation with its actual usage (the difference is charged or refunded)."""
+        limits = self.limits.get(model)
+        if not limits or not limits.get("tpm") or actual is None:
+            return
+        with self._state() as state:
+            buckets = self._buckets(state, model, time.time())
+            buckets["tpm"] -= actual - reserved
+
+    def cancel(self, model, reserved):
+        """Give back the request and tokens taken by acquire for a call that did not go through (e.g. a 429)."""
+        limits = self.limits.get(model)
+        if not limits:
+            return
+        with self._state() as state:
+            buckets = self._buckets(state, model, time.time())
+            for name, amount in (("rpm", 1), ("tpm", reserved)):
+                if limits.get(name):
+                    buckets[name] = min(buckets[name] + amount, limits[name] / 60 * self.burst_seconds)
+
+    def backoff(self, model, seconds):
+        """Hold every caller of the model for a while, after the provider rejected a call for its rate."""
+        if model not in self.limits:
+            return
+        with self._state() as state:
+            now = time.time()
+            buckets = self._buckets(state, model, now)
+            buckets["blocked_until"] = max(buckets["blocked_until"], now + seconds)
@@ -0,0 +1,347 @@
+"""SQLite store of game results for dashboards and regression checks.
+
+Experiments leave one ``games.jsonl`` record per game and, with logs on, a
+per-game event file. ``ResultsDB`` keeps the same facts in indexed tables, so
+queries over millions of rows take milliseconds instead of a re-parse of
+``results/``:
+
+    matches    one row per game: experiment, job, seed, config hash, settings, outcome
+    players    one row per seat: lineup position, agent type, model
+    standings  one row per seat: final rank (None if bankrupt), cash, whether it won
+    decisions  agent decisions: player, phase, action, allowed tools, features
+    api_calls  LLM calls: player, turn, phase, model, route, latency, token usage, cost
+
+Matches are indexed by seed and config hash (a hash of everything that defines a
+matrix cell except seat rotation, so every seed of a configuration shares it), and
+players and API calls by model.
+
+There is a single writer: ``cli.run_jobs`` records each game from the parent
+process as the workers hand back results, and rows are buffered and written in
+batched transactions. Workers never open the database, so they never contend for
+its lock, and readers are not blocked while it is written (WAL journal).
+
+    db = ResultsDB("results/results.db")
+    db.add_result(result, events)      # buffered; flushed every batch_size rows
+    db.close()
+    db.win_rates(by="model")           # {"gpt-4o-mini-2024-07-18": {"games": ..., "wins": ..., "win_rate": ...}, ...}
+
+Existing experiment directories can be loaded with ``import_experiment``.
+
+Usage:
+    python results_db.py import ../results/llm_vs_baselines [--db ../results/results.db]
+    python results_db.py query "SELECT model, COUNT(*) FROM api_calls GROUP BY model" [--db ...]
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "results" / "results.db"
+DB_EVENTS = ("decision", "api_call") # event types stored alongside each game
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    experiment TEXT,
+    job_id TEXT,
+    config_hash TEXT,
+    seed INTEGER,
+    cell INTEGER,
+    lineup TEXT,
+    rotation INTEGER,
+    board TEXT,
+    num_players INTEGER,
+    starting_cash INTEGER,
+    max_turns INTEGER,
+    auction_mode TEXT,
+    turns INTEGER,
+    winner INTEGER,
+    winner_agent INTEGER,
+    adjudicated TEXT,
+    seconds REAL,
+    recorded_at REAL
+);
+CREATE TABLE IF NOT EXISTS players (
+    match_id TEXT,
+    player_id INTEGER,
+    agent INTEGER,
+    agent_type TEXT,
+    model TEXT,
+    description TEXT,
+    PRIMARY KEY (match_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS standings (
+    match_id TEXT,
+    player_id INTEGER,
+    rank INTEGER,
+    cash INTEGER,
+    bankrupt INTEGER,
+    won INTEGER,
+    PRIMARY KEY (match_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS decisions (
+    match_id TEXT,
+    seq INTEGER,
+    player_id INTEGER,
+    phase TEXT,
+    action TEXT,
+    action_json TEXT,
+    allowed_tools TEXT,
+    features TEXT,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS api_calls (
+    match_id TEXT,
+    seq INTEGER,
+    player_id INTEGER,
+    turn INTEGER,
+    phase TEXT,
+    model TEXT,
+    seconds REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    route TEXT,
+    cost REAL,
+    PRIMARY KEY (match_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_matches_config_hash ON matches (config_hash);
+CREATE INDEX IF NOT EXISTS idx_matches_seed ON matches (seed);
+CREATE INDEX IF NOT EXISTS idx_players_model ON players (model);
+CREATE INDEX IF NOT EXISTS idx_api_calls_model ON api_calls (model);
+"""
+
+TABLES = {
+    "matches": 19,
+    "players": 6,
+    "standings": 6,
+    "decisions": 8,
+    "api_calls": 11,
+}
+
+def config_hash(result):
+    """Hash of a game's configuration: board, settings, adjudication and agents by lineup position.
+
+    Seat rotations and seeds of the same matrix cell share it.
+    """
+    agents = [None] * len(result["agents"])
+    for seat, agent in enumerate(result["agents"]):
+        agents[result.get("seats", range(len(agents)))[seat]] = {k: v for k, v in agent.items() if k not in ("player_id", "process")}
+    config = {key: result.get(key) for key in ("board", "starting_cash", "max_turns", "auction_mode", "adjudication")}
+    config["agents"] = agents
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+def result_rows(result, experiment, events=()):
+    """Rows for one game, by table.
+
+    Args:
+        result: A games.jsonl record (see cli.run_job).
+        experiment: Name of the experiment the game belongs to.
+        events: The game's "decision" and "api_call" events, in order.
+
+    Returns:
+        dict: Table name -> list of row tuples.
+    """
+    match_id = f"{experiment}:{result['job_id']}"
+    seats = result.get("seats") or list(range(len(result["agents"])))
+    ranks = {standing["player_id"]: rank for rank, standing in enumerate(result["standings"], 1)}
+    cash = {standing["player_id"]: standing["cash"] for standing in result["standings"]}
+    adjudicated = result.get("adjudicated")
+    rows = {table: [] for table in TABLES}
+    rows["matches"].append((
+        match_id, experiment, result["job_id"], config_hash(result), result.get("seed"), result.get("cell"),
+        result.get("lineup"), result.get("rotation"), result.get("board"), len(result["agents"]),
+        result.get("starting_cash"), result.get("max_turns"), result.get("auction_mode"), result.get("turns"),
+        result.get("winner"), result.get("winner_agent"), json.dumps(adjudicated) if adjudicated else None,
+        result.get("seconds"), time.time(),
+    ))
+    for seat, agent in enumerate(result["agents"]):
+        rows["players"].append((match_id, seat, seats[seat], agent.get("type"), agent.get("model"), json.dumps(agent)))
+        rows["standings"].append((match_id, seat, ranks.get(seat), cash.get(seat, 0), int(seat not in cash),
+                                  int(seat == result.get("winner"))))
+    for seq, event in enumerate(events):
+        if event["event"] == "decision":
+            action = event.get("action") or {}
+            rows["decisions"].append((match_id, seq, event["player_id"], event.get("phase"), action.get("type"),
+                                      json.dumps(action), json.dumps(event.get("allowed_tools")), json.dumps(event.get("features"))))
+        elif event["event"] == "api_call":
+            rows["api_calls"].append((match_id, seq, event["player_id"], event.get("turn"), event.get("phase"), event.get("model"),
+                                      event.get("seconds"), event.get("input_tokens"), event.get("output_tokens"),
+                                      event.get("route"), event.get("cost")))
+    return rows
+
+class ResultsDB:
+    """Single-writer SQLite results store with batched inserts."""
+
+    def __init__(self, path=DEFAULT_DB, batch_size=1000):
+        """Opens (and if needed creates) the database.
+
+        Args:
+            path: Database file.
+            batch_size: Buffered rows that trigger a write; smaller batches make results visible sooner.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(api_calls)")}
+        for column, kind in (("route", "TEXT"), ("cost", "REAL")): # databases created before routing.py
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE api_calls ADD COLUMN {column} {kind}")
+        self.pending = {table: [] for table in TABLES}
+        self.buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_result(self, result, events=(), experiment=None):
+        """Buffer one game; re-adding a recorded game is a no-op.
+
+        Args:
+            result: A games.jsonl record.
+            events: The game's "decision" and "api_call" events.
+            experiment: Experiment name (defaults to the result's "experiment" field).
+        """
+        rows = result_rows(result, experiment or result.get("experiment", ""), events)
+        for table, table_rows in rows.items():
+            self.pending[table].extend(table_rows)
+            self.buffered += len(table_rows)
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows in one transaction."""
+        if not self.buffered:
+            return
+        with self.connection:
+            for table, rows in self.pending.items():
+                if rows:
+                    placeholders = ", ".join("?" * TABLES[table])
+                    self.connection.executemany(f"INSERT OR IGNORE INTO {table} VALUES ({placeholders})", rows)
+                    rows.clear()
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+    def import_experiment(self, output_dir, experiment=None):
+        """Load an experiment directory's games.jsonl, with decisions and API calls from its logs.
+
+        Args:
+            output_dir: Experiment output directory (see cli.run_jobs).
+            experiment: Experiment name (defaults to the directory name).
+
+        Returns:
+            int: Games read.
+        """
+        output_dir = Path(output_dir)
+        experiment = experiment or output_dir.name
+        games = 0
+        with open(output_dir / "games.jsonl", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                self.add_result(result, _logged_events(output_dir / "logs" / f"{output_dir.name}_{result['job_id']}.jsonl"),
+                                experiment)
+                games += 1
+        self.flush()
+        return games
+
+    def query(self, sql, params=()):
+        """Run a read query and return its rows."""
+        self.flush()
+        return self.connection.execute(sql, params).fetchall()
+
+    def win_rates(self, by="model", config_hash=None, experiment=None):
+        """Games, wins and win rate per agent model or type.
+
+        Args:
+            by: "model" or "agent_type".
+            config_hash: Only count games of this configuration.
+            experiment: Only count games of this experiment.
+
+        Returns:
+            dict: Model or agent type -> {"games", "wins", "win_rate"}.
+        """
+        if by not in ("model", "agent_type"):
+            raise ValueError(f"Unknown grouping: {by!r} (expected 'model' or 'agent_type')")
+        where, params = [], []
+        if config_hash is not None:
+            where.append("m.config_hash = ?")
+            params.append(config_hash)
+        if experiment is not None:
+            where.append("m.experiment = ?")
+            params.append(experiment)
+        rows = self.query(
+            f"SELECT p.{by}, COUNT(*), SUM(s.won) FROM players p "
+            "JOIN standings s USING (match_id, player_id) JOIN matches m USING (match_id)"
+            + (f" WHERE {' AND '.join(where)}" if where else "") + f" GROUP BY p.{by}", params)
+        return {key: {"games": games, "wins": wins, "win_rate": wins / games} for key, games, wins in rows}
+
+    def route_stats(self, experiment=None):
+        """Calls, mean latency, tokens and cost per model route (see routing.py).
+
+        Args:
+            experiment: Only count calls of this experiment.
+
+        Returns:
+            dict: (route, model) -> {"calls", "mean_seconds", "input_tokens", "output_tokens", "cost"};
+            the cost is None if any call of the group has none.
+        """
+        rows = self.query(
+            "SELECT COALESCE(a.route, 'default'), a.model, COUNT(*), AVG(a.seconds), SUM(a.input_tokens), "
+            "SUM(a.output_tokens), CASE WHEN COUNT(a.cost) = COUNT(*) THEN SUM(a.cost) END FROM api_calls a"
+            + (" JOIN matches m USING (match_id) WHERE m.experiment = ?" if experiment is not None else "")
+            + " GROUP BY 1, a.model", (experiment,) if experiment is not None else ())
+        return {(route, model): {"calls": calls, "mean_seconds": seconds, "input_tokens": input_tokens,
+                                 "output_tokens": output_tokens, "cost": cost}
+                for route, model, calls, seconds, input_tokens, output_tokens, cost in rows}
+
+def _logged_events(path):
+    """The decision and API-call events of a game's event file (none if it was run without logs)."""
+    if not path.exists():
+        return []
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue # Truncated final line of an interrupted game
+            if event.get("event") in DB_EVENTS:
+                events.append(event)
+    return events
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load and query the SQLite results database.")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Database file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    load = subparsers.add_parser("import", help="Load experiment output directories")
+    load.add_argument("output_dirs", nargs="+")
+    query = subparsers.add_parser("query", help="Run a SQL query and print the rows")
+    query.add_argument("sql")
+    args = parser.parse_args(argv)
+
+    with ResultsDB(args.db) as db:
+        if args.command == "import":
+            for output_dir in args.output_dirs:
+                print(f"{output_dir}: {db.import_experiment(output_dir)} games")
+        else:
+            start = time.perf_counter()
+            rows = db.query(args.sql)
+            for row in rows:
+                print("\t".join(map(str, row)))
+            print(f"{len(rows)} row(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
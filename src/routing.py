@@ -0,0 +1,152 @@
+"""Per-phase model routing for LLM agents.
+
+Most decisions are simple (buy or skip, bid or pass) and do not need the
+strongest model, while trades decide games. An ``LLMAgent`` can therefore send
+each phase to its own route: a model, and optionally a reasoning effort and an
+output token cap. Routes are keyed by phase name, with ``"default"`` for the
+phases not listed (itself defaulting to the agent's ``model``):
+
+    LLMAgent(player_id, routes={
+        "default": {"model": "gpt-4o-mini-2024-07-18"},
+        "decide_on_trade": {"model": "o3-2025-04-16", "reasoning_effort": "medium"},
+        "start_management_phase": {"model": "o3-2025-04-16", "reasoning_effort": "medium"},
+        "end_management_phase": {"model": "o3-2025-04-16", "reasoning_effort": "low"},
+    })
+
+An agent with routes is labelled by the models its routes call
+(``route_models``), joined with "+" when there are several, so win rates by model
+credit the combination that actually played.
+
+Every API call is logged with its route, latency, token usage and cost (from
+``PRICES``), so ``route_report`` and the results database can break both down
+per route.
+"""
+
+import json
+import statistics
+import sys
+from pathlib import Path
+
+from engine import GamePhase
+
+DEFAULT_ROUTE = "default"
+# Phases in which an LLMAgent asks the model
+DECISION_PHASES = (
+    GamePhase.START_MANAGEMENT,
+    GamePhase.END_MANAGEMENT,
+    GamePhase.DECIDE_TO_BUY,
+    GamePhase.DECIDE_TO_SELL,
+    GamePhase.DECIDE_ON_TRADE,
+    GamePhase.HANDLE_MORTGAGED_TRADE,
+    GamePhase.AUCTION_PHASE,
+    GamePhase.SEALED_AUCTION,
+)
+ROUTE_KEYS = ("model", "reasoning_effort", "max_output_tokens")
+
+# USD per million input and output tokens; models not listed are reported without a cost
+PRICES = {
+    "gpt-4o-mini-2024-07-18": (0.15, 0.60),
+    "gpt-4o-2024-08-06": (2.50, 10.00),
+    "gpt-4.1-mini-2025-04-14": (0.40, 1.60),
+    "gpt-4.1-2025-04-14": (2.00, 8.00),
+    "o3-mini-2025-01-31": (1.10, 4.40),
+    "o4-mini-2025-04-16": (1.10, 4.40),
+    "o3-2025-04-16": (2.00, 8.00),
+}
+
+def validate_routes(routes):
+    """Check a routes dict, returning it.
+
+    Raises:
+        ValueError: If a route is not a dict or has keys other than ROUTE_KEYS.
+    """
+    for name, route in (routes or {}).items():
+        if not isinstance(route, dict):
+            raise ValueError(f"Route {name!r} must be a dict, got {route!r}")
+        unknown = set(route) - set(ROUTE_KEYS)
+        if unknown:
+            raise ValueError(f"Route {name!r} has unknown keys {sorted(unknown)} (expected {', '.join(ROUTE_KEYS)})")
+    return routes
+
+def resolve_route(routes, phase, model):
+    """The route for a phase: its own entry, else the default one, filled in with the agent's model.
+
+    Args:
+        routes: Phase name or "default" -> route dict (see ROUTE_KEYS); may be None.
+        phase: The decision's phase.
+        model: Model of phases without a route that names one.
+
+    Returns:
+        dict: {"name", "model", "reasoning_effort", "max_output_tokens"}; unset options are None.
+    """
+    routes = routes or {}
+    name = phase if phase in routes else DEFAULT_ROUTE
+    route = routes.get(name, {})
+    return {"name": name, "model": route.get("model") or model, "reasoning_effort": route.get("reasoning_effort"),
+            "max_output_tokens": route.get("max_output_tokens")}
+
+def route_models(routes, model):
+    """Sorted models an agent's decisions can be routed to."""
+    return sorted({resolve_route(routes, phase, model)["model"] for phase in DECISION_PHASES})
+
+def call_cost(model, input_tokens, output_tokens, prices=PRICES):
+    """USD cost of a call, or None if the model's price or the usage is unknown."""
+    price = prices.get(model)
+    if price is None or input_tokens is None or output_tokens is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1e6
+
+def route_report(events):
+    """Calls, latency, tokens and cost per route and model.
+
+    Args:
+        events: Logged events; only "api_call" events are counted.
+
+    Returns:
+        dict: "route model" -> {"calls", "mean_seconds", "p95_seconds", "input_tokens", "output_tokens", "cost"};
+        the cost is None if any call of the group has none (e.g. an unpriced model).
+    """
+    calls = {}
+    for event in events:
+        if event.get("event") == "api_call":
+            calls.setdefault(f"{event.get('route') or DEFAULT_ROUTE} {event.get('model')}", []).append(event)
+    report = {}
+    for label, group in calls.items():
+        seconds = sorted(event["seconds"] for event in group)
+        report[label] = {
+            "calls": len(group),
+            "mean_seconds": statistics.fmean(seconds),
+            "p95_seconds": seconds[min(int(0.95 * len(seconds)), len(seconds) - 1)],
+            "input_tokens": sum(event.get("input_tokens") or 0 for event in group),
+            "output_tokens": sum(event.get("output_tokens") or 0 for event in group),
+            "cost": None if any(event.get("cost") is None for event in group) else sum(event["cost"] for event in group),
+        }
+    return report
+
+def _read_events(paths):
+    for path in paths:
+        path = Path(path)
+        for file in sorted(path.rglob("*.jsonl")) if path.is_dir() else [path]:
+            with open(file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+def main():
+    """Print the per-route report of the event logs in the given files or directories."""
+    from analytics import format_table
+
+    if len(sys.argv) < 2:
+        print("Usage: python routing.py <events.jsonl or results dir> [...]")
+        sys.exit(1)
+    report = route_report(_read_events(sys.argv[1:]))
+    for stats in report.values():
+        if stats["cost"] is None:
+            stats["cost"] = "unknown"
+    print(format_table("API calls by route", report,
+                       ["calls", "mean_seconds", "p95_seconds", "input_tokens", "output_tokens", "cost"]))
+
+if __name__ == "__main__":
+    main()
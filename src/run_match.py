@@ -1,13 +1,138 @@
-from engine import GameState, step
-from config import tile_data, num_players, agents, starting_cash, max_turns
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from engine import GameState, GamePhase, step
+from boards import load_board
+from agents import build_agents
+from config import board, num_players, agents as agent_specs, starting_cash, max_turns, auction_mode, adjudication
 from logger import GameLogger
 
-def main():
-    # Initialize logger
-    logger = GameLogger()
+def collect_sealed_bids(game_state, agents_by_id, logger, parallel=True):
+    """Ask every bidder in a sealed-bid auction for their bid at the same time.
+
+    Agent decisions are I/O bound (LLM API calls), so the bidders are queried from
+    a thread pool and the auction resolves after a single parallel round.
+
+    Args:
+        game_state: GameState in the sealed auction phase.
+        agents_by_id: Mapping of player ID to agent.
+        logger: Optional GameLogger.
+        parallel: Query bidders from a thread pool; pass False for fast local agents.
+
+    Returns:
+        dict: A "submit_sealed_bids" action for the engine.
+    """
+    bidders = [agents_by_id[player_id] for player_id in game_state.auction_state["bidders"]]
+    observation = {
+        "game_state": game_state,
+        "phase": game_state.phase,
+        "logger": logger
+    }
+
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(bidders)) as executor:
+            decisions = list(executor.map(lambda agent: agent.act(observation), bidders))
+    else:
+        decisions = [agent.act(observation) for agent in bidders]
+
+    bids = {}
+    for agent, decision in zip(bidders, decisions):
+        if decision and decision.get("type") == "place_bid":
+            bids[agent.player_id] = decision.get("bid_amount", 0)
+        else:
+            bids[agent.player_id] = 0
+    return {"type": "submit_sealed_bids", "bids": bids}
+
+def log_step(logger, game_state, active_player_id, phase_before, action, cash_before, position_before, tile_before):
+    """Write the text log lines and events describing one step of the game."""
+    # Find the player object again, as it might have been removed (bankruptcy)
+    player_after_action = game_state.players.get(active_player_id)
     
-    game_state = GameState(num_players, tile_data, max_turns, starting_cash)
+    logger.log_action(action['type'])
+    logger.log_phase(game_state.phase, "Phase after action")
+    logger.log_event("action", turn=game_state.turn_number, player_id=active_player_id, phase=phase_before, action=action['type'])
+
+    if action['type'] == 'roll':
+        if player_after_action:
+            new_position = player_after_action.position
+            tile = game_state.board[new_position]
+            logger.log_movement(active_player_id, position_before, new_position, tile.name)
+
+            cash_after = player_after_action.cash
+            if cash_after < cash_before:
+                rent_paid = cash_before - cash_after
+                owner_id = getattr(tile, 'owner', None)  # None for tax tiles
+                logger.log_rent_payment(rent_paid, owner_id, cash_after)
+                if owner_id is None:
+                    logger.log_event("tax", turn=game_state.turn_number, player_id=active_player_id, amount=rent_paid)
+                else:
+                    logger.log_event("rent", turn=game_state.turn_number, payer=active_player_id, owner=owner_id, amount=rent_paid)
+            elif hasattr(tile, 'owner') and hasattr(tile, 'cost') and tile.owner is None and tile.cost > 0:
+                logger.log_property_available(tile.name, tile.cost)
+    
+    elif action['type'] == 'buy':
+        if player_after_action and player_after_action.cash < cash_before:
+            cost = cash_before - player_after_action.cash
+            logger.log_property_bought(tile_before.name, cost, player_after_action.cash)
+        else:
+            logger.log_property_not_bought(tile_before.name)
+            logger.log_event("invalid_action", player_id=active_player_id, message=f"Did not buy '{tile_before.name}'")
+
+    elif action['type'] == 'skip_buy':
+        logger.log_property_skipped(tile_before.name)
+
+    elif action['type'] == 'sell':
+        tile_sold = game_state.board[action["tile_id"]]
+        sale_price = tile_sold.cost // 2
+        logger.log_property_sold(tile_sold.name, sale_price, player_after_action.cash if player_after_action else 0)
+
+    elif action['type'] == 'end_turn':
+        logger.log_turn_end()
 
+    if not player_after_action:
+        logger.log_bankruptcy(active_player_id)
+        logger.log_event("bankruptcy", turn=game_state.turn_number, player_id=active_player_id)
+    
+    logger.log_separator()
+
+def final_standings(game_state):
+    """The surviving players ranked by cash, or with the adjudicated winner first."""
+    sorted_players = sorted(game_state.players.values(), key=lambda p: p.cash, reverse=True)
+    if game_state.adjudication is not None:
+        # The adjudicated winner leads the standings whatever their cash
+        winner = game_state.players[game_state.adjudication["winner"]]
+        sorted_players.remove(winner)
+        sorted_players.insert(0, winner)
+    return sorted_players
+
+def log_final_results(logger, game_state):
+    """Write the final standings (see final_standings)."""
+    logger.log_game_over()
+    if game_state.players:
+        for rank, player in enumerate(final_standings(game_state)):
+            owned_property_names = [p.name for p in game_state.board if hasattr(p, 'owner') and p.owner == player.player_id]
+            logger.log_final_results(
+                player.player_id, 
+                player.cash, 
+                owned_property_names if owned_property_names else 'None'
+            )
+            logger.log_event("final_standing", rank=rank, player_id=player.player_id, cash=player.cash, properties=owned_property_names)
+    logger.log_event("game_over", turns=game_state.turn_number)
+
+def play_game(game_state, agents, logger=None, parallel_bids=True, adjudicator=None):
+    """Play a game to completion.
+
+    Args:
+        game_state: A freshly created GameState (or one part-way through a game).
+        agents: Agents, one per player.
+        logger: Optional GameLogger for the text log and event stream.
+        parallel_bids: Collect sealed bids from a thread pool (see collect_sealed_bids).
+        adjudicator: Optional adjudication.Adjudicator, consulted after every full
+            round; the game ends early once it names a winner.
+
+    Returns:
+        GameState: The finished game state.
+    """
+    agents_by_id = {agent.player_id: agent for agent in agents}
     while not game_state.game_over:
         if not game_state.players:
             game_state.game_over = True
@@ -19,9 +144,10 @@ def main():
             active_player_id = game_state.current_player_id
         
         player = game_state.players[active_player_id]
-        agent = next(a for a in agents if a.player_id == active_player_id)
+        agent = agents_by_id[active_player_id]
+        phase_before = game_state.phase
 
-        if game_state.phase == "start_management_phase":
+        if logger and phase_before == GamePhase.START_MANAGEMENT:
             owned_property_names = [p.name for p in game_state.board if hasattr(p, 'owner') and p.owner == active_player_id]
             logger.log_turn_start(
                 game_state.turn_number, 
@@ -33,74 +159,69 @@ def main():
 
         observation = {
             "game_state": game_state,
-            "phase": game_state.phase,
+            "phase": phase_before,
             "logger": logger
         }
 
         # Store state for logging
         cash_before = player.cash
         position_before = player.position
-        tile_at_position_before_action = game_state.board[player.position]
+        tile_before = game_state.board[player.position]
 
-        logger.log_phase(game_state.phase, "Phase before action")
+        if logger:
+            logger.log_phase(phase_before, "Phase before action")
 
-        action = agent.act(observation)
+        if phase_before == GamePhase.SEALED_AUCTION:
+            action = collect_sealed_bids(game_state, agents_by_id, logger, parallel_bids)
+        else:
+            action = agent.act(observation)
+        turn_before = game_state.turn_number
         game_state.phase = step(game_state, action, logger)
 
-        # Find the player object again, as it might have been removed (bankruptcy)
-        player_after_action = game_state.players.get(active_player_id)
-        
-        logger.log_action(action['type'])
-        logger.log_phase(game_state.phase, "Phase after action")
-
-        if action['type'] == 'roll':
-            if player_after_action:
-                new_position = player_after_action.position
-                tile = game_state.board[new_position]
-                logger.log_movement(active_player_id, position_before, new_position, tile.name)
-
-                cash_after = player_after_action.cash
-                if cash_after < cash_before:
-                    rent_paid = cash_before - cash_after
-                    owner_id = getattr(tile, 'owner', None)  # None for tax tiles
-                    logger.log_rent_payment(rent_paid, owner_id, cash_after)
-                elif hasattr(tile, 'owner') and hasattr(tile, 'cost') and tile.owner is None and tile.cost > 0:
-                    logger.log_property_available(tile.name, tile.cost)
-        
-        elif action['type'] == 'buy':
-            if player_after_action and player_after_action.cash < cash_before:
-                cost = cash_before - player_after_action.cash
-                logger.log_property_bought(tile_at_position_before_action.name, cost, player_after_action.cash)
-            else:
-                logger.log_property_not_bought(tile_at_position_before_action.name)
-
-        elif action['type'] == 'skip_buy':
-            logger.log_property_skipped(tile_at_position_before_action.name)
-
-        elif action['type'] == 'sell':
-            tile_sold = game_state.board[action["tile_id"]]
-            sale_price = tile_sold.cost // 2
-            logger.log_property_sold(tile_sold.name, sale_price, player.cash)
-
-        elif action['type'] == 'end_turn':
-            logger.log_turn_end()
-
-        if not player_after_action:
-            logger.log_bankruptcy(active_player_id)
-        
-        logger.log_separator()
+        if logger:
+            log_step(logger, game_state, active_player_id, phase_before, action, cash_before, position_before, tile_before)
 
-    logger.log_game_over()
-    # Sort players by cash for final ranking
-    if game_state.players:
-        sorted_players = sorted(game_state.players.values(), key=lambda p: p.cash, reverse=True)
-        for player in sorted_players:
-            owned_property_names = [p.name for p in game_state.board if hasattr(p, 'owner') and p.owner == player.player_id]
-            logger.log_final_results(
-                player.player_id, 
-                player.cash, 
-                owned_property_names if owned_property_names else 'None'
-            )
+        if adjudicator and game_state.turn_number != turn_before and not game_state.game_over:
+            result = adjudicator.check(game_state)
+            if result is not None:
+                game_state.adjudication = result
+                game_state.game_over = True
+                game_state.phase = GamePhase.GAME_OVER
+                if logger:
+                    logger.log_adjudication(result)
+
+    if logger:
+        log_final_results(logger, game_state)
+    return game_state
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a single Monopoly match")
+    parser.add_argument("--board", default=board, help="Board name from boards/ or path to a board file")
+    args = parser.parse_args()
+
+    game_board = load_board(args.board)
+    agents = build_agents(agent_specs)
+    adjudicator = None
+    if adjudication:
+        from adjudication import Adjudicator # imports run_match through equity
+        adjudicator = Adjudicator(**adjudication)
+
+    # Initialize logger
+    logger = GameLogger()
+    
+    game_state = GameState(num_players, game_board.tile_data, max_turns, starting_cash, auction_mode)
+    logger.log_match_config({
+        "agents": [agent.describe() for agent in agents],
+        "num_players": num_players,
+        "starting_cash": starting_cash,
+        "max_turns": max_turns,
+        "auction_mode": auction_mode,
+        "board": game_board.name,
+        "num_tiles": len(game_board),
+        "adjudication": adjudicator.describe() if adjudicator else None,
+    })
+
+    play_game(game_state, agents, logger, adjudicator=adjudicator)
     
     # Close the logger
     logger.close()
@@ -0,0 +1,215 @@
+"""Work-stealing scheduler for sweeps whose games differ widely in length.
+
+An LLM game can take a few minutes or over an hour, depending on trades, auctions
+and bankruptcies, so any fixed split of games across workers leaves cores and
+API concurrency idle at the tail. ``run_scheduled`` starts ``workers`` processes,
+each running ``slots`` games at once in threads (LLM games spend most of their time
+waiting on the API). Every slot takes the next game from one shared queue as soon
+as it is free, so the load balances itself. The parent keeps the queue just
+full enough for every slot to have a game, so games run in the order given and a
+cell stopped early or an expired budget wastes nothing already queued.
+
+A game that raises (say, a provider error the retries did not absorb) is
+reported through ``on_error`` and the others play on.
+
+Games are ordered longest first (``order_jobs``, using the cells' mean game time
+so far), so the long games start early instead of running alone at the end.
+Wall-clock time then approaches total work divided by workers x slots.
+
+Within a process, ``api_slots`` bounds the concurrent LLM calls with a
+``PriorityGate``. With a ``budget`` (seconds), no game starts after it runs out.
+In its last ``endgame`` fraction the gate lets the decisions of the games
+closest to completion (by turn) go first, so as many games as possible finish.
+
+    run_scheduled(jobs, run_job, (output_dir, True), workers=8, slots=4, api_slots=16,
+                  budget=3600, on_result=record)
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import queue
+import statistics
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+
+import apis
+
+LLM_WEIGHT = 100 # an LLM decision takes about this many times as long as a scripted game turn
+
+class PriorityGate:
+    """Admits a bounded number of holders at a time, the waiter with the highest priority first.
+
+    Priorities are ignored (waiters are admitted first come, first served) until
+    ``endgame_at``.
+    """
+
+    def __init__(self, slots, endgame_at=None):
+        """Initializes the gate.
+
+        Args:
+            slots: Most holders at once.
+            endgame_at: time.time() from which priorities count (None: never).
+        """
+        if slots < 1:
+            raise ValueError(f"slots must be positive, got {slots}")
+        self.slots = slots
+        self.endgame_at = endgame_at
+        self._free = slots
+        self._waiters = [] # heap of (-priority, arrival)
+        self._arrivals = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, priority=0.0):
+        if self.endgame_at is None or time.time() < self.endgame_at:
+            priority = 0.0
+        entry = (-priority, next(self._arrivals))
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            while not self._free or self._waiters[0] != entry:
+                self._condition.wait()
+            heapq.heappop(self._waiters)
+            self._free -= 1
+            if self._free and self._waiters:
+                self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._free += 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority=0.0):
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+def work_units(job):
+    """Rough relative cost of a job: turns x seats, weighted up for LLM agents."""
+    llm_agents = sum(agent["type"].split(":")[-1] == "llm" for agent in job["agents"])
+    return job["max_turns"] * len(job["agents"]) * (1 + LLM_WEIGHT * llm_agents)
+
+def estimate_seconds(jobs, history=()):
+    """Expected seconds per job.
+
+    A job's estimate is the mean time of the finished games of its cell. For cells
+    with none, it is ``work_units`` scaled by the median seconds-per-unit of the
+    cells that have finished games (or 1 if there are none).
+
+    Args:
+        jobs: Job dicts (see cli.expand_jobs).
+        history: Finished games.jsonl records.
+
+    Returns:
+        dict: Job ID -> estimate.
+    """
+    seconds = {}
+    for result in history:
+        seconds.setdefault(result["cell"], []).append(result["seconds"])
+    means = {cell: statistics.fmean(times) for cell, times in seconds.items()}
+    units = {job["cell"]: work_units(job) for job in jobs}
+    ratios = [means[cell] / units[cell] for cell in means if cell in units and units[cell]]
+    scale = statistics.median(ratios) if ratios else 1.0
+    return {job["job_id"]: means.get(job["cell"], scale * work_units(job)) for job in jobs}
+
+def order_jobs(jobs, history=()):
+    """Jobs longest first (ties keep their order), so no long game is left to run alone at the end."""
+    estimates = estimate_seconds(jobs, history)
+    return sorted(jobs, key=lambda job: -estimates[job["job_id"]])
+
+def _slot_loop(jobs, results, run, args):
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        try:
+            results.put(("done", run(job, *args)))
+        except Exception:
+            results.put(("error", job["job_id"], traceback.format_exc()))
+
+def _worker(jobs, results, run, args, slots, api_slots, endgame_at):
+    if api_slots:
+        apis.set_call_gate(PriorityGate(api_slots, endgame_at))
+    threads = [threading.Thread(target=_slot_loop, args=(jobs, results, run, args)) for _ in range(slots)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def run_scheduled(jobs, run, args=(), workers=1, slots=1, api_slots=None, budget=None, endgame=0.1,
+                  runnable=None, on_result=None, on_error=None):
+    """Run jobs on worker processes x game slots, handing each free slot the next job.
+
+    Args:
+        jobs: Jobs in the order to start them (see order_jobs).
+        run: Module-level function called as run(job, *args) in a worker; returns the result.
+        args: Extra arguments for run.
+        workers: Worker processes.
+        slots: Games each worker plays at once (in threads).
+        api_slots: Concurrent LLM calls per worker (None: unbounded).
+        budget: Seconds after which no job is started.
+        endgame: Final fraction of the budget in which waiting LLM calls of the games
+            closest to completion go first.
+        runnable: Optional predicate; jobs it rejects when their turn comes are skipped.
+        on_result: Called in this process with each result, as it arrives.
+        on_error: Called in this process as on_error(job_id, traceback) for each job that
+            raised (printed if not given); the other games play on.
+
+    Returns:
+        list: Jobs not started because the budget ran out.
+
+    Raises:
+        RuntimeError: If a worker process died (the others are stopped).
+    """
+    context = multiprocessing.get_context()
+    job_queue, result_queue = context.Queue(), context.Queue()
+    deadline = time.time() + budget if budget else None
+    endgame_at = deadline - endgame * budget if budget else None
+    processes = [context.Process(target=_worker, args=(job_queue, result_queue, run, args, slots, api_slots, endgame_at))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    pending = iter(jobs)
+    capacity = workers * slots
+    in_flight = 0
+    finished = False
+    try:
+        while True:
+            while in_flight < capacity and not (deadline and time.time() >= deadline):
+                job = next((j for j in pending if runnable is None or runnable(j)), None)
+                if job is None:
+                    break
+                job_queue.put(job)
+                in_flight += 1
+            if not in_flight:
+                break
+            try:
+                message = result_queue.get(timeout=1)
+            except queue.Empty:
+                if not all(process.is_alive() for process in processes):
+                    raise RuntimeError("A worker process died")
+                continue
+            in_flight -= 1
+            if message[0] == "error":
+                if on_error:
+                    on_error(message[1], message[2])
+                else:
+                    print(f"Job {message[1]} failed:\n{message[2]}")
+            elif on_result:
+                on_result(message[1])
+        finished = True
+    finally:
+        if finished:
+            for _ in range(capacity):
+                job_queue.put(None)
+        else:
+            for process in processes:
+                process.terminate()
+        for process in processes:
+            process.join()
+    return [job for job in pending if runnable is None or runnable(job)]
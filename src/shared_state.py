@@ -0,0 +1,371 @@
+"""Shared-memory game state for agents running in worker processes.
+
+The engine process publishes the parts of a ``GameState`` that agents read
+(ownership, houses, mortgages, cash, positions, the auction and pending trade)
+into flat int64 arrays in a ``multiprocessing.shared_memory`` block. A worker
+process attaches to the block by name and reads it without copying or
+unpickling anything; ``SharedStateView.sync`` refreshes a local mirror
+``GameState`` in place so existing agents run unchanged.
+
+Each step only a short message crosses the process boundary: the engine sends
+("act", phase, history) over a pipe and the worker answers with the action dict.
+
+Writes are guarded by a sequence counter: ``publish`` makes it odd while it writes
+and even again when done, and ``sync`` re-reads until it gets the same even value
+before and after reading. A worker therefore never sees a half-written state, even
+when the engine republishes while it reads (e.g. sealed bids asked of several
+worker agents at once).
+
+Usage:
+    shared = SharedGameState(num_players, len(tile_data))
+    agents = [ProcessAgent(0, shared, tile_data, RandomAgent, seed=1), RandomAgent(1)]
+    play_game(game_state, agents)
+    for agent in agents: agent.close()  # ProcessAgents only
+    shared.close(); shared.unlink()
+"""
+
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+
+from agents import BaseAgent, resolve_agent_type
+from engine import (
+    GamePhase,
+    GameState,
+    SeatRing,
+    AuctionMode,
+    SEALED_AUCTION_MODES,
+    set_owner,
+    set_mortgaged,
+    set_houses,
+)
+
+PHASES = (
+    GamePhase.START_MANAGEMENT,
+    GamePhase.END_MANAGEMENT,
+    GamePhase.ROLL_PHASE,
+    GamePhase.DECIDE_TO_BUY,
+    GamePhase.DECIDE_TO_SELL,
+    GamePhase.DECIDE_ON_TRADE,
+    GamePhase.HANDLE_MORTGAGED_TRADE,
+    GamePhase.AUCTION_PHASE,
+    GamePhase.SEALED_AUCTION,
+    GamePhase.END_TURN,
+    GamePhase.GAME_OVER,
+)
+PHASE_CODES = {phase: code for code, phase in enumerate(PHASES)}
+
+HEADER_FIELDS = (
+    "sequence", # odd while a publish is in progress
+    "turn_number", "phase", "current_player_id", "decision_player_id", "trades_proposed_this_turn", "game_over",
+    "auction_tile", "auction_current_bid", "auction_high_bidder",
+    "trade_from", "trade_to", "trade_offer_cash", "trade_request_cash",
+)
+PLAYER_FIELDS = ("alive", "cash", "position", "debt", "creditor_id", "bidder")
+TILE_FIELDS = ("owner", "houses", "mortgaged", "trade_side", "handle_order")
+
+NONE = -1 # encodes None in the int arrays
+TRADE_OFFERED, TRADE_REQUESTED = 1, 2
+ITEM_SIZE = 8
+
+def _encode(value):
+    return NONE if value is None else value
+
+def _decode(value):
+    return None if value == NONE else value
+
+class SharedGameState:
+    """A shared-memory block holding the agent-visible game state as int64 arrays."""
+
+    def __init__(self, num_seats, num_tiles, name=None):
+        """Creates a new block, or attaches to an existing one if a name is given.
+
+        Args:
+            num_seats: Number of players the game started with.
+            num_tiles: Number of tiles on the board.
+            name: Name of an existing block to attach to.
+        """
+        self.num_seats = num_seats
+        self.num_tiles = num_tiles
+        size = (len(HEADER_FIELDS) + len(PLAYER_FIELDS) * num_seats + len(TILE_FIELDS) * num_tiles) * ITEM_SIZE
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.buffer = self.shm.buf[:size].cast("q")
+        self.lock = threading.Lock()
+
+        self.header = {}
+        offset = 0
+        for field in HEADER_FIELDS:
+            self.header[field] = offset
+            offset += 1
+        # One array (memoryview slice) per field, indexed by player ID or tile ID
+        self.arrays = {}
+        for fields, length in ((PLAYER_FIELDS, num_seats), (TILE_FIELDS, num_tiles)):
+            for field in fields:
+                self.arrays[field] = self.buffer[offset:offset + length]
+                offset += length
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def get(self, field):
+        return self.buffer[self.header[field]]
+
+    def publish(self, game_state):
+        """Write the current game state into shared memory."""
+        with self.lock:
+            buffer, header = self.buffer, self.header
+            buffer[header["sequence"]] += 1
+            try:
+                self._write(game_state)
+            finally:
+                buffer[header["sequence"]] += 1
+
+    def _write(self, game_state):
+        buffer, header, arrays = self.buffer, self.header, self.arrays
+        buffer[header["turn_number"]] = game_state.turn_number
+        buffer[header["phase"]] = PHASE_CODES[game_state.phase]
+        buffer[header["current_player_id"]] = game_state.current_player_id
+        buffer[header["decision_player_id"]] = _encode(game_state.decision_player_id)
+        buffer[header["trades_proposed_this_turn"]] = game_state.trades_proposed_this_turn
+        buffer[header["game_over"]] = int(game_state.game_over)
+
+        alive, cash, position = arrays["alive"], arrays["cash"], arrays["position"]
+        debt, creditor, bidder = arrays["debt"], arrays["creditor_id"], arrays["bidder"]
+        for player_id in range(self.num_seats):
+            player = game_state.players.get(player_id)
+            alive[player_id] = player is not None
+            bidder[player_id] = 0
+            if player is not None:
+                cash[player_id] = player.cash
+                position[player_id] = player.position
+                debt[player_id] = player.debt
+                creditor[player_id] = _encode(player.creditor_id)
+
+        owner, houses, mortgaged = arrays["owner"], arrays["houses"], arrays["mortgaged"]
+        trade_side, handle_order = arrays["trade_side"], arrays["handle_order"]
+        for tile in game_state.board:
+            tile_id = tile.tile_id
+            owner[tile_id] = _encode(getattr(tile, "owner", None))
+            houses[tile_id] = getattr(tile, "num_houses", 0)
+            mortgaged[tile_id] = getattr(tile, "mortgaged", False)
+            trade_side[tile_id] = 0
+            handle_order[tile_id] = 0
+
+        auction = game_state.auction_state
+        if auction is None:
+            buffer[header["auction_tile"]] = NONE
+        else:
+            buffer[header["auction_tile"]] = auction["tile_id"]
+            buffer[header["auction_current_bid"]] = auction.get("current_bid", 0)
+            buffer[header["auction_high_bidder"]] = _encode(auction.get("high_bidder"))
+            for player_id in auction.get("active_bidders") or auction.get("bidders"):
+                bidder[player_id] = 1
+
+        trade = game_state.pending_trade
+        if trade is None:
+            buffer[header["trade_from"]] = NONE
+        else:
+            buffer[header["trade_from"]] = trade["from_player"]
+            buffer[header["trade_to"]] = trade["to_player"]
+            buffer[header["trade_offer_cash"]] = trade["offer"]["cash"]
+            buffer[header["trade_request_cash"]] = trade["request"]["cash"]
+            for tile_id in trade["offer"]["properties"]:
+                trade_side[tile_id] = TRADE_OFFERED
+            for tile_id in trade["request"]["properties"]:
+                trade_side[tile_id] = TRADE_REQUESTED
+        for order, tile_id in enumerate(game_state.mortgaged_properties_to_handle, start=1):
+            handle_order[tile_id] = order
+
+    def close(self):
+        """Release this process's views of the block."""
+        for array in self.arrays.values():
+            array.release()
+        self.buffer.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Free the block (call once, from the process that created it)."""
+        self.shm.unlink()
+
+class SharedStateView:
+    """Worker-side reader that keeps a local GameState mirror in sync with shared memory."""
+
+    def __init__(self, name, num_seats, tile_data, max_turns, auction_mode=AuctionMode.ASCENDING):
+        """Attaches to a shared block and builds the mirror.
+
+        Args:
+            name: Name of the SharedGameState block.
+            num_seats: Number of players the game started with.
+            tile_data: The board the game is played on.
+            max_turns: The game's turn limit.
+            auction_mode: The game's auction mode.
+        """
+        self.shared = SharedGameState(num_seats, len(tile_data), name=name)
+        self.game_state = GameState(num_seats, tile_data, max_turns, auction_mode=auction_mode)
+
+    def sync(self, history=()):
+        """Refresh the mirror from shared memory and return it.
+
+        Args:
+            history: Recent event strings (not kept in shared memory).
+
+        Returns:
+            GameState: The mirror, matching the engine's state at the last publish.
+        """
+        shared = self.shared
+        while True:
+            sequence = shared.get("sequence")
+            if sequence % 2:
+                time.sleep(0) # a publish is in progress
+                continue
+            game_state = self._read(history)
+            if shared.get("sequence") == sequence:
+                return game_state
+
+    def _read(self, history):
+        shared, game_state = self.shared, self.game_state
+        arrays = shared.arrays
+        game_state.turn_number = shared.get("turn_number")
+        game_state.phase = PHASES[shared.get("phase")]
+        game_state.current_player_id = shared.get("current_player_id")
+        game_state.decision_player_id = _decode(shared.get("decision_player_id"))
+        game_state.trades_proposed_this_turn = shared.get("trades_proposed_this_turn")
+        game_state.game_over = bool(shared.get("game_over"))
+
+        for player_id in list(game_state.players):
+            if not arrays["alive"][player_id]:
+                del game_state.players[player_id]
+                game_state.seats.remove(player_id)
+        for player_id, player in game_state.players.items():
+            player.cash = arrays["cash"][player_id]
+            player.position = arrays["position"][player_id]
+            player.debt = arrays["debt"][player_id]
+            player.creditor_id = _decode(arrays["creditor_id"][player_id])
+
+        owner, houses, mortgaged = arrays["owner"], arrays["houses"], arrays["mortgaged"]
+        offered, requested, to_handle = [], [], []
+        for tile in game_state.board:
+            tile_id = tile.tile_id
+            if not hasattr(tile, "owner"):
+                continue
+            if tile.owner != _decode(owner[tile_id]):
+                set_owner(game_state, tile, _decode(owner[tile_id]))
+            if tile.mortgaged != bool(mortgaged[tile_id]):
+                set_mortgaged(game_state, tile, bool(mortgaged[tile_id]))
+            if hasattr(tile, "num_houses") and tile.num_houses != houses[tile_id]:
+                set_houses(game_state, tile, houses[tile_id])
+            if arrays["trade_side"][tile_id] == TRADE_OFFERED:
+                offered.append(tile_id)
+            elif arrays["trade_side"][tile_id] == TRADE_REQUESTED:
+                requested.append(tile_id)
+            if arrays["handle_order"][tile_id]:
+                to_handle.append((arrays["handle_order"][tile_id], tile_id))
+        game_state.mortgaged_properties_to_handle = [tile_id for _, tile_id in sorted(to_handle)]
+
+        auction_tile = _decode(shared.get("auction_tile"))
+        if auction_tile is None:
+            game_state.auction_state = None
+        else:
+            bidders = [p for p in game_state.seats if arrays["bidder"][p]]
+            if game_state.auction_mode in SEALED_AUCTION_MODES:
+                game_state.auction_state = {"tile_id": auction_tile, "mode": game_state.auction_mode, "bidders": bidders}
+            else:
+                high_bidder = _decode(shared.get("auction_high_bidder"))
+                game_state.auction_state = {
+                    "tile_id": auction_tile,
+                    "current_bid": shared.get("auction_current_bid"),
+                    "high_bidder": high_bidder,
+                    "active_bidders": SeatRing(bidders),
+                    "last_bidder": high_bidder,
+                }
+
+        trade_from = _decode(shared.get("trade_from"))
+        if trade_from is None:
+            game_state.pending_trade = None
+        else:
+            game_state.pending_trade = {
+                "from_player": trade_from,
+                "to_player": shared.get("trade_to"),
+                "offer": {"cash": shared.get("trade_offer_cash"), "properties": offered},
+                "request": {"cash": shared.get("trade_request_cash"), "properties": requested},
+            }
+        game_state.history = list(history)
+        return game_state
+
+    def close(self):
+        self.shared.close()
+
+def _worker_main(connection, shared_name, num_seats, tile_data, max_turns, auction_mode, agent_class, player_id, agent_kwargs):
+    """Worker process loop: answer "act" requests from the engine process until told to close."""
+    view = SharedStateView(shared_name, num_seats, tile_data, max_turns, auction_mode)
+    agent = resolve_agent_type(agent_class)(player_id, **agent_kwargs)
+    try:
+        while True:
+            message = connection.recv()
+            if message[0] == "act":
+                _, phase, history = message
+                game_state = view.sync(history)
+                connection.send(agent.act({"game_state": game_state, "phase": phase, "logger": None}))
+            elif message[0] == "describe":
+                connection.send(agent.describe())
+            elif message[0] == "close":
+                break
+    finally:
+        view.close()
+        connection.close()
+
+class ProcessAgent(BaseAgent):
+    """Runs an agent in its own worker process, reading the game through shared memory.
+
+    The wrapped agent is constructed inside the worker as ``agent_class(player_id, **agent_kwargs)``.
+    It is handed a mirror of the game state and no logger.
+    """
+
+    def __init__(self, player_id, shared, tile_data, agent_class, max_turns=1000, auction_mode=AuctionMode.ASCENDING, **agent_kwargs):
+        """Starts the worker process.
+
+        Args:
+            player_id: The ID of the player.
+            shared: The SharedGameState the engine publishes to.
+            tile_data: The board the game is played on.
+            agent_class: Agent class to run in the worker (must be importable there), or an
+                agent type name from agents.AGENT_TYPES.
+            max_turns: The game's turn limit.
+            auction_mode: The game's auction mode.
+            **agent_kwargs: Extra arguments for agent_class.
+        """
+        super().__init__(player_id)
+        self.shared = shared
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main,
+            args=(worker_connection, shared.name, shared.num_seats, tile_data, max_turns, auction_mode, agent_class, player_id, agent_kwargs),
+            daemon=True,
+        )
+        self.process.start()
+        worker_connection.close()
+        self.lock = threading.Lock()
+
+    def describe(self) -> dict:
+        with self.lock:
+            self.connection.send(("describe",))
+            return {**self.connection.recv(), "process": True}
+
+    def act(self, observation: dict) -> dict:
+        game_state = observation["game_state"]
+        self.shared.publish(game_state)
+        with self.lock:
+            self.connection.send(("act", observation["phase"], list(game_state.history)))
+            return self.connection.recv()
+
+    def close(self):
+        """Stop the worker process."""
+        if self.process.is_alive():
+            self.connection.send(("close",))
+            self.process.join()
+        self.connection.close()
@@ -0,0 +1,200 @@
+"""Sequential early stopping for agent-vs-agent evaluations.
+
+After every finished game of a pairing (a cell of the experiment matrix) the
+win/loss record of one seat is fed to a sequential test, and the pairing stops
+as soon as the test decides:
+
+- "better": the seat's win rate is above the tested level with the configured confidence;
+- "futile": the seat is, with the same confidence, not better than that level,
+  so more games would only confirm it.
+
+Two tests are available. ``SPRT`` is Wald's sequential probability ratio test of
+win rate p0 against p1, which has fixed error rates (alpha, beta) and needs few
+games when the true rate is far from the p0-p1 band. ``BayesianWinRate`` keeps a
+Beta posterior on the win rate and stops once the posterior probability of
+beating ``threshold`` (or failing to) reaches ``confidence``.
+
+Configured in an experiment spec with a ``[stopping]`` table, e.g.:
+
+    [stopping]
+    method = "sprt"     # or "bayes"
+    seat = 0            # lineup position whose wins are tested
+    p0 = 0.45
+    p1 = 0.55
+    alpha = 0.05
+    beta = 0.05
+    min_games = 10
+"""
+
+import math
+
+BETTER = "better"
+FUTILE = "futile"
+
+class SPRT:
+    """Wald's SPRT on a Bernoulli win rate: H0 p = p0 against H1 p = p1."""
+
+    def __init__(self, p0=0.45, p1=0.55, alpha=0.05, beta=0.05):
+        """Initializes the test.
+
+        Args:
+            p0: Win rate under H0 (accepting it stops the pairing as futile).
+            p1: Win rate under H1 (accepting it stops the pairing as better).
+            alpha: Probability of deciding "better" when the rate is p0.
+            beta: Probability of deciding "futile" when the rate is p1.
+        """
+        if not 0 < p0 < p1 < 1:
+            raise ValueError(f"SPRT needs 0 < p0 < p1 < 1, got p0={p0}, p1={p1}")
+        self.p0, self.p1, self.alpha, self.beta = p0, p1, alpha, beta
+        self.win_step = math.log(p1 / p0)
+        self.loss_step = math.log((1 - p1) / (1 - p0))
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+        self.wins = 0
+        self.games = 0
+        self.llr = 0.0
+
+    def update(self, win):
+        self.games += 1
+        self.wins += win
+        self.llr += self.win_step if win else self.loss_step
+
+    def decision(self):
+        if self.llr >= self.upper:
+            return BETTER
+        if self.llr <= self.lower:
+            return FUTILE
+        return None
+
+    def describe(self):
+        return {"method": "sprt", "p0": self.p0, "p1": self.p1, "alpha": self.alpha, "beta": self.beta,
+                "wins": self.wins, "games": self.games, "llr": round(self.llr, 4),
+                "bounds": [round(self.lower, 4), round(self.upper, 4)]}
+
+class BayesianWinRate:
+    """Beta posterior on a win rate, compared with a threshold."""
+
+    def __init__(self, threshold=0.5, confidence=0.95, prior=(1, 1)):
+        """Initializes the test.
+
+        Args:
+            threshold: Win rate the seat has to beat.
+            confidence: Posterior probability needed to stop either way.
+            prior: Beta prior (a, b) on the win rate; (1, 1) is uniform.
+        """
+        self.threshold, self.confidence = threshold, confidence
+        self.prior = tuple(prior)
+        self.wins = 0
+        self.games = 0
+
+    def update(self, win):
+        self.games += 1
+        self.wins += win
+
+    def prob_better(self):
+        """Posterior probability that the win rate is above the threshold."""
+        a = self.prior[0] + self.wins
+        b = self.prior[1] + self.games - self.wins
+        return 1.0 - beta_cdf(self.threshold, a, b)
+
+    def decision(self):
+        prob = self.prob_better()
+        if prob >= self.confidence:
+            return BETTER
+        if prob <= 1 - self.confidence:
+            return FUTILE
+        return None
+
+    def describe(self):
+        return {"method": "bayes", "threshold": self.threshold, "confidence": self.confidence,
+                "prior": list(self.prior), "wins": self.wins, "games": self.games,
+                "prob_better": round(self.prob_better(), 4)}
+
+TESTS = {"sprt": SPRT, "bayes": BayesianWinRate}
+
+def beta_cdf(x, a, b):
+    """Regularized incomplete beta function I_x(a, b), the CDF of Beta(a, b) at x."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    # The continued fraction converges quickly for x < (a + 1) / (a + b + 2); use the symmetry otherwise
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _beta_continued_fraction(x, a, b) / a
+    return 1.0 - math.exp(log_front) * _beta_continued_fraction(1 - x, b, a) / b
+
+def _beta_continued_fraction(x, a, b, max_iterations=200, eps=1e-12):
+    """Lentz's method for the continued fraction of the incomplete beta function."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, max_iterations + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs(d * c - 1.0) < eps:
+            break
+    return result
+
+class EarlyStopping:
+    """Runs one sequential test per matrix cell and tracks which cells have stopped."""
+
+    def __init__(self, method="sprt", seat=0, min_games=10, max_games=None, **test_kwargs):
+        """Initializes the controller.
+
+        Args:
+            method: "sprt" or "bayes".
+            seat: Lineup position whose wins are tested (its seat in unrotated games).
+            min_games: Games to play in a cell before it may stop.
+            max_games: Optional cap on games per cell (the cell stops undecided).
+            **test_kwargs: Arguments for the test (see SPRT and BayesianWinRate).
+        """
+        if method not in TESTS:
+            raise ValueError(f"Unknown stopping method: {method!r} (expected one of {sorted(TESTS)})")
+        self.method = method
+        self.seat = seat
+        self.min_games = min_games
+        self.max_games = max_games
+        self.test_kwargs = test_kwargs
+        TESTS[method](**test_kwargs) # Validate the arguments up front
+        self.tests = {}
+        self.decisions = {}
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Build the controller from a spec's [stopping] table, or None if it has none."""
+        settings = spec.get("stopping")
+        if not settings:
+            return None
+        return cls(**settings)
+
+    def stopped(self, cell):
+        return cell in self.decisions
+
+    def record(self, result):
+        """Feed a finished game (a games.jsonl record) to its cell's test.
+
+        Returns:
+            str: The cell's decision if this game stopped it, else None.
+        """
+        cell = result["cell"]
+        if cell in self.decisions or result["winner"] is None:
+            return None
+        test = self.tests.get(cell)
+        if test is None:
+            test = self.tests[cell] = TESTS[self.method](**self.test_kwargs)
+        test.update(result.get("winner_agent", result["winner"]) == self.seat)
+
+        decision = test.decision() if test.games >= self.min_games else None
+        if decision is None and self.max_games is not None and test.games >= self.max_games:
+            decision = "max_games"
+        if decision is not None:
+            self.decisions[cell] = {"decision": decision, "seat": self.seat, **test.describe()}
+        return decision
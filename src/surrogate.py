@@ -0,0 +1,558 @@
+"""Distill logged LLM decisions into a fast, CPU-only surrogate policy.
+
+Pipeline:
+    1. ``collect_decisions`` reads the ``decision`` events in ``results/*.jsonl``
+       (and, for games logged before those events existed, reconstructs the
+       state from the ``PROMPT:`` / ``API RESPONSE:`` pairs in the text log, matched
+       by the player each line is tagged with).
+    2. ``train_surrogate`` fits one multinomial logistic regression per phase on
+       the features from ``features.py`` and measures agreement with the LLM on
+       held-out games.
+    3. ``SurrogateAgent`` plays with the trained policy in microseconds per move.
+
+Usage:
+    python surrogate.py train ../results -o surrogate.json [--model gpt-4o-mini-2024-07-18]
+    python surrogate.py train ../results/dataset -o surrogate.json  (a trajectory_dataset.py dataset)
+    python surrogate.py eval surrogate.json ../results
+"""
+
+import argparse
+import ast
+import functools
+import json
+import math
+import random
+import re
+import time
+import zlib
+from pathlib import Path
+
+from agents import BaseAgent
+from blob_store import read_log_lines
+from engine import GameState, GamePhase, StreetTile, set_owner, set_mortgaged, set_houses
+from features import FEATURE_NAMES, CASH_SCALE, extract_features
+from legal_moves import forced_action, legal_actions, get_buildable_tiles, get_unmortgageable_tiles, get_mortgage_candidates
+from trade_search import find_trades
+
+SURROGATE_VERSION = 1
+
+# Maps LLM tool names (as they appear in text logs) to engine action types
+TOOL_ACTION_TYPES = {
+    "buy_property": "buy",
+    "skip_buy_property": "skip_buy",
+    "propose_trade": "propose_trade",
+    "accept_trade": "accept_trade",
+    "reject_trade": "reject_trade",
+    "proceed": "proceed",
+    "build_house": "build_house",
+    "mortgage_property": "mortgage_property",
+    "unmortgage_property": "unmortgage_property",
+    "resolve_mortgaged_trade": "resolve_mortgaged_trade",
+    "sell_house": "sell_house",
+    "place_bid": "place_bid",
+    "pass_auction": "pass_auction",
+}
+
+# Management phases share one model: the choice is the same at the start and end of a turn
+PHASE_GROUPS = {GamePhase.END_MANAGEMENT: GamePhase.START_MANAGEMENT}
+
+
+def action_label(action):
+    """Return the class label for an action (its type, or the decision for mortgaged trades)."""
+    if not action:
+        return None
+    if action["type"] == "resolve_mortgaged_trade":
+        return action["decision"]
+    return action["type"]
+
+
+def _make_record(game_id, model, phase, features, action):
+    label = action_label(action)
+    if label is None:
+        return None
+    bid_ratio = None
+    if label == "place_bid" and features.get("tile_cost"):
+        bid_ratio = action.get("bid_amount", 0) / (features["tile_cost"] * CASH_SCALE)
+    return {
+        "game_id": game_id,
+        "model": model,
+        "phase": PHASE_GROUPS.get(phase, phase),
+        "features": [features[name] for name in FEATURE_NAMES],
+        "label": label,
+        "bid_ratio": bid_ratio,
+    }
+
+
+def _records_from_events(path):
+    records = []
+    models = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("event") == "match_config":
+                models = {a["player_id"]: a.get("model") for a in event.get("agents", [])}
+            elif event.get("event") == "decision":
+                record = _make_record(path.stem, models.get(event["player_id"]), event["phase"], event["features"], event["action"])
+                if record:
+                    records.append(record)
+    return records
+
+
+PROMPT_RE = re.compile(r"^PROMPT(?: \(Player (\d+)\))?: ")
+API_RESPONSE_RE = re.compile(r"^API RESPONSE(?: \(Player (\d+)\))?: ")
+PROMPT_HEADER_RE = re.compile(r"^PROMPT(?: \(Player \d+\))?: You are Player (\d+)\. You have \$(-?\d+)\. It is your turn and the phase is '(\w+)'\.")
+TURN_LINE_RE = re.compile(r"^- Turn: (\d+)$")
+PLAYER_LINE_RE = re.compile(r"^- Player (\d+): Cash: \$(-?\d+), Position: (\d+), Properties: ")
+TILE_LINE_RE = re.compile(r"^- (.+?): \$(\d+) \((?:Owned by Player (\d+)|Unowned)\)(?: \[(.*)\])?$")
+HOUSES_RE = re.compile(r"(\d+) Houses")
+AUCTION_RE = re.compile(r"^An auction is being held for the property '(.+)'\.$")
+SEALED_RE = re.compile(r"^A sealed-bid auction is being held for the property '(.+)' ")
+CURRENT_BID_RE = re.compile(r"^The current bid is \$(\d+)\.$")
+TRADE_RE = re.compile(r"^Player (\d+) has proposed a trade\. They are offering \$(\d+) and the properties (\[.*?\]) in exchange for \$(\d+) and the properties (\[.*?\])\.$")
+MORTGAGED_TRADE_RE = re.compile(r"^You have received the mortgaged property '(.+)' in a trade\.")
+TOOL_CALL_RE = re.compile(r"ResponseFunctionToolCall\(arguments='(.*?)', call_id='[^']*', name='(\w+)'")
+
+
+def state_from_prompt(prompt_lines, tile_data, max_turns):
+    """Rebuild a GameState from the text of an LLMAgent prompt.
+
+    Only what the prompt shows is restored: cash, positions, ownership, houses,
+    mortgages, and the pending trade or auction. That is everything
+    ``extract_features`` needs.
+
+    Args:
+        prompt_lines: Lines of the prompt, the first one starting with "PROMPT: " (or "PROMPT (Player N): ")
+        tile_data: The board the game was played on
+        max_turns: The game's turn limit
+
+    Returns:
+        tuple: (GameState, deciding player ID, phase), or None if the prompt can't be parsed
+    """
+    header = PROMPT_HEADER_RE.match(prompt_lines[0])
+    if header is None:
+        return None
+    player_id, phase = int(header.group(1)), header.group(3)
+
+    players = {}
+    for line in prompt_lines:
+        if match := PLAYER_LINE_RE.match(line):
+            players[int(match.group(1))] = (int(match.group(2)), int(match.group(3)))
+    if player_id not in players:
+        return None
+
+    game_state = GameState(max(players) + 1, tile_data, max_turns)
+    for pid in list(game_state.players):
+        if pid not in players:
+            del game_state.players[pid]
+            game_state.seats.remove(pid)
+        else:
+            game_state.players[pid].cash, game_state.players[pid].position = players[pid]
+    tiles_by_name = {tile.name: tile for tile in game_state.board}
+
+    for line in prompt_lines[1:]:
+        if match := TURN_LINE_RE.match(line):
+            game_state.turn_number = int(match.group(1))
+        elif match := TILE_LINE_RE.match(line):
+            tile = tiles_by_name.get(match.group(1))
+            if tile is None or match.group(3) is None or int(match.group(3)) not in game_state.players:
+                continue
+            set_owner(game_state, tile, int(match.group(3)))
+            status = match.group(4) or ""
+            set_mortgaged(game_state, tile, "MORTGAGED" in status)
+            if isinstance(tile, StreetTile):
+                if "Hotel" in status:
+                    set_houses(game_state, tile, 5)
+                elif houses := HOUSES_RE.search(status):
+                    set_houses(game_state, tile, int(houses.group(1)))
+        elif match := AUCTION_RE.match(line):
+            game_state.auction_state = {"tile_id": tiles_by_name[match.group(1)].tile_id, "current_bid": 0,
+                                        "high_bidder": None, "active_bidders": game_state.seats.copy(), "last_bidder": None}
+        elif match := SEALED_RE.match(line):
+            game_state.auction_state = {"tile_id": tiles_by_name[match.group(1)].tile_id, "mode": "sealed_first_price",
+                                        "bidders": list(game_state.players)}
+        elif (match := CURRENT_BID_RE.match(line)) and game_state.auction_state:
+            game_state.auction_state["current_bid"] = int(match.group(1))
+        elif match := TRADE_RE.match(line):
+            game_state.pending_trade = {
+                "from_player": int(match.group(1)),
+                "to_player": player_id,
+                "offer": {"cash": int(match.group(2)), "properties": [tiles_by_name[n].tile_id for n in ast.literal_eval(match.group(3))]},
+                "request": {"cash": int(match.group(4)), "properties": [tiles_by_name[n].tile_id for n in ast.literal_eval(match.group(5))]},
+            }
+            game_state.decision_player_id = player_id
+        elif match := MORTGAGED_TRADE_RE.match(line):
+            game_state.mortgaged_properties_to_handle = [tiles_by_name[match.group(1)].tile_id]
+
+    game_state.phase = phase
+    return game_state, player_id, phase
+
+
+def _action_from_tool_call(name, arguments, game_state):
+    action_type = TOOL_ACTION_TYPES.get(name)
+    if action_type is None:
+        return None
+    args = json.loads(arguments) if arguments else {}
+    action = {"type": action_type}
+    if action_type == "place_bid":
+        action["bid_amount"] = args.get("bid_amount", 0)
+    elif action_type == "resolve_mortgaged_trade":
+        action["decision"] = args.get("decision")
+    return action
+
+
+def _records_from_text_log(path, tile_data, max_turns):
+    records = []
+    model = None
+    prompts = {}  # player ID (None in logs without player tags) -> lines of the player's open prompt
+    prompt_lines = None  # the prompt the current lines belong to
+    for line in read_log_lines(path):
+        if line.startswith("CONFIG: "):
+            try:
+                config = json.loads(line[len("CONFIG: "):])
+                models = {a.get("model") for a in config.get("agents", [])} - {None}
+                model = models.pop() if len(models) == 1 else None
+                max_turns = config.get("max_turns", max_turns)
+            except json.JSONDecodeError:
+                pass
+        elif match := PROMPT_RE.match(line):
+            player = None if match.group(1) is None else int(match.group(1))
+            prompt_lines = prompts[player] = [line]
+            if player is None and f"phase is '{GamePhase.SEALED_AUCTION}'" in line:
+                # Untagged sealed bids were logged concurrently, so their prompts and responses can't be paired
+                del prompts[player]
+                prompt_lines = None
+        elif match := API_RESPONSE_RE.match(line):
+            player = None if match.group(1) is None else int(match.group(1))
+            lines = prompts.pop(player, None)
+            prompt_lines = None
+            if not lines:
+                continue
+            try:
+                parsed = state_from_prompt(lines, tile_data, max_turns)
+            except KeyError:
+                parsed = None  # Prompt mentions tiles that aren't on this board
+            tool_call = TOOL_CALL_RE.search(line)
+            if parsed is None or tool_call is None:
+                continue
+            game_state, player_id, phase = parsed
+            action = _action_from_tool_call(tool_call.group(2), tool_call.group(1), game_state)
+            try:
+                features = extract_features(game_state, player_id, phase)
+            except (KeyError, IndexError, TypeError):
+                continue  # Prompt was missing context this phase needs
+            record = _make_record(path.stem, model, phase, features, action)
+            if record:
+                records.append(record)
+        elif prompt_lines is not None:
+            prompt_lines.append(line)
+    return records
+
+
+def collect_decisions(results_dir, model=None, tile_data=None, max_turns=30):
+    """Collect labelled decision records from a results directory.
+
+    Args:
+        results_dir: Directory with game logs.
+        model: Only keep decisions made by this model (None keeps all).
+        tile_data: Board used to rebuild states from text logs. Text logs are
+            skipped if not given.
+        max_turns: Turn limit assumed for text logs without a CONFIG line.
+
+    Returns:
+        list: Decision records with "game_id", "model", "phase", "features", "label", "bid_ratio"
+    """
+    results_dir = Path(results_dir)
+    records = []
+    games_with_events = set()
+    for path in sorted(results_dir.glob("*.jsonl")):
+        game_records = _records_from_events(path)
+        if game_records:
+            games_with_events.add(path.stem)
+            records.extend(game_records)
+    if tile_data is not None:
+        for path in sorted(results_dir.glob("*.log")):
+            if path.stem not in games_with_events:
+                records.extend(_records_from_text_log(path, tile_data, max_turns))
+    if model is not None:
+        records = [r for r in records if r["model"] == model]
+    return records
+
+
+def _is_holdout(game_id, holdout_fraction):
+    return (zlib.crc32(game_id.encode()) % 1000) < holdout_fraction * 1000
+
+
+def _softmax_scores(phase_model, x):
+    scores = []
+    for weights, bias in zip(phase_model["weights"], phase_model["bias"]):
+        scores.append(bias + sum(w * v for w, v in zip(weights, x)))
+    return scores
+
+
+def _standardize(phase_model, features):
+    return [(v - m) / s for v, m, s in zip(features, phase_model["mean"], phase_model["std"])]
+
+
+def predict_label(phase_model, features):
+    """Predict the class label for a raw (unstandardized) feature vector."""
+    classes = phase_model["classes"]
+    if len(classes) == 1:
+        return classes[0]
+    scores = _softmax_scores(phase_model, _standardize(phase_model, features))
+    return classes[max(range(len(classes)), key=scores.__getitem__)]
+
+
+def _fit_phase(records, epochs, learning_rate, l2, seed):
+    classes = sorted({r["label"] for r in records})
+    dim = len(FEATURE_NAMES)
+    n = len(records)
+    mean = [sum(r["features"][i] for r in records) / n for i in range(dim)]
+    std = []
+    for i in range(dim):
+        var = sum((r["features"][i] - mean[i]) ** 2 for r in records) / n
+        std.append(math.sqrt(var) if var > 1e-12 else 1.0)
+
+    bid_ratios = [r["bid_ratio"] for r in records if r["bid_ratio"] is not None]
+    phase_model = {
+        "classes": classes,
+        "mean": mean,
+        "std": std,
+        "weights": [[0.0] * dim for _ in classes],
+        "bias": [0.0] * len(classes),
+        "bid_ratio": sorted(bid_ratios)[len(bid_ratios) // 2] if bid_ratios else None,
+    }
+    if len(classes) == 1:
+        return phase_model
+
+    class_index = {c: i for i, c in enumerate(classes)}
+    data = [(_standardize(phase_model, r["features"]), class_index[r["label"]]) for r in records]
+    rng = random.Random(seed)
+    weights, bias = phase_model["weights"], phase_model["bias"]
+    for epoch in range(epochs):
+        rng.shuffle(data)
+        lr = learning_rate / (1 + epoch * 0.1)
+        for x, y in data:
+            scores = _softmax_scores(phase_model, x)
+            top = max(scores)
+            exps = [math.exp(s - top) for s in scores]
+            total = sum(exps)
+            for c in range(len(classes)):
+                grad = exps[c] / total - (1.0 if c == y else 0.0)
+                row = weights[c]
+                for i, v in enumerate(x):
+                    row[i] -= lr * (grad * v + l2 * row[i])
+                bias[c] -= lr * grad
+    return phase_model
+
+
+def agreement_rate(phase_model, records):
+    """Fraction of records where the surrogate picks the same label as the logged agent."""
+    if not records:
+        return None
+    return sum(predict_label(phase_model, r["features"]) == r["label"] for r in records) / len(records)
+
+
+def train_surrogate(records, holdout_fraction=0.2, epochs=30, learning_rate=0.1, l2=1e-4, seed=0):
+    """Train one softmax-regression policy per phase.
+
+    Games, not individual decisions, are split between training and holdout so
+    agreement is measured on positions from games the model has not seen.
+
+    Args:
+        records: Decision records from ``collect_decisions``.
+        holdout_fraction: Fraction of games held out for agreement measurement.
+        epochs: SGD passes over each phase's training set.
+        learning_rate: Initial SGD step size.
+        l2: L2 regularization strength.
+        seed: Shuffling seed.
+
+    Returns:
+        dict: JSON-serializable surrogate policy
+    """
+    by_phase = {}
+    for record in records:
+        by_phase.setdefault(record["phase"], []).append(record)
+
+    policy = {
+        "version": SURROGATE_VERSION,
+        "feature_names": FEATURE_NAMES,
+        "source_models": sorted({r["model"] for r in records if r["model"]}),
+        "phases": {},
+    }
+    for phase, phase_records in sorted(by_phase.items()):
+        train = [r for r in phase_records if not _is_holdout(r["game_id"], holdout_fraction)]
+        holdout = [r for r in phase_records if _is_holdout(r["game_id"], holdout_fraction)]
+        if not train:
+            train, holdout = holdout, []
+        phase_model = _fit_phase(train, epochs, learning_rate, l2, seed)
+        phase_model["n_train"] = len(train)
+        phase_model["n_holdout"] = len(holdout)
+        phase_model["train_agreement"] = agreement_rate(phase_model, train)
+        phase_model["holdout_agreement"] = agreement_rate(phase_model, holdout)
+        policy["phases"][phase] = phase_model
+    return policy
+
+
+@functools.lru_cache(maxsize=8)
+def load_surrogate(path):
+    """Load a trained surrogate policy (cached per path)."""
+    with open(path, encoding="utf-8") as f:
+        policy = json.load(f)
+    if policy.get("feature_names") != FEATURE_NAMES:
+        raise ValueError(f"{path} was trained on a different feature set; retrain it")
+    return policy
+
+
+class SurrogateAgent(BaseAgent):
+    """An agent that imitates a logged LLM with a per-phase softmax-regression policy."""
+
+    def __init__(self, player_id, policy=None, policy_path=None, seed=0):
+        """Initializes the agent.
+
+        Args:
+            player_id: The ID of the player.
+            policy: A policy dict as returned by ``train_surrogate``.
+            policy_path: Path to a saved policy, used if ``policy`` is not given.
+            seed: The seed for the random number generator.
+        """
+        super().__init__(player_id, seed)
+        self.policy = policy if policy is not None else load_surrogate(str(policy_path))
+
+    def describe(self) -> dict:
+        return {
+            **super().describe(),
+            "imitates": self.policy["source_models"],
+            "holdout_agreement": {phase: m["holdout_agreement"] for phase, m in self.policy["phases"].items()},
+        }
+
+    def decide_to_buy(self, observation: dict) -> dict:
+        # Only reached when the policy has no model for this phase
+        return legal_actions(observation["game_state"], self.player_id, observation["phase"])[0]
+
+    def act(self, observation: dict) -> dict:
+        phase = observation["phase"]
+        if phase == "roll_phase":
+            return {"type": "roll"}
+        elif phase == "end_turn":
+            return {"type": "end_turn"}
+
+        game_state = observation["game_state"]
+        action = forced_action(game_state, self.player_id, phase)
+        if action is not None:
+            return action
+
+        phase_model = self.policy["phases"].get(PHASE_GROUPS.get(phase, phase))
+        if phase_model is not None:
+            features = extract_features(game_state, self.player_id, phase)
+            label = predict_label(phase_model, [features[name] for name in FEATURE_NAMES])
+            action = self._action_for_label(label, game_state, phase, phase_model)
+            if action is not None:
+                return action
+        return super().act(observation)
+
+    def _action_for_label(self, label, game_state, phase, phase_model):
+        """Turn a predicted label into a concrete legal action, or None if it isn't legal."""
+        player = game_state.players[self.player_id]
+
+        if phase in (GamePhase.START_MANAGEMENT, GamePhase.END_MANAGEMENT):
+            if label == "build_house":
+                for tile_id in get_buildable_tiles(game_state, self.player_id):
+                    if player.cash >= game_state.board[tile_id].house_cost:
+                        return {"type": "build_house", "tile_id": tile_id}
+            elif label == "unmortgage_property":
+                tiles = get_unmortgageable_tiles(game_state, self.player_id)
+                if tiles:
+                    return {"type": "unmortgage_property", "tile_id": tiles[0]}
+            elif label == "mortgage_property":
+                tiles = get_mortgage_candidates(game_state, self.player_id)
+                if tiles:
+                    return {"type": "mortgage_property", "tile_id": tiles[0]}
+            elif label == "propose_trade" and game_state.trades_proposed_this_turn < 1:
+                # The policy only predicts that a trade is wanted; take the terms from the trade search
+                trades = find_trades(game_state, self.player_id, k=1)
+                if trades:
+                    return trades[0]["action"]
+            return {"type": "proceed"}
+
+        actions = legal_actions(game_state, self.player_id, phase) or []
+        for action in actions:
+            if action["type"] == "place_bid" and label == "place_bid":
+                tile = game_state.board[game_state.auction_state["tile_id"]]
+                ratio = phase_model.get("bid_ratio") or 1.0
+                amount = min(max(round(ratio * tile.cost), action["min_bid"]), action["max_bid"])
+                return {"type": "place_bid", "bid_amount": amount}
+            if action_label(action) == label:
+                return action
+        return None
+
+
+def _evaluate(policy, records):
+    print(f"{'phase':<24}{'n':>7}{'agreement':>12}")
+    for phase, phase_model in sorted(policy["phases"].items()):
+        phase_records = [r for r in records if r["phase"] == phase]
+        rate = agreement_rate(phase_model, phase_records)
+        print(f"{phase:<24}{len(phase_records):>7}{'-' if rate is None else f'{rate:.3f}':>12}")
+    if records:
+        start = time.perf_counter()
+        for r in records:
+            phase_model = policy["phases"].get(r["phase"])
+            if phase_model:
+                predict_label(phase_model, r["features"])
+        elapsed = time.perf_counter() - start
+        print(f"\nMean prediction latency: {elapsed / len(records) * 1e6:.1f} us")
+
+
+def _collect(results_dir, model, tile_data):
+    """Decision records from a results directory or a trajectory_dataset.py dataset."""
+    from trajectory_dataset import TrajectoryDataset, is_dataset
+    if is_dataset(results_dir):
+        dataset = TrajectoryDataset(results_dir)
+        return dataset.records(dataset.select(model=model) if model is not None else None)
+    return collect_decisions(results_dir, model, tile_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate a surrogate policy from logged LLM decisions.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subparsers.add_parser("train")
+    train_parser.add_argument("results_dir", help="Results directory, or a dataset built by trajectory_dataset.py")
+    train_parser.add_argument("-o", "--output", default="surrogate.json")
+    train_parser.add_argument("--model", help="Only learn from decisions made by this model.")
+    train_parser.add_argument("--epochs", type=int, default=30)
+    train_parser.add_argument("--no-text-logs", action="store_true", help="Only use structured decision events.")
+    train_parser.add_argument("--board", help="Board the text logs were played on (defaults to config.board).")
+
+    eval_parser = subparsers.add_parser("eval")
+    eval_parser.add_argument("policy")
+    eval_parser.add_argument("results_dir")
+    eval_parser.add_argument("--model")
+    eval_parser.add_argument("--board", help="Board the text logs were played on (defaults to config.board).")
+
+    args = parser.parse_args()
+    tile_data = None
+    if not getattr(args, "no_text_logs", False):
+        from boards import load_board
+        from config import board
+        tile_data = load_board(args.board or board).tile_data
+
+    if args.command == "train":
+        records = _collect(args.results_dir, args.model, tile_data)
+        policy = train_surrogate(records, epochs=args.epochs)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(policy, f)
+        print(f"Trained on {len(records)} decisions; saved to {args.output}\n")
+        for phase, phase_model in sorted(policy["phases"].items()):
+            holdout = phase_model["holdout_agreement"]
+            print(f"{phase:<24} train={phase_model['n_train']:<6} holdout={phase_model['n_holdout']:<6} "
+                  f"agreement={'-' if holdout is None else f'{holdout:.3f}'}")
+    else:
+        policy = load_surrogate(args.policy)
+        _evaluate(policy, _collect(args.results_dir, args.model, tile_data))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Enumerate and score property trades between players.
+
+Candidate trades swap up to ``max_request`` of the receiver's properties for up
+to ``max_offer`` of the proposer's, balanced with cash. Each side values its
+holdings as asset value plus expected rent income over the rest of the game,
+computed from the board definition with the ownership bitmasks. Trades are kept
+only if both sides gain by their own measure (so the receiver has a reason to
+accept), and ranked by set completion and by the proposer's gain net of the
+extra rent the receiver will collect from them.
+
+Streets in a completed color set are valued at their DEVELOPED_HOUSES rent,
+since a monopoly is worth what can be built on it. Every tile is assumed to be
+landed on once per board length of opponent moves.
+
+Rent only depends on what a player holds within a tile's group (its color set,
+the railroads, or the tile itself for utilities), so a holding is valued group
+by group and group values are cached for the duration of a search.
+"""
+
+import heapq
+from itertools import combinations
+
+from engine import StreetTile, RailroadTile, railroad_rent, tiles_in_mask
+from legal_moves import unmortgage_cost
+
+DEVELOPED_HOUSES = 3
+HORIZON_CAP = 20 # rounds of rent to count, at most
+CASH_STEP = 10
+
+def landing_rent(game_state, tile, owned_mask):
+    """Rent an opponent can expect to pay on landing on a tile whose owner holds owned_mask."""
+    if isinstance(tile, StreetTile):
+        set_mask = game_state.color_set_masks[tile.color_set]
+        if owned_mask & set_mask != set_mask:
+            return tile.rent
+        houses = max(tile.num_houses, DEVELOPED_HOUSES)
+        return (tile.rent_monopoly, tile.rent_one_house, tile.rent_two_houses, tile.rent_three_houses,
+                tile.rent_four_houses, tile.rent_hotel)[houses]
+    if isinstance(tile, RailroadTile):
+        return railroad_rent((owned_mask & game_state.railroad_mask).bit_count(), tile.rent)
+    return tile.rent
+
+def asset_value(tile):
+    """What a property is worth to hold: its cost, less the cost of lifting any mortgage."""
+    return tile.cost - unmortgage_cost(tile) if tile.mortgaged else tile.cost
+
+def group_mask(game_state, tile):
+    """Mask of the tiles whose ownership affects this tile's rent."""
+    if isinstance(tile, StreetTile):
+        return game_state.color_set_masks[tile.color_set]
+    if isinstance(tile, RailroadTile):
+        return game_state.railroad_mask
+    return 1 << tile.tile_id
+
+def rent_horizon(game_state):
+    """Expected landings on a tile by one opponent over the remaining (capped) game."""
+    rounds = min(max(game_state.max_turns - game_state.turn_number, 1), HORIZON_CAP)
+    return rounds / len(game_state.board)
+
+class _HoldingValues:
+    """Cached (asset value, rent per landing) of holding a set of tiles within one group."""
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.cache = {0: (0, 0)}
+
+    def group(self, bits):
+        value = self.cache.get(bits)
+        if value is None:
+            board = self.game_state.board
+            assets = rent = 0
+            for tile_id in tiles_in_mask(bits):
+                assets += asset_value(board[tile_id])
+                rent += landing_rent(self.game_state, board[tile_id], bits)
+            value = self.cache[bits] = (assets, rent)
+        return value
+
+    def delta(self, before_mask, after_mask, groups):
+        """(asset delta, rent-per-landing delta) of going from before_mask to after_mask,
+        given the groups touched by the change."""
+        cache = self.cache
+        assets = rent = 0
+        for mask in groups:
+            after = cache.get(after_mask & mask) or self.group(after_mask & mask)
+            before = cache.get(before_mask & mask) or self.group(before_mask & mask)
+            assets += after[0] - before[0]
+            rent += after[1] - before[1]
+        return assets, rent
+
+def _tradable_mask(game_state, player):
+    """Tiles a player can trade: no houses on them or anywhere in their color set."""
+    blocked = 0
+    for tile_id in tiles_in_mask(player.owned_mask & game_state.developed_mask):
+        blocked |= game_state.color_set_masks[game_state.board[tile_id].color_set]
+    return player.owned_mask & ~blocked
+
+def _wanted_tiles(game_state, holder, tradable_mask):
+    """Tiles from tradable_mask that would help holder: ones sharing a color set with
+    holder's streets, or railroads when holder already has one. Falls back to all of them."""
+    board = game_state.board
+    wanted = 0
+    for tile_id in tiles_in_mask(tradable_mask):
+        tile = board[tile_id]
+        if isinstance(tile, StreetTile) and holder.owned_mask & game_state.color_set_masks[tile.color_set]:
+            wanted |= 1 << tile_id
+        elif isinstance(tile, RailroadTile) and holder.owned_mask & game_state.railroad_mask:
+            wanted |= 1 << tile_id
+    return list(tiles_in_mask(wanted or tradable_mask))
+
+def _bundles(game_state, tile_ids, max_size, include_empty=False):
+    """Every bundle of up to max_size tiles, as (tile IDs, mask, touched group masks)."""
+    bundles = [((), 0, frozenset())] if include_empty else []
+    for size in range(1, max_size + 1):
+        for combo in combinations(tile_ids, size):
+            mask = 0
+            for tile_id in combo:
+                mask |= 1 << tile_id
+            groups = frozenset(group_mask(game_state, game_state.board[tile_id]) for tile_id in combo)
+            bundles.append((combo, mask, groups))
+    return bundles
+
+def find_trades(game_state, proposer_id, k=5, max_request=2, max_offer=1, receiver_share=0.25, to_players=None):
+    """Find the k best trades a player could propose.
+
+    Cash splits the combined gain so the receiver keeps receiver_share of it.
+    Trades that either side can't pay for, or that have no combined gain, are skipped.
+
+    Args:
+        game_state: GameState object containing the game state
+        proposer_id: ID of the proposing player
+        k: Number of trades to return
+        max_request: Most properties to ask for in one trade
+        max_offer: Most properties to give in one trade
+        receiver_share: Fraction of the combined gain left to the receiver
+        to_players: Receivers to consider (default: every other player)
+
+    Returns:
+        list: Dicts with "action" (a propose_trade action), "score" (the proposer's
+            gain net of rent the receiver gains from them), "proposer_gain",
+            "receiver_gain" and "completes" (color sets the proposer completes), best first
+    """
+    proposer = game_state.players[proposer_id]
+    proposer_tradable = _tradable_mask(game_state, proposer)
+    per_opponent = rent_horizon(game_state)
+    all_opponents = per_opponent * (len(game_state.players) - 1)
+    values = _HoldingValues(game_state)
+    completed_before = {c for c, m in game_state.color_set_masks.items() if proposer.owned_mask & m == m}
+
+    candidates = []
+    for receiver_id in (to_players if to_players is not None else game_state.players):
+        if receiver_id == proposer_id or receiver_id not in game_state.players:
+            continue
+        receiver = game_state.players[receiver_id]
+        receiver_tradable = _tradable_mask(game_state, receiver)
+        if not receiver_tradable:
+            continue
+        requests = _bundles(game_state, _wanted_tiles(game_state, proposer, receiver_tradable), max_request)
+        offers = _bundles(game_state, _wanted_tiles(game_state, receiver, proposer_tradable), max_offer, include_empty=True)
+        for request, request_mask, request_groups in requests:
+            for offer, offer_mask, offer_groups in offers:
+                groups = request_groups | offer_groups
+                proposer_after = (proposer.owned_mask & ~offer_mask) | request_mask
+                receiver_after = (receiver.owned_mask & ~request_mask) | offer_mask
+                proposer_assets, proposer_rent = values.delta(proposer.owned_mask, proposer_after, groups)
+                receiver_assets, receiver_rent = values.delta(receiver.owned_mask, receiver_after, groups)
+                proposer_gain = proposer_assets + proposer_rent * all_opponents
+                receiver_gain = receiver_assets + receiver_rent * all_opponents
+                surplus = proposer_gain + receiver_gain
+                if surplus <= 0:
+                    continue
+
+                # Positive cash flows from proposer to receiver
+                cash = round((receiver_share * surplus - receiver_gain) / CASH_STEP) * CASH_STEP
+                cash = max(-receiver.cash, min(cash, proposer.cash))
+                proposer_gain -= cash
+                receiver_gain += cash
+                score = proposer_gain - max(receiver_rent, 0) * per_opponent
+                if score <= 0 or receiver_gain < 0:
+                    continue
+
+                completes = [c for c, m in game_state.color_set_masks.items() if proposer_after & m == m and c not in completed_before]
+                candidates.append({
+                    "action": {
+                        "type": "propose_trade",
+                        "to_player": receiver_id,
+                        "offer": {"cash": max(cash, 0), "properties": list(offer)},
+                        "request": {"cash": max(-cash, 0), "properties": list(request)},
+                    },
+                    "score": score,
+                    "proposer_gain": proposer_gain,
+                    "receiver_gain": receiver_gain,
+                    "completes": completes,
+                })
+
+    return heapq.nlargest(k, candidates, key=lambda c: (bool(c["completes"]), c["score"]))
+
+def find_all_trades(game_state, k=5, **kwargs):
+    """Find the k best trades for every player.
+
+    Returns:
+        dict: Player ID -> list of trades as returned by find_trades
+    """
+    return {player_id: find_trades(game_state, player_id, k, **kwargs) for player_id in game_state.players}
+
+def describe_trade(game_state, trade):
+    """One-line description of a trade from find_trades, for prompts and logs."""
+    action = trade["action"]
+    board = game_state.board
+
+    def items(side):
+        parts = [board[t].name for t in side["properties"]]
+        if side["cash"]:
+            parts.insert(0, f"${side['cash']}")
+        return ", ".join(parts) if parts else "nothing"
+
+    text = f"Give {items(action['offer'])} to Player {action['to_player']} for {items(action['request'])}"
+    if trade["completes"]:
+        text += f" (completes {', '.join(trade['completes'])})"
+    return text
@@ -0,0 +1,321 @@
+"""Memory-mapped dataset of logged decisions, for training and analysis at scale.
+
+Parsing the JSONL event files is CPU-bound and keeps every record in memory.
+``build_dataset`` converts the ``decision`` events of a results archive once into
+fixed-dtype column files, one row per step, and ``TrajectoryDataset`` maps them
+back with ``numpy.memmap``. A read then only touches the pages it needs:
+
+    features    float32 (N, len(FEATURE_NAMES))  the features.py vector of the decision
+    label       uint8   (N,)   action label (see surrogate.action_label), index into meta["labels"]
+    bid_ratio   float32 (N,)   bid / tile cost for bids, NaN otherwise
+    phase       uint8   (N,)   index into meta["phases"]
+    player      uint8   (N,)   deciding seat
+    game        uint32  (N,)   index into meta["games"]
+    model       uint16  (N,)   index into meta["models"] ("" for agents without a model)
+    agent_type  uint16  (N,)   index into meta["agent_types"]
+    won         int8    (N,)   1 if the deciding player won the game, 0 if not, -1 if it did not finish
+
+Steps are stored game by game, and ``game_offsets`` (G + 1 int64) holds where each
+game's steps start, so a game is a contiguous slice:
+
+    dataset = TrajectoryDataset("../results/dataset")
+    dataset.game(12)["features"]                     # (steps, features) view
+    steps = dataset.select(model="gpt-4o-mini-2024-07-18", phase="decide_to_buy")
+    for batch in dataset.minibatches(256, steps, seed=0):
+        train_step(batch["features"], batch["label"])
+
+Usage:
+    python trajectory_dataset.py build ../results [more dirs...] -o ../results/dataset
+    python trajectory_dataset.py info ../results/dataset
+
+Needs NumPy (``pip install 'monopoly-bench[rl]'``).
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("trajectory_dataset needs NumPy: pip install 'monopoly-bench[rl]'") from e
+
+from features import FEATURE_NAMES, CASH_SCALE
+from surrogate import PHASE_GROUPS, action_label
+
+DATASET_VERSION = 1
+META_FILE = "meta.json"
+SUMMARY_FILES = ("games.jsonl",) # experiment summaries, not event files
+
+COLUMNS = {
+    "features": ("float32", len(FEATURE_NAMES)),
+    "label": ("uint8", None),
+    "bid_ratio": ("float32", None),
+    "phase": ("uint8", None),
+    "player": ("uint8", None),
+    "game": ("uint32", None),
+    "model": ("uint16", None),
+    "agent_type": ("uint16", None),
+    "won": ("int8", None),
+}
+
+class _Vocabulary:
+    """Assigns small integer codes to strings in the order they are first seen."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: i for i, value in enumerate(self.values)}
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+def _game_steps(path):
+    """The decision steps of one event file, as (player, phase, label, bid_ratio, features, model, agent_type, won)."""
+    agents = {}
+    decisions = []
+    winner = None
+    finished = False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue # Truncated final line of a game that is still running
+            kind = event.get("event")
+            if kind == "decision":
+                decisions.append(event)
+            elif kind == "match_config":
+                agents = {a["player_id"]: a for a in event.get("agents", [])}
+            elif kind == "final_standing" and event["rank"] == 0: # ranks count from 0
+                winner = event["player_id"]
+            elif kind == "game_over":
+                finished = True
+
+    steps = []
+    for event in decisions:
+        label = action_label(event["action"])
+        if label is None:
+            continue
+        features = event["features"]
+        bid_ratio = float("nan")
+        if label == "place_bid" and features.get("tile_cost"):
+            bid_ratio = event["action"].get("bid_amount", 0) / (features["tile_cost"] * CASH_SCALE)
+        agent = agents.get(event["player_id"], {})
+        won = -1 if not finished else int(event["player_id"] == winner)
+        steps.append((event["player_id"], PHASE_GROUPS.get(event["phase"], event["phase"]), label, bid_ratio,
+                      [features[name] for name in FEATURE_NAMES], agent.get("model") or "", agent.get("type", ""), won))
+    return steps
+
+def _event_files(results_dirs):
+    for results_dir in results_dirs:
+        for path in sorted(Path(results_dir).rglob("*.jsonl")):
+            if path.name not in SUMMARY_FILES:
+                yield path
+
+def build_dataset(results_dirs, output_dir, chunk_steps=65536):
+    """Convert the decision events under results directories into a memory-mapped dataset.
+
+    Files are streamed and columns written in chunks, so memory use does not grow
+    with the archive. An existing dataset in output_dir is replaced.
+
+    Args:
+        results_dirs: Directories searched (recursively) for ``.jsonl`` event files.
+        output_dir: Dataset directory.
+        chunk_steps: Steps buffered before a write.
+
+    Returns:
+        TrajectoryDataset: The new dataset.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    vocabularies = {name: _Vocabulary() for name in ("phases", "labels", "models", "agent_types")}
+    vocabularies["models"].code("")
+    games, offsets = [], [0]
+    files = {name: open(output_dir / f"{name}.bin", "wb") for name in COLUMNS}
+    buffer = {name: [] for name in COLUMNS}
+
+    def flush():
+        for name, (dtype, _) in COLUMNS.items():
+            np.asarray(buffer[name], dtype=dtype).tofile(files[name])
+            buffer[name].clear()
+
+    try:
+        for path in _event_files(results_dirs):
+            steps = _game_steps(path)
+            if not steps:
+                continue
+            game = len(games)
+            games.append(path.stem)
+            for player, phase, label, bid_ratio, features, model, agent_type, won in steps:
+                buffer["features"].append(features)
+                buffer["label"].append(vocabularies["labels"].code(label))
+                buffer["bid_ratio"].append(bid_ratio)
+                buffer["phase"].append(vocabularies["phases"].code(phase))
+                buffer["player"].append(player)
+                buffer["game"].append(game)
+                buffer["model"].append(vocabularies["models"].code(model))
+                buffer["agent_type"].append(vocabularies["agent_types"].code(agent_type))
+                buffer["won"].append(won)
+            offsets.append(offsets[-1] + len(steps))
+            if len(buffer["label"]) >= chunk_steps:
+                flush()
+        flush()
+    finally:
+        for f in files.values():
+            f.close()
+
+    np.asarray(offsets, dtype="int64").tofile(output_dir / "game_offsets.bin")
+    meta = {
+        "version": DATASET_VERSION,
+        "num_steps": offsets[-1],
+        "num_games": len(games),
+        "feature_names": FEATURE_NAMES,
+        "columns": {name: dtype for name, (dtype, _) in COLUMNS.items()},
+        "games": games,
+        **{name: vocabulary.values for name, vocabulary in vocabularies.items()},
+    }
+    with open(output_dir / META_FILE, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return TrajectoryDataset(output_dir)
+
+class TrajectoryDataset:
+    """Read-only, memory-mapped view of a dataset written by ``build_dataset``."""
+
+    def __init__(self, path):
+        """Maps a dataset directory.
+
+        Raises:
+            ValueError: If the dataset was built by another version or for another feature set.
+        """
+        self.path = Path(path)
+        with open(self.path / META_FILE, encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != DATASET_VERSION or self.meta.get("feature_names") != FEATURE_NAMES:
+            raise ValueError(f"{self.path} was built by another version or for another feature set; rebuild it")
+        self.num_steps = self.meta["num_steps"]
+        self.num_games = self.meta["num_games"]
+        self.columns = {name: self._map(f"{name}.bin", dtype, (self.num_steps, width) if width else (self.num_steps,))
+                        for name, (dtype, width) in COLUMNS.items()}
+        self.game_offsets = self._map("game_offsets.bin", "int64", (self.num_games + 1,))
+
+    def _map(self, name, dtype, shape):
+        if not shape[0]:
+            return np.empty(shape, dtype=dtype) # memmap cannot map an empty file
+        return np.memmap(self.path / name, dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return self.num_steps
+
+    def __getitem__(self, index):
+        """Columns at a step index, slice or index array (sorted indices read fastest)."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def game(self, game):
+        """Columns of one game's steps (views into the maps)."""
+        return self[int(self.game_offsets[game]):int(self.game_offsets[game + 1])]
+
+    def game_steps(self, games):
+        """Step indices of the given games, in order."""
+        starts, ends = self.game_offsets[np.asarray(games)], self.game_offsets[np.asarray(games) + 1]
+        if not len(starts):
+            return np.empty(0, dtype="int64")
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+
+    def _codes(self, vocabulary, values):
+        if isinstance(values, str):
+            values = [values]
+        codes = self.meta[vocabulary]
+        return [codes.index(value) for value in values if value in codes]
+
+    def select(self, model=None, agent_type=None, phase=None, label=None, games=None):
+        """Indices of the steps matching every given filter.
+
+        Args:
+            model: Model name, or a list of them.
+            agent_type: Agent type (e.g. "LLMAgent"), or a list of them.
+            phase: Phase, or a list of them.
+            label: Action label, or a list of them.
+            games: Game indices to restrict to.
+
+        Returns:
+            numpy.ndarray: Sorted int64 step indices.
+        """
+        mask = np.ones(self.num_steps, dtype=bool)
+        for column, vocabulary, values in (("model", "models", model), ("agent_type", "agent_types", agent_type),
+                                           ("phase", "phases", phase), ("label", "labels", label)):
+            if values is not None:
+                mask &= np.isin(self.columns[column], self._codes(vocabulary, values))
+        indices = np.flatnonzero(mask)
+        if games is not None:
+            indices = np.intersect1d(indices, self.game_steps(games), assume_unique=True)
+        return indices
+
+    def minibatches(self, batch_size, indices=None, shuffle=True, seed=None, drop_last=False):
+        """Yield batches of columns over the steps, in a shuffled order.
+
+        Each batch's indices are sorted before reading so the maps are read front to
+        back; the batch's rows come out in that order.
+
+        Args:
+            batch_size: Steps per batch.
+            indices: Steps to draw from (defaults to all).
+            shuffle: Whether to shuffle the steps between batches.
+            seed: Shuffling seed.
+            drop_last: Whether to skip a final batch smaller than batch_size.
+        """
+        indices = np.arange(self.num_steps) if indices is None else np.asarray(indices)
+        if shuffle:
+            indices = np.random.default_rng(seed).permutation(indices)
+        end = len(indices) - len(indices) % batch_size if drop_last else len(indices)
+        for start in range(0, end, batch_size):
+            yield self[np.sort(indices[start:start + batch_size])]
+
+    def records(self, indices=None):
+        """Decision records in the format of ``surrogate.collect_decisions``, for ``train_surrogate``."""
+        indices = np.arange(self.num_steps) if indices is None else np.asarray(indices)
+        meta = self.meta
+        records = []
+        for start in range(0, len(indices), 65536):
+            batch = self[indices[start:start + 65536]]
+            for i in range(len(batch["label"])):
+                bid_ratio = float(batch["bid_ratio"][i])
+                records.append({
+                    "game_id": meta["games"][batch["game"][i]],
+                    "model": meta["models"][batch["model"][i]] or None,
+                    "phase": meta["phases"][batch["phase"][i]],
+                    "features": batch["features"][i].tolist(),
+                    "label": meta["labels"][batch["label"][i]],
+                    "bid_ratio": None if bid_ratio != bid_ratio else bid_ratio,
+                })
+        return records
+
+def is_dataset(path):
+    """Whether a directory holds a dataset written by ``build_dataset``."""
+    return (Path(path) / META_FILE).exists()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a memory-mapped decision dataset.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Convert the decision events under results directories")
+    build.add_argument("results_dirs", nargs="+")
+    build.add_argument("-o", "--output", required=True, help="Dataset directory")
+    info = subparsers.add_parser("info", help="Summarize a dataset")
+    info.add_argument("dataset")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        dataset = build_dataset(args.results_dirs, args.output)
+        print(f"Wrote {dataset.num_steps} steps from {dataset.num_games} games to {args.output}")
+        return
+    dataset = TrajectoryDataset(args.dataset)
+    print(f"{dataset.num_steps} steps in {dataset.num_games} games")
+    for column, vocabulary in (("model", "models"), ("agent_type", "agent_types"), ("phase", "phases"), ("label", "labels")):
+        counts = np.bincount(dataset.columns[column], minlength=len(dataset.meta[vocabulary]))
+        print(f"{column}: " + ", ".join(f"{value or '-'}={count}" for value, count in zip(dataset.meta[vocabulary], counts) if count))
+
+if __name__ == "__main__":
+    main()
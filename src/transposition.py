@@ -0,0 +1,85 @@
+"""Bounded transposition table keyed by Zobrist hashes of game states.
+
+Rollout evaluators hit the same positions over and over (every rollout starts
+from the state being evaluated, and adjudication re-checks a position that no
+decision has changed). A ``TranspositionTable`` maps ``GameState.zobrist`` plus
+the evaluation settings to the cached result, so those repeats are free:
+
+    table = TranspositionTable(max_entries=10000)
+    estimate_equity(game_state, n_rollouts=200, table=table)
+    table.stats()  # {"entries", "hits", "misses", "hit_rate", ...}
+
+The table is bounded. When it is full the least recently used entry is
+evicted. An entry is only replaced by a result for the same key if the new one
+is at least as deep (for equity estimates, played at least as many rollouts),
+so a cheap estimate never overwrites a better one.
+"""
+
+from collections import OrderedDict
+
+class TranspositionTable:
+    """LRU cache of evaluations with depth-aware replacement."""
+
+    def __init__(self, max_entries=10000):
+        """Initializes the table.
+
+        Args:
+            max_entries: Most entries kept; the least recently used is evicted beyond that.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.entries = OrderedDict() # key -> (depth, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, min_depth=0):
+        """Look up a key.
+
+        Args:
+            key: Hashable key, typically (zobrist, settings...).
+            min_depth: Shallowest entry that counts as a hit.
+
+        Returns:
+            The stored value, or None on a miss.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < min_depth:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value, depth=0):
+        """Store a value unless a deeper one is already stored under the key.
+
+        Returns:
+            bool: Whether the value was stored.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > depth:
+            self.entries.move_to_end(key)
+            return False
+        self.entries[key] = (depth, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"entries": len(self.entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,474 @@
+"""Vectorized, Gymnasium-style environment for training policies on the engine.
+
+``VectorEnv`` runs K games side by side. One seat in each game (the learner) is
+driven by the caller and the other seats by scripted agents. The caller sees
+only NumPy arrays: ``step`` takes one action index per game and returns
+
+    obs         float32 (K, observation_size)   the learner's view of each game
+    rewards     float32 (K,)                    +1 win / -1 loss when a game ends, else 0
+    terminated  bool (K,)                       the game ended (bankruptcy or adjudication)
+    truncated   bool (K,)                       the game hit max_turns
+    infos       dict of arrays                  "action_mask" (K, num_actions) and, for games
+                                                that ended, "final_observation" and "winner"
+
+Finished games are reset automatically, so the observation returned for a
+finished game is the first one of the next game (the last one is in
+``infos["final_observation"]``). Decisions where the learner has a single legal
+action (rolling, ending the turn, passing an auction it cannot afford, ...) are
+played automatically, so every step is a real choice.
+
+Actions are indices into a fixed discrete space (see ``action_layout``): pass,
+accept, a handful of bid sizes relative to the tile's cost, and build, mortgage,
+unmortgage and sell-house for every tile. Proposing trades is not part of the
+space; the learner answers trades proposed to it with pass (reject) or accept.
+
+The returned arrays are buffers the env reuses: copy them to keep them across steps.
+
+    env = VectorEnv(64, board="classic_us", num_players=2, opponent="greedy", seed=0)
+    obs, infos = env.reset()
+    while training:
+        actions = policy(obs, infos["action_mask"])
+        obs, rewards, terminated, truncated, infos = env.step(actions)
+
+Needs NumPy (``pip install 'monopoly-bench[rl]'``).
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("vector_env needs NumPy: pip install 'monopoly-bench[rl]'") from e
+
+from agents import build_agent
+from boards import load_board
+from engine import GameState, GamePhase, AuctionMode, PropertyTile, MIN_SEALED_BID, is_trade_valid, step, tiles_in_mask
+from features import CASH_SCALE
+from derived_state import derive
+from legal_moves import get_unmortgageable_tiles, unmortgage_cost
+from run_match import collect_sealed_bids
+
+PHASES = [
+    GamePhase.START_MANAGEMENT,
+    GamePhase.END_MANAGEMENT,
+    GamePhase.ROLL_PHASE,
+    GamePhase.DECIDE_TO_BUY,
+    GamePhase.DECIDE_TO_SELL,
+    GamePhase.DECIDE_ON_TRADE,
+    GamePhase.HANDLE_MORTGAGED_TRADE,
+    GamePhase.AUCTION_PHASE,
+    GamePhase.SEALED_AUCTION,
+    GamePhase.END_TURN,
+    GamePhase.GAME_OVER,
+]
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+
+# Bid actions offer these multiples of the auctioned tile's cost
+BID_FRACTIONS = (0.5, 0.75, 1.0, 1.25, 1.5)
+
+PASS = 0
+ACCEPT = 1
+BID = 2
+
+# What "pass" means in each phase (besides HANDLE_MORTGAGED_TRADE, where it keeps the mortgage)
+PASS_ACTIONS = {
+    GamePhase.START_MANAGEMENT: "proceed",
+    GamePhase.END_MANAGEMENT: "proceed",
+    GamePhase.ROLL_PHASE: "roll",
+    GamePhase.DECIDE_TO_BUY: "skip_buy",
+    GamePhase.DECIDE_TO_SELL: "end_turn", # give up: the debt cannot be covered
+    GamePhase.DECIDE_ON_TRADE: "reject_trade",
+    GamePhase.AUCTION_PHASE: "pass_auction",
+    GamePhase.SEALED_AUCTION: "pass_auction",
+    GamePhase.END_TURN: "end_turn",
+}
+
+def observation_layout(num_seats, num_tiles):
+    """Slices of the observation vector, by field.
+
+    Players are listed relative to the observer: index 0 is the observer, 1 the
+    next seat, and so on. Fields:
+
+    - "owner": per tile, one-hot over (unowned, player 0..P-1); all zero for tiles that cannot be owned
+    - "houses": per tile, houses / 5 (a hotel is 1)
+    - "mortgaged": per tile, 1 if mortgaged
+    - "cash", "debt": per player, in thousands
+    - "alive": per player, 1 if still in the game
+    - "position": per player, one-hot over tiles
+    - "current": one-hot over players, whose turn it is
+    - "phase": one-hot over PHASES
+    - "turn": turn number / max_turns
+    - "auction_tile": one-hot over tiles, the tile being auctioned
+    - "auction_bid": current bid in thousands
+    - "auction_high": one-hot over players, the high bidder
+    - "auction_active": per player, 1 if still bidding
+    - "trade_offer", "trade_request": per tile, 1 if offered to / requested from the observer
+    - "trade_cash": cash offered and requested, in thousands
+    - "trade_from": one-hot over players, who proposed the trade
+
+    Returns:
+        tuple: (dict of field -> slice, total size)
+    """
+    sizes = [
+        ("owner", num_tiles * (num_seats + 1)),
+        ("houses", num_tiles),
+        ("mortgaged", num_tiles),
+        ("cash", num_seats),
+        ("debt", num_seats),
+        ("alive", num_seats),
+        ("position", num_seats * num_tiles),
+        ("current", num_seats),
+        ("phase", len(PHASES)),
+        ("turn", 1),
+        ("auction_tile", num_tiles),
+        ("auction_bid", 1),
+        ("auction_high", num_seats),
+        ("auction_active", num_seats),
+        ("trade_offer", num_tiles),
+        ("trade_request", num_tiles),
+        ("trade_cash", 2),
+        ("trade_from", num_seats),
+    ]
+    layout = {}
+    offset = 0
+    for name, size in sizes:
+        layout[name] = slice(offset, offset + size)
+        offset += size
+    return layout, offset
+
+def action_layout(num_tiles):
+    """Slices of the discrete action space, by action kind.
+
+    - "pass" (1): proceed, skip buying, reject a trade, pass an auction, keep a traded
+      property mortgaged, or give up (go bankrupt) when selling cannot cover a debt
+    - "accept" (1): buy, accept a trade, or unmortgage a traded property now
+    - "bid" (len(BID_FRACTIONS)): bid BID_FRACTIONS[i] times the auctioned tile's cost
+    - "build", "mortgage", "unmortgage", "sell_house" (num_tiles each): act on tile i
+
+    Returns:
+        tuple: (dict of kind -> slice, total number of actions)
+    """
+    layout = {"pass": slice(PASS, PASS + 1), "accept": slice(ACCEPT, ACCEPT + 1), "bid": slice(BID, BID + len(BID_FRACTIONS))}
+    offset = BID + len(BID_FRACTIONS)
+    for kind in ("build", "mortgage", "unmortgage", "sell_house"):
+        layout[kind] = slice(offset, offset + num_tiles)
+        offset += num_tiles
+    return layout, offset
+
+def bid_amount(tile, index):
+    return max(int(tile.cost * BID_FRACTIONS[index]), MIN_SEALED_BID)
+
+def encode_observation(game_state, player_id, out, layout, ownable_mask):
+    """Write a player's view of the game into a preallocated float32 vector.
+
+    Args:
+        game_state: The game.
+        player_id: The observer (player 0 in the encoding).
+        out: Vector of the size given by observation_layout.
+        layout: Field slices from observation_layout.
+        ownable_mask: Bitmask of the tiles that can be owned.
+    """
+    num_seats = game_state.num_seats
+    num_tiles = len(game_state.board)
+    stride = num_seats + 1
+    out[:] = 0.0
+
+    owner = layout["owner"].start
+    position = layout["position"].start
+    unowned = ownable_mask
+    for player in game_state.players.values():
+        rel = (player.player_id - player_id) % num_seats
+        for tile_id in tiles_in_mask(player.owned_mask):
+            out[owner + tile_id * stride + 1 + rel] = 1.0
+        unowned &= ~player.owned_mask
+        out[layout["cash"].start + rel] = player.cash / CASH_SCALE
+        out[layout["debt"].start + rel] = player.debt / CASH_SCALE
+        out[layout["alive"].start + rel] = 1.0
+        out[position + rel * num_tiles + player.position] = 1.0
+    for tile_id in tiles_in_mask(unowned):
+        out[owner + tile_id * stride] = 1.0
+    for tile_id in tiles_in_mask(game_state.developed_mask):
+        out[layout["houses"].start + tile_id] = game_state.board[tile_id].num_houses / 5
+    for tile_id in tiles_in_mask(game_state.mortgaged_mask):
+        out[layout["mortgaged"].start + tile_id] = 1.0
+
+    out[layout["current"].start + (game_state.current_player_id - player_id) % num_seats] = 1.0
+    out[layout["phase"].start + PHASE_INDEX[game_state.phase]] = 1.0
+    out[layout["turn"].start] = game_state.turn_number / max(game_state.max_turns, 1)
+
+    auction = game_state.auction_state
+    if auction is not None:
+        out[layout["auction_tile"].start + auction["tile_id"]] = 1.0
+        out[layout["auction_bid"].start] = auction.get("current_bid", 0) / CASH_SCALE
+        if auction.get("high_bidder") is not None:
+            out[layout["auction_high"].start + (auction["high_bidder"] - player_id) % num_seats] = 1.0
+        for bidder in auction["active_bidders"] if "active_bidders" in auction else auction["bidders"]:
+            out[layout["auction_active"].start + (bidder - player_id) % num_seats] = 1.0
+
+    trade = game_state.pending_trade
+    if trade is not None:
+        # Oriented to the observer: what they would receive and give
+        receive, give = (trade["offer"], trade["request"]) if trade["to_player"] == player_id else (trade["request"], trade["offer"])
+        for tile_id in receive["properties"]:
+            out[layout["trade_offer"].start + tile_id] = 1.0
+        for tile_id in give["properties"]:
+            out[layout["trade_request"].start + tile_id] = 1.0
+        out[layout["trade_cash"].start] = receive["cash"] / CASH_SCALE
+        out[layout["trade_cash"].start + 1] = give["cash"] / CASH_SCALE
+        out[layout["trade_from"].start + (trade["from_player"] - player_id) % num_seats] = 1.0
+
+def encode_batch(game_states, player_ids, out, layout, ownable_mask):
+    """encode_observation for many games at once, into the rows of a (K, size) array."""
+    for row, game_state, player_id in zip(out, game_states, player_ids):
+        encode_observation(game_state, player_id, row, layout, ownable_mask)
+
+def action_mask(game_state, player_id, phase, out, layout):
+    """Write the legal-action mask for a player into a preallocated bool vector.
+
+    Args:
+        game_state: The game.
+        player_id: The deciding player.
+        phase: The phase they decide in.
+        out: Vector of the size given by action_layout.
+        layout: Action slices from action_layout.
+    """
+    player = game_state.players[player_id]
+    derived = derive(game_state)
+    out[:] = False
+
+    if phase in (GamePhase.START_MANAGEMENT, GamePhase.END_MANAGEMENT):
+        out[PASS] = True
+        for tile_id in derived.buildable(player_id):
+            if player.cash >= game_state.board[tile_id].house_cost:
+                out[layout["build"].start + tile_id] = True
+        for tile_id in derived.mortgage_candidates(player_id):
+            out[layout["mortgage"].start + tile_id] = True
+        for tile_id in get_unmortgageable_tiles(game_state, player_id):
+            out[layout["unmortgage"].start + tile_id] = True
+
+    elif phase == GamePhase.DECIDE_TO_BUY:
+        out[PASS] = True
+        out[ACCEPT] = player.cash >= game_state.board[player.position].cost
+
+    elif phase == GamePhase.DECIDE_TO_SELL:
+        for tile_id in derived.sellable_houses(player_id):
+            out[layout["sell_house"].start + tile_id] = True
+        for tile_id in derived.mortgage_candidates(player_id):
+            out[layout["mortgage"].start + tile_id] = True
+        out[PASS] = not out.any()
+
+    elif phase == GamePhase.DECIDE_ON_TRADE:
+        trade = game_state.pending_trade
+        out[PASS] = True
+        out[ACCEPT] = is_trade_valid(trade, game_state.players[trade["from_player"]], player)
+
+    elif phase == GamePhase.HANDLE_MORTGAGED_TRADE:
+        out[PASS] = True
+        out[ACCEPT] = player.cash >= unmortgage_cost(game_state.board[game_state.mortgaged_properties_to_handle[0]])
+
+    elif phase in (GamePhase.AUCTION_PHASE, GamePhase.SEALED_AUCTION):
+        out[PASS] = True
+        auction = game_state.auction_state
+        tile = game_state.board[auction["tile_id"]]
+        current_bid = auction.get("current_bid", 0)
+        for i in range(len(BID_FRACTIONS)):
+            amount = bid_amount(tile, i)
+            out[BID + i] = current_bid < amount <= player.cash
+
+    else: # Rolling and ending the turn
+        out[PASS] = True
+
+def decode_action(game_state, player_id, phase, index, layout):
+    """Turn an action index into an engine action dict (see action_layout)."""
+    if index == PASS:
+        if phase == GamePhase.HANDLE_MORTGAGED_TRADE:
+            return {"type": "resolve_mortgaged_trade", "tile_id": game_state.mortgaged_properties_to_handle[0], "decision": "pay_interest_only"}
+        return {"type": PASS_ACTIONS.get(phase, "end_turn")}
+    if index == ACCEPT:
+        if phase == GamePhase.DECIDE_TO_BUY:
+            return {"type": "buy"}
+        if phase == GamePhase.DECIDE_ON_TRADE:
+            return {"type": "accept_trade"}
+        return {"type": "resolve_mortgaged_trade", "tile_id": game_state.mortgaged_properties_to_handle[0], "decision": "unmortgage_now"}
+    if index < layout["build"].start:
+        return {"type": "place_bid", "bid_amount": bid_amount(game_state.board[game_state.auction_state["tile_id"]], index - BID)}
+    for kind, action_type in (("build", "build_house"), ("mortgage", "mortgage_property"), ("unmortgage", "unmortgage_property"), ("sell_house", "sell_house")):
+        if index < layout[kind].stop:
+            return {"type": action_type, "tile_id": index - layout[kind].start}
+    raise ValueError(f"Action index out of range: {index}")
+
+class _FixedAction:
+    """Stands in for the learner when collect_sealed_bids asks every bidder at once."""
+
+    def __init__(self, player_id, action):
+        self.player_id = player_id
+        self.action = action
+
+    def act(self, observation):
+        return self.action
+
+class VectorEnv:
+    """K games against scripted opponents, stepped together with array actions."""
+
+    def __init__(self, num_envs, board="classic_us", num_players=2, opponent="greedy", learner_seat=0,
+                 max_turns=100, starting_cash=1500, auction_mode=AuctionMode.ASCENDING, seed=None):
+        """Initializes the environment (call reset before stepping).
+
+        Args:
+            num_envs: Number of games K.
+            board: Board name or path (see boards.load_board).
+            num_players: Players per game, the learner included.
+            opponent: Agent spec for the other seats (e.g. "greedy" or {"type": "random"}).
+            learner_seat: The learner's seat, or None for a random seat every game.
+            max_turns: Turn limit per game; reaching it truncates the game.
+            starting_cash: Starting cash per player.
+            auction_mode: Auction format (see engine.AuctionMode).
+            seed: Base seed for dice, opponents and seat draws.
+        """
+        if num_players < 2:
+            raise ValueError(f"num_players must be at least 2, got {num_players}")
+        if learner_seat is not None and not 0 <= learner_seat < num_players:
+            raise ValueError(f"learner_seat must be in [0, {num_players}), got {learner_seat}")
+        self.num_envs = num_envs
+        self.tile_data = load_board(board).tile_data
+        self.num_players = num_players
+        self.num_tiles = len(self.tile_data)
+        self.opponent = opponent
+        self.learner_seat = learner_seat
+        self.max_turns = max_turns
+        self.starting_cash = starting_cash
+        self.auction_mode = auction_mode
+        self.seed = seed
+
+        self.obs_layout, self.observation_size = observation_layout(num_players, self.num_tiles)
+        self.act_layout, self.num_actions = action_layout(self.num_tiles)
+        self.obs = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.masks = np.zeros((num_envs, self.num_actions), dtype=bool)
+        self.final_obs = np.zeros((num_envs, self.observation_size), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.winners = np.full(num_envs, -1, dtype=np.int64) # learner-relative seat of the winner, -1 if none
+
+        self.games = [None] * num_envs
+        self.learners = [0] * num_envs
+        self.opponents = [None] * num_envs
+        self.episodes = 0
+        self.ownable_mask = None
+        self.rng = random.Random(seed)
+
+    def reset(self, seed=None):
+        """Start K new games.
+
+        Returns:
+            tuple: (obs, infos) with infos["action_mask"].
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng = random.Random(seed)
+        self.episodes = 0
+        for i in range(self.num_envs):
+            self._new_game(i)
+            self._advance(i)
+        encode_batch(self.games, self.learners, self.obs, self.obs_layout, self.ownable_mask)
+        return self.obs, {"action_mask": self.masks}
+
+    def step(self, actions):
+        """Apply one learner action per game and play on to the learner's next decision.
+
+        Actions outside the mask are replaced by the first legal action.
+
+        Args:
+            actions: Integer array of shape (K,).
+
+        Returns:
+            tuple: (obs, rewards, terminated, truncated, infos).
+        """
+        actions = np.asarray(actions)
+        self.rewards[:] = 0.0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        self.winners[:] = -1
+        for i in range(self.num_envs):
+            index = int(actions[i])
+            if not 0 <= index < self.num_actions or not self.masks[i, index]:
+                index = int(self.masks[i].argmax())
+            self._apply(i, index)
+            self._advance(i)
+            game_state = self.games[i]
+            if game_state.game_over or self.learners[i] not in game_state.players:
+                self._finish(i)
+                self._new_game(i)
+                self._advance(i)
+        encode_batch(self.games, self.learners, self.obs, self.obs_layout, self.ownable_mask)
+        return self.obs, self.rewards, self.terminated, self.truncated, {
+            "action_mask": self.masks,
+            "final_observation": self.final_obs,
+            "winner": self.winners,
+        }
+
+    def _new_game(self, i):
+        seed = self.rng.getrandbits(63)
+        game_state = GameState(self.num_players, self.tile_data, self.max_turns, self.starting_cash, self.auction_mode, seed=seed)
+        learner = self.learner_seat if self.learner_seat is not None else self.rng.randrange(self.num_players)
+        if self.ownable_mask is None:
+            self.ownable_mask = sum(1 << tile.tile_id for tile in game_state.board if isinstance(tile, PropertyTile))
+        spec = {"type": self.opponent} if isinstance(self.opponent, str) else dict(self.opponent)
+        self.opponents[i] = {player_id: build_agent({"seed": seed + player_id, **spec}, player_id)
+                             for player_id in range(self.num_players) if player_id != learner}
+        self.games[i] = game_state
+        self.learners[i] = learner
+        self.episodes += 1
+
+    def _apply(self, i, index):
+        """Play the learner's action in game i."""
+        game_state = self.games[i]
+        learner = self.learners[i]
+        action = decode_action(game_state, learner, game_state.phase, index, self.act_layout)
+        if game_state.phase == GamePhase.SEALED_AUCTION:
+            action = collect_sealed_bids(game_state, {**self.opponents[i], learner: _FixedAction(learner, action)}, None, parallel=False)
+        game_state.phase = step(game_state, action)
+
+    def _advance(self, i):
+        """Play opponents and the learner's forced moves until the learner has a real choice or the game ends."""
+        game_state = self.games[i]
+        learner = self.learners[i]
+        opponents = self.opponents[i]
+        mask = self.masks[i]
+        while not game_state.game_over and learner in game_state.players:
+            phase = game_state.phase
+            if phase == GamePhase.SEALED_AUCTION:
+                learner_bids = learner in game_state.auction_state["bidders"]
+                deciding = learner if learner_bids else None
+            elif game_state.decision_player_id is not None:
+                deciding = game_state.decision_player_id
+            else:
+                deciding = game_state.current_player_id
+
+            if deciding == learner:
+                action_mask(game_state, learner, phase, mask, self.act_layout)
+                if mask.sum() > 1:
+                    return
+                self._apply(i, int(mask.argmax()))
+            elif phase == GamePhase.SEALED_AUCTION:
+                game_state.phase = step(game_state, collect_sealed_bids(game_state, opponents, None, parallel=False))
+            else:
+                action = opponents[deciding].act({"game_state": game_state, "phase": phase, "logger": None})
+                game_state.phase = step(game_state, action)
+
+    def _finish(self, i):
+        """Record the reward and final observation of a finished game."""
+        game_state = self.games[i]
+        learner = self.learners[i]
+        # Winner as in cli.run_job: the surviving player with the most cash
+        standings = sorted(game_state.players.values(), key=lambda p: p.cash, reverse=True)
+        winner = standings[0].player_id if standings else None
+        if game_state.adjudication is not None:
+            winner = game_state.adjudication["winner"]
+        self.rewards[i] = 1.0 if winner == learner else -1.0
+        self.winners[i] = -1 if winner is None else (winner - learner) % self.num_players
+        alive = learner in game_state.players and len(game_state.players) > 1
+        self.truncated[i] = alive and game_state.turn_number >= game_state.max_turns
+        self.terminated[i] = not self.truncated[i]
+        # A bankrupt learner still observes the board from their (now empty) seat
+        encode_observation(game_state, learner, self.final_obs[i], self.obs_layout, self.ownable_mask)
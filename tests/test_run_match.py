@@ -0,0 +1,13 @@
+from boards import load_board
+from engine import GameState
+from run_match import final_standings
+
+
+def test_adjudicated_winner_leads_the_standings_whatever_their_cash():
+    game_state = GameState(3, load_board("condensed").tile_data, 30, 750, "ascending", seed=0)
+    for player_id, cash in enumerate([900, 300, 600]):
+        game_state.players[player_id].cash = cash
+
+    assert [p.player_id for p in final_standings(game_state)] == [0, 2, 1]
+    game_state.adjudication = {"winner": 1}
+    assert [p.player_id for p in final_standings(game_state)] == [1, 0, 2]
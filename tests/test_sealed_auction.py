@@ -0,0 +1,16 @@
+import pytest
+
+from boards import load_board
+from engine import GameState, handle_sealed_auction_action
+
+
+@pytest.mark.parametrize("current_player, expected_winner", [(0, 1), (1, 2), (2, 0)])
+def test_tie_goes_to_the_player_seated_earliest_after_the_current_player(current_player, expected_winner):
+    game_state = GameState(3, load_board("condensed").tile_data, 30, 750, "sealed_first_price", seed=0)
+    tile = next(tile for tile in game_state.board if hasattr(tile, "cost"))
+    game_state.current_player_id = current_player
+    game_state.auction_state = {"tile_id": tile.tile_id, "bidders": [0, 1, 2], "mode": "sealed_first_price"}
+
+    handle_sealed_auction_action(game_state, {"bids": {0: 50, 1: 50, 2: 50}})
+
+    assert tile.owner == expected_winner
@@ -0,0 +1,34 @@
+import threading
+
+from boards import load_board
+from engine import GameState
+from shared_state import SharedGameState, SharedStateView
+
+
+def test_sync_never_sees_a_half_written_publish():
+    tile_data = load_board("condensed").tile_data
+    game_state = GameState(3, tile_data, 30, 750, "sealed_first_price", seed=0)
+    tile = next(tile for tile in game_state.board if hasattr(tile, "cost"))
+    game_state.phase = "sealed_auction_phase"
+    game_state.auction_state = {"tile_id": tile.tile_id, "bidders": [0, 1, 2], "mode": "sealed_first_price"}
+    shared = SharedGameState(3, len(tile_data))
+    shared.publish(game_state)
+    view = SharedStateView(shared.name, 3, tile_data, 30, "sealed_first_price")
+    stop = threading.Event()
+
+    def republish():
+        # What parallel sealed bids do: every ProcessAgent.act publishes the same state again
+        while not stop.is_set():
+            shared.publish(game_state)
+
+    publisher = threading.Thread(target=republish)
+    publisher.start()
+    try:
+        for _ in range(2000):
+            assert view.sync().auction_state["bidders"] == [0, 1, 2]
+    finally:
+        stop.set()
+        publisher.join()
+        view.close()
+        shared.close()
+        shared.unlink()
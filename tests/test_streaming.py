@@ -0,0 +1,35 @@
+import json
+from types import SimpleNamespace
+
+import apis
+from boards import load_board
+from engine import GameState
+from logger import GameLogger
+
+
+class FakeResponses:
+    def create(self, **kwargs):
+        call = SimpleNamespace(type="function_call", name="place_bid", arguments=json.dumps({"bid_amount": 40}))
+        later = SimpleNamespace(type="message", text="Bidding low keeps cash for rent.")
+        response = SimpleNamespace(output=[call, later], usage=SimpleNamespace(input_tokens=100, output_tokens=20))
+        return iter([SimpleNamespace(type="response.output_item.done", item=call),
+                     SimpleNamespace(type="response.output_item.done", item=later),
+                     SimpleNamespace(type="response.completed", response=response)])
+
+
+def test_streamed_sealed_bid_is_credited_to_the_bidder(tmp_path, monkeypatch):
+    monkeypatch.setattr(apis, "get_client", lambda: SimpleNamespace(responses=FakeResponses()))
+    game_state = GameState(2, load_board("condensed").tile_data, 30, 750, "sealed_first_price", seed=0)
+    tile = next(tile for tile in game_state.board if hasattr(tile, "cost"))
+    game_state.current_player_id = 0
+    game_state.phase = "sealed_auction_phase"
+    game_state.auction_state = {"tile_id": tile.tile_id, "bidders": [0, 1], "mode": "sealed_first_price"}
+    logger = GameLogger("game", results_dir=tmp_path, console=False, collect=("api_call",))
+
+    action = apis.get_llm_response("bid", game_state, ["place_bid"], logger, stream=True, player_id=1)
+    logger.close()
+
+    assert action == {"type": "place_bid", "bid_amount": 40}
+    assert [event["player_id"] for event in logger.collected] == [1]
+    assert f"API RESPONSE (continued, Player 1, turn {game_state.turn_number}): " in (tmp_path / "game.log").read_text()
+    assert {player_id for _, player_id in logger._last_blob} == {1}
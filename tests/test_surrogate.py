@@ -0,0 +1,44 @@
+from agents import LLMAgent
+from boards import load_board
+from engine import GameState
+from features import CASH_SCALE, FEATURE_NAMES
+from surrogate import _records_from_text_log
+
+CASH = FEATURE_NAMES.index("cash")
+
+
+def bid_response(player_id, amount):
+    return (f"API RESPONSE (Player {player_id}): [ResponseFunctionToolCall(arguments='{{\"bid_amount\": {amount}}}', "
+            f"call_id='call_{player_id}', name='place_bid', type='function_call')]")
+
+
+def test_interleaved_sealed_bids_are_paired_by_player(tmp_path):
+    tile_data = load_board("condensed").tile_data
+    game_state = GameState(2, tile_data, 30, 750, "sealed_first_price", seed=0)
+    tile = next(tile for tile in game_state.board if hasattr(tile, "cost"))
+    game_state.players[0].cash, game_state.players[1].cash = 1000, 200
+    game_state.phase = "sealed_auction_phase"
+    game_state.auction_state = {"tile_id": tile.tile_id, "bidders": [0, 1], "mode": "sealed_first_price"}
+    prompts = {player_id: LLMAgent(player_id)._create_prompt({"game_state": game_state, "phase": game_state.phase})
+               for player_id in (0, 1)}
+    log = tmp_path / "game.log"
+    log.write_text("\n".join([f"PROMPT (Player 0): {prompts[0]}", f"PROMPT (Player 1): {prompts[1]}",
+                              bid_response(1, 20), bid_response(0, 500)]) + "\n", encoding="utf-8")
+
+    records = _records_from_text_log(log, tile_data, 30)
+
+    bids = {round(record["features"][CASH] * CASH_SCALE): record["bid_ratio"] * tile.cost for record in records}
+    assert bids == {1000: 500, 200: 20}
+
+
+def test_untagged_sealed_bids_are_skipped(tmp_path):
+    tile_data = load_board("condensed").tile_data
+    game_state = GameState(2, tile_data, 30, 750, "sealed_first_price", seed=0)
+    tile = next(tile for tile in game_state.board if hasattr(tile, "cost"))
+    game_state.phase = "sealed_auction_phase"
+    game_state.auction_state = {"tile_id": tile.tile_id, "bidders": [0, 1], "mode": "sealed_first_price"}
+    prompt = LLMAgent(0)._create_prompt({"game_state": game_state, "phase": game_state.phase})
+    log = tmp_path / "game.log"
+    log.write_text(f"PROMPT: {prompt}\n{bid_response(0, 500).replace(' (Player 0)', '')}\n", encoding="utf-8")
+
+    assert _records_from_text_log(log, tile_data, 30) == []
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from features import FEATURE_NAMES
+from trajectory_dataset import build_dataset
+
+
+def write_game(path, winner, players=3):
+    """An event file of a finished game in which every player makes one decision."""
+    features = {name: 0.0 for name in FEATURE_NAMES}
+    events = [{"event": "match_config", "agents": [{"player_id": p, "type": "LLMAgent", "model": "m"} for p in range(players)]}]
+    events += [{"event": "decision", "player_id": p, "phase": "decide_to_buy", "allowed_tools": [],
+                "action": {"type": "buy"}, "features": features} for p in range(players)]
+    # run_match.log_final_results ranks from 0, winner first
+    standings = [winner] + [p for p in range(players) if p != winner]
+    events += [{"event": "final_standing", "rank": rank, "player_id": p, "cash": 0, "properties": []}
+               for rank, p in enumerate(standings)]
+    events.append({"event": "game_over", "turns": 10})
+    path.write_text("".join(json.dumps(event) + "\n" for event in events), encoding="utf-8")
+
+
+def test_won_marks_the_winner(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    winners = [0, 2, 1]
+    for game, winner in enumerate(winners):
+        write_game(logs / f"game_{game}.jsonl", winner)
+
+    dataset = build_dataset([logs], tmp_path / "dataset")
+
+    for game, winner in enumerate(winners):
+        steps = dataset.game(game)
+        assert [int(p) for p in steps["player"][steps["won"] == 1]] == [winner]
+        assert sorted(int(p) for p in steps["player"][steps["won"] == 0]) == sorted({0, 1, 2} - {winner})
+
+
+def test_unfinished_game_has_no_outcome(tmp_path):
+    path = tmp_path / "game_0.jsonl"
+    write_game(path, 1)
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(line for line in lines if '"game_over"' not in line), encoding="utf-8")
+
+    dataset = build_dataset([tmp_path], tmp_path / "dataset")
+
+    assert set(dataset.game(0)["won"].tolist()) == {-1}